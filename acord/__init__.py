@@ -15,7 +15,23 @@
 
 from .bases import *
 from .models import *
-from .client import Client, Shard, CacheData, Cache, DefaultCache
+from .client import (
+    Client,
+    Shard,
+    ChunkRequest,
+    EventRegistry,
+    IdentifyScheduler,
+    Cluster,
+    ClusterSupervisor,
+    cluster_method,
+    CacheData,
+    Cache,
+    DefaultCache,
+    MessageCache,
+    CachePolicy,
+    SQLiteCache,
+    SharedCache,
+)
 from .webhooks.webhook import Webhook, WebhookType
 from .voice.transports.base import BaseTransport
 from .voice.transports.reader import BaseReceiver
@@ -1,4 +1,12 @@
 from .client import Client
 from .shard import Shard
+from .chunker import ChunkRequest
+from .handler import EventRegistry
+from .scheduler import IdentifyScheduler
+from .cluster import Cluster, ClusterSupervisor, cluster_method
 from .caches.cache import CacheData, Cache
 from .caches.default import DefaultCache
+from .caches.messages import MessageCache
+from .caches.policy import CachePolicy
+from .caches.sqlite import SQLiteCache
+from .caches.shared import SharedCache
@@ -2,6 +2,7 @@
 from __future__ import annotations
 from ctypes import Union
 
+import asyncio
 from typing import Any, Dict, Iterator, Optional
 from abc import ABC, abstractmethod
 from weakref import WeakValueDictionary
@@ -10,6 +11,8 @@
 
 from acord.models.channels.stage import StageInstance
 
+from .metrics import CacheMetrics, section_stats, to_prometheus
+
 
 class CacheData(dict):
     @classmethod
@@ -50,6 +53,40 @@ class MyCache(Cache):
     sections: Dict[str, CacheData] = {}
     """ Mapping of cache sections for cache """
 
+    _metrics: CacheMetrics = pydantic.PrivateAttr(default_factory=CacheMetrics)
+
+    @property
+    def metrics(self) -> CacheMetrics:
+        """Counters recorded by cache methods,
+        implementations should record lookups, inserts and removals through this.
+        """
+        return self._metrics
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns hits, misses, inserts, removals, evictions, expirations and size
+        for each section.
+        Sections which track their memory usage also include ``bytes``,
+        lookups recorded for data stored outside of the cache,
+        such as guild members, have no size.
+        """
+        names = [*self.sections, *self._metrics.sections]
+
+        return {
+            name: section_stats(self._metrics[name], self.sections.get(name))
+            for name in dict.fromkeys(names)
+        }
+
+    def prometheus(self, prefix: str = "acord_cache") -> str:
+        """Returns :meth:`Cache.stats` in the Prometheus text format,
+        with the section as a label.
+
+        Parameters
+        ----------
+        prefix: :class:`str`
+            Prefix for metric names
+        """
+        return to_prometheus(self.stats(), prefix)
+
     def __getitem__(self, item: Any) -> CacheData:
         return self.sections[item]
 
@@ -65,6 +102,56 @@ def __contains__(self, key: Any) -> bool:
     def __setitem__(self, key: str, value: CacheData) -> None:
         self.sections[key] = CacheData.validate(value)
 
+    def sweep(self) -> int:
+        """Removes expired items from every section which has a TTL,
+        returns how many were removed.
+        """
+        removed = 0
+
+        for section in self.sections.values():
+            sweep = getattr(section, "sweep", None)
+
+            if sweep is not None:
+                removed += sweep()
+
+        return removed
+
+    def start_sweeper(
+        self, interval: float = 60, *, loop: asyncio.AbstractEventLoop = None
+    ) -> asyncio.Task:
+        """Starts a task which calls :meth:`Cache.sweep` every ``interval`` seconds,
+        expired items are otherwise only removed when sections are read or added to.
+
+        Parameters
+        ----------
+        interval: :class:`float`
+            Seconds between sweeps
+        loop: :obj:`py:asyncio.AbstractEventLoop`
+            Loop to create the task on
+        """
+
+        async def sweeper():
+            while True:
+                await asyncio.sleep(interval)
+                self.sweep()
+
+        return (loop or asyncio.get_event_loop()).create_task(sweeper())
+
+    def bind(self, conn: Any) -> None:
+        """Called once the client has created its HTTP client,
+        caches which rebuild models themselves should store it to use as ``conn``.
+
+        Parameters
+        ----------
+        conn: :class:`HTTPClient`
+            HTTP client of the client using this cache
+        """
+
+    def close(self) -> None:
+        """Called when the client disconnects,
+        caches should release any resources they hold.
+        """
+
     @abstractmethod
     def clear(self) -> None:
         """Clears the cache,
@@ -87,14 +174,29 @@ def get_user(self, user_id: Snowflake, /) -> Optional[User]:
         """
 
     @abstractmethod
-    def add_user(self, user: User, /) -> None:
+    def add_user(self, user: User, /) -> Optional[User]:
         """Adds a :class:`User` to the cache.
 
+        If a user with the same ID is already cached,
+        caches should update that user in place and return it,
+        so every model references a single instance of each user.
+
+        Parameters
+        ----------
+        user: :class:`User`
+            The user to add in the cache.
+        """
+
+    def intern_user(self, user: User, /) -> User:
+        """Adds a :class:`User` to the cache,
+        returning the instance which should be referenced instead of ``user``.
+
         Parameters
         ----------
         user: :class:`User`
             The user to add in the cache.
         """
+        return self.add_user(user) or user
 
     @abstractmethod
     def remove_user(self, user_id: Snowflake, *args) -> Optional[User]:
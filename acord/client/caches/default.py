@@ -2,22 +2,98 @@
 from __future__ import annotations
 
 import typing
-from weakref import WeakValueDictionary
 from acord.models import Snowflake, User, Guild, Channel, Message, StageInstance
 
 from .cache import CacheData, Cache
-
-SECTIONS = {
-    "messages": {},
-    "users": WeakValueDictionary(),
-    "guilds": {},
-    "channels": {},
-    "stage_instances": {},
+from .messages import MessageCache
+from .policy import CachePolicy
+
+DEFAULT_POLICIES = {
+    "messages": CachePolicy(max_size=1000),
+    "users": CachePolicy(weak=True),
+    "guilds": CachePolicy(),
+    "channels": CachePolicy(),
+    "stage_instances": CachePolicy(),
 }
 
 
+def _build_message_section(
+    policy: CachePolicy, max_messages_per_channel: typing.Optional[int]
+) -> CacheData:
+    if policy.disabled or policy.weak or policy.ttl or policy.eviction != "lru":
+        # Only plain size limits are handled by the message cache
+        return policy.build()
+    return MessageCache(policy.max_size, max_messages_per_channel)
+
+
+def _merge_user(existing: User, user: User) -> None:
+    # Only fields which were provided are copied,
+    # so partial users do not erase what is already known
+    for name in user.__fields_set__:
+        if name != "conn":
+            existing.__dict__[name] = user.__dict__[name]
+
+    existing.__fields_set__.update(user.__fields_set__)
+
+
 class DefaultCache(Cache):
-    sections: typing.Dict[str, CacheData] = SECTIONS
+    """The default cache used by acord
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        cache = DefaultCache(
+            policies={
+                "messages": CachePolicy(max_size=5000),
+                "users": CachePolicy(max_size=100000, ttl=3600),
+            },
+            max_messages_per_channel=100,
+        )
+
+    Parameters
+    ----------
+    policies: Dict[:class:`str`, :class:`CachePolicy`]
+        Policies for each section,
+        missing sections use :data:`DEFAULT_POLICIES`.
+    max_messages: Optional[:class:`int`]
+        Maximum number of messages to cache,
+        ``None`` for no limit. Defaults to ``1000``.
+        Overwritten by ``policies["messages"].max_size`` if provided.
+    max_messages_per_channel: Optional[:class:`int`]
+        Maximum number of messages to cache for each channel,
+        ``None`` for no limit.
+    indexes: :class:`bool`
+        Whether to call :meth:`Guild.enable_indexes` on every added guild
+    """
+
+    sections: typing.Dict[str, CacheData] = {}
+    policies: typing.Dict[str, CachePolicy] = {}
+    max_messages: typing.Optional[int] = 1000
+    max_messages_per_channel: typing.Optional[int] = None
+    indexes: bool = False
+
+    def __init__(self, **kwds) -> None:
+        super().__init__(**kwds)
+
+        policies = {
+            **DEFAULT_POLICIES,
+            "messages": CachePolicy(max_size=self.max_messages),
+            **self.policies,
+        }
+        self.policies = policies
+
+        sections = {
+            name: policy.build()
+            for name, policy in policies.items()
+            if name != "messages"
+        }
+        sections["messages"] = _build_message_section(
+            policies["messages"], self.max_messages_per_channel
+        )
+        sections.update(self.sections)
+
+        self.sections = sections
 
     def clear(self):
         for cache in self.sections.values():
@@ -36,15 +112,28 @@ def get_user(self, user_id: Snowflake, /) -> None:
 
         cache = self["users"]
 
-        return cache.get(user_id)
+        item = cache.get(user_id)
+        self._metrics.lookup("users", item is not None)
 
-    def add_user(self, user: User, /) -> None:
+        return item
+
+    def add_user(self, user: User, /) -> User:
         if not isinstance(user, User):
             raise TypeError("User must be an instance of a user object")
 
         cache = self["users"]
 
-        cache[user.id] = user
+        existing = cache.get(user.id)
+
+        if existing is not None and existing is not user:
+            _merge_user(existing, user)
+            user = existing
+        else:
+            cache[user.id] = user
+
+        self._metrics.insert("users")
+
+        return user
 
     def remove_user(self, user_id: Snowflake, *args) -> None:
         if not isinstance(user_id, int):
@@ -52,7 +141,11 @@ def remove_user(self, user_id: Snowflake, *args) -> None:
 
         cache = self["users"]
 
-        return cache.pop(user_id, *args)
+        item = cache.pop(user_id, *args)
+        if item is not None:
+            self._metrics.remove("users")
+
+        return item
 
     # NOTE: Guilds
 
@@ -67,15 +160,22 @@ def get_guild(self, guild_id: Snowflake, /):
 
         cache = self["guilds"]
 
-        return cache.get(guild_id)
+        item = cache.get(guild_id)
+        self._metrics.lookup("guilds", item is not None)
+
+        return item
 
     def add_guild(self, guild: Guild, /) -> None:
         if not isinstance(guild, Guild):
             raise TypeError("guild must be an instance of Guild")
 
+        if self.indexes:
+            guild.enable_indexes()
+
         cache = self["guilds"]
 
         cache[guild.id] = guild
+        self._metrics.insert("guilds")
 
     def remove_guild(self, guild_id: Snowflake, *args) -> typing.Optional[Guild]:
         if not isinstance(guild_id, int):
@@ -83,7 +183,11 @@ def remove_guild(self, guild_id: Snowflake, *args) -> typing.Optional[Guild]:
 
         cache = self["guilds"]
 
-        return cache.pop(guild_id, *args)
+        item = cache.pop(guild_id, *args)
+        if item is not None:
+            self._metrics.remove("guilds")
+
+        return item
 
     # NOTE: Channels
 
@@ -98,7 +202,10 @@ def get_channel(self, channel_id: Snowflake, /) -> typing.Optional[Channel]:
 
         cache = self["channels"]
 
-        return cache.get(channel_id)
+        item = cache.get(channel_id)
+        self._metrics.lookup("channels", item is not None)
+
+        return item
 
     def add_channel(self, channel: Channel, /) -> None:
         if not isinstance(channel, Channel):
@@ -107,6 +214,7 @@ def add_channel(self, channel: Channel, /) -> None:
         cache = self["channels"]
 
         cache[channel.id] = channel
+        self._metrics.insert("channels")
 
     def remove_channel(self, channel_id: Snowflake, *args) -> None:
         if not isinstance(channel_id, int):
@@ -114,7 +222,11 @@ def remove_channel(self, channel_id: Snowflake, *args) -> None:
 
         cache = self["channels"]
 
-        return cache.pop(channel_id, *args)
+        item = cache.pop(channel_id, *args)
+        if item is not None:
+            self._metrics.remove("channels")
+
+        return item
 
     # NOTE: Messages
 
@@ -133,7 +245,14 @@ def get_message(
 
         cache = self["messages"]
 
-        return cache.get(f"{channel_id}:{message_id}")
+        if isinstance(cache, MessageCache):
+            message = cache.get_message(channel_id, message_id)
+        else:
+            message = cache.get((channel_id, message_id))
+
+        self._metrics.lookup("messages", message is not None)
+
+        return message
 
     def add_message(self, message: Message, /) -> None:
         if not isinstance(message, Message):
@@ -141,7 +260,12 @@ def add_message(self, message: Message, /) -> None:
 
         cache = self["messages"]
 
-        cache[f"{message.channel_id}:{message.id}"] = message
+        if isinstance(cache, MessageCache):
+            cache.add_message(message)
+        else:
+            cache[(message.channel_id, message.id)] = message
+
+        self._metrics.insert("messages")
 
     def remove_message(
         self, channel_id: Snowflake, message_id: Snowflake, *args
@@ -153,7 +277,15 @@ def remove_message(
 
         cache = self["messages"]
 
-        cache.pop(f"{channel_id}:{message_id}", *args)
+        if isinstance(cache, MessageCache):
+            message = cache.remove_message(channel_id, message_id, *args)
+        else:
+            message = cache.pop((channel_id, message_id), *args)
+
+        if message is not None:
+            self._metrics.remove("messages")
+
+        return message
 
     # NOTE: Stage Instances
     def stage_instances(self) -> typing.Iterator[StageInstance]:
@@ -167,7 +299,10 @@ def get_stage_instance(self, id: Snowflake, /) -> typing.Optional[StageInstance]
 
         cache = self["stage_instances"]
 
-        return cache.get(id)
+        item = cache.get(id)
+        self._metrics.lookup("stage_instances", item is not None)
+
+        return item
 
     def add_stage_instance(self, stage_instance: StageInstance) -> None:
         if not isinstance(stage_instance, StageInstance):
@@ -176,6 +311,7 @@ def add_stage_instance(self, stage_instance: StageInstance) -> None:
         cache = self["stage_instances"]
 
         cache[stage_instance.id] = stage_instance
+        self._metrics.insert("stage_instances")
 
     def remove_stage_instance(
         self, id: Snowflake, *args
@@ -185,4 +321,8 @@ def remove_stage_instance(
 
         cache = self["stage_instances"]
 
-        return cache.pop(id, *args)
+        item = cache.pop(id, *args)
+        if item is not None:
+            self._metrics.remove("stage_instances")
+
+        return item
@@ -0,0 +1,224 @@
+# Bounded message cache
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from acord.models import Message
+from acord.models.lazy import LazyModel
+
+MessageKey = Tuple[int, int]
+
+_CONTAINERS = (list, tuple, set, frozenset)
+
+
+def approximate_size(obj: Any, depth: int = 3) -> int:
+    """Returns the approximate number of bytes held by an object,
+    following models, dicts and sequences up to ``depth`` levels.
+    Shared objects such as connections are not excluded,
+    so this should only be used for relative comparisons.
+
+    Parameters
+    ----------
+    obj: Any
+        Object to measure
+    depth: :class:`int`
+        How many levels of nested objects to include
+    """
+    if type(obj) is LazyModel:
+        # Avoid building the model just to measure it
+        return approximate_size(object.__getattribute__(obj, "__data__"), depth)
+
+    size = sys.getsizeof(obj)
+
+    if depth <= 0:
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += sys.getsizeof(key) + approximate_size(value, depth - 1)
+    elif isinstance(obj, _CONTAINERS):
+        for value in obj:
+            size += approximate_size(value, depth - 1)
+    elif hasattr(obj, "__fields__"):
+        size += approximate_size(
+            {k: v for k, v in obj.__dict__.items() if k != "conn"}, depth - 1
+        )
+
+    return size
+
+
+class MessageCache(dict):
+    """A bounded cache section for messages,
+    keyed by ``(channel_id, message_id)``.
+
+    Messages are evicted least recently used first,
+    once either the global or per channel limit is reached.
+    Reading a message through :meth:`MessageCache.get_message` marks it as recently used.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        cache = DefaultCache(max_messages=10000, max_messages_per_channel=200)
+
+        cache["messages"].nbytes  # Approximate size of cached messages
+
+    Parameters
+    ----------
+    max_messages: Optional[:class:`int`]
+        Maximum number of messages across all channels,
+        ``None`` for no limit.
+    max_messages_per_channel: Optional[:class:`int`]
+        Maximum number of messages kept for each channel,
+        ``None`` for no limit.
+
+    Attributes
+    ----------
+    nbytes: :class:`int`
+        Approximate number of bytes held by cached messages
+    evictions: :class:`int`
+        Number of messages evicted to stay within limits
+    """
+
+    def __init__(
+        self,
+        max_messages: Optional[int] = 1000,
+        max_messages_per_channel: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+
+        self.max_messages = max_messages
+        self.max_messages_per_channel = max_messages_per_channel
+
+        self.nbytes = 0
+        self.evictions = 0
+
+        # Global and per channel recency, oldest first
+        self._order: OrderedDict[MessageKey, None] = OrderedDict()
+        self._channels: Dict[int, OrderedDict[int, None]] = {}
+        self._sizes: Dict[MessageKey, int] = {}
+
+    def get_message(self, channel_id: int, message_id: int) -> Optional[Message]:
+        """Gets a message and marks it as recently used
+
+        Parameters
+        ----------
+        channel_id: :class:`int`
+            ID of the channel the message is in
+        message_id: :class:`int`
+            ID of the message
+        """
+        key = (channel_id, message_id)
+        message = self.get(key)
+
+        if message is not None:
+            self._order.move_to_end(key)
+            self._channels[channel_id].move_to_end(message_id)
+
+        return message
+
+    def add_message(self, message: Message) -> None:
+        """Adds a message, evicting older messages if any limit is exceeded
+
+        Parameters
+        ----------
+        message: :class:`Message`
+            Message to add, replaces any existing message with the same ID
+        """
+        channel_id = message.channel_id
+        message_id = message.id
+        key = (channel_id, message_id)
+
+        if key in self:
+            self.nbytes -= self._sizes[key]
+            self._order.move_to_end(key)
+            self._channels[channel_id].move_to_end(message_id)
+        else:
+            self._order[key] = None
+            self._channels.setdefault(channel_id, OrderedDict())[message_id] = None
+
+        size = approximate_size(message)
+        self._sizes[key] = size
+        self.nbytes += size
+
+        self[key] = message
+
+        channel = self._channels[channel_id]
+        per_channel = self.max_messages_per_channel
+
+        if per_channel is not None:
+            while len(channel) > per_channel:
+                oldest, _ = channel.popitem(last=False)
+                self._evict((channel_id, oldest))
+
+        if self.max_messages is not None:
+            while len(self._order) > self.max_messages:
+                oldest, _ = self._order.popitem(last=False)
+                self._evict(oldest)
+
+    def remove_message(
+        self, channel_id: int, message_id: int, *args
+    ) -> Optional[Message]:
+        """Removes a message and returns it
+
+        Parameters
+        ----------
+        channel_id: :class:`int`
+            ID of the channel the message is in
+        message_id: :class:`int`
+            ID of the message
+        default: Any
+            Returned if the message is not cached,
+            otherwise a :class:`KeyError` is raised
+        """
+        key = (channel_id, message_id)
+
+        if key not in self:
+            if args:
+                return args[0]
+            raise KeyError(key)
+
+        self._order.pop(key, None)
+        self._channels[channel_id].pop(message_id, None)
+
+        return self._discard(key)
+
+    def channel_messages(self, channel_id: int) -> Iterator[Message]:
+        """Returns the cached messages of a channel, least recently used first
+
+        Parameters
+        ----------
+        channel_id: :class:`int`
+            ID of the channel
+        """
+        for message_id in self._channels.get(channel_id, ()):
+            yield self[(channel_id, message_id)]
+
+    def clear(self) -> None:
+        super().clear()
+
+        self._order.clear()
+        self._channels.clear()
+        self._sizes.clear()
+        self.nbytes = 0
+
+    def _evict(self, key: MessageKey) -> None:
+        # Key has already been removed from one of the orderings
+        channel_id, message_id = key
+
+        self._order.pop(key, None)
+        self._channels[channel_id].pop(message_id, None)
+
+        self._discard(key)
+        self.evictions += 1
+
+    def _discard(self, key: MessageKey) -> Message:
+        message = self.pop(key)
+        self.nbytes -= self._sizes.pop(key)
+
+        if not self._channels[key[0]]:
+            del self._channels[key[0]]
+
+        return message
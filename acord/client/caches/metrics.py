@@ -0,0 +1,130 @@
+# Hit, miss and eviction counters for caches
+from __future__ import annotations
+
+from typing import Any, Dict, Tuple
+
+
+class SectionMetrics:
+    """Counters for a single cache section
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        Number of lookups which found an item
+    misses: :class:`int`
+        Number of lookups which found nothing
+    inserts: :class:`int`
+        Number of items added or replaced
+    removals: :class:`int`
+        Number of items explicitly removed
+    """
+
+    __slots__ = ("hits", "misses", "inserts", "removals")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.removals = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups which were hits, ``0`` if nothing was looked up"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheMetrics:
+    """Counters for every section of a :class:`Cache`,
+    sections are created on first use.
+    """
+
+    __slots__ = ("sections",)
+
+    def __init__(self) -> None:
+        self.sections: Dict[str, SectionMetrics] = {}
+
+    def __getitem__(self, section: str) -> SectionMetrics:
+        try:
+            return self.sections[section]
+        except KeyError:
+            metrics = self.sections[section] = SectionMetrics()
+            return metrics
+
+    def lookup(self, section: str, found: bool) -> None:
+        metrics = self[section]
+
+        if found:
+            metrics.hits += 1
+        else:
+            metrics.misses += 1
+
+    def insert(self, section: str) -> None:
+        self[section].inserts += 1
+
+    def remove(self, section: str) -> None:
+        self[section].removals += 1
+
+    def reset(self) -> None:
+        self.sections.clear()
+
+
+def section_stats(metrics: SectionMetrics, section: Any) -> Dict[str, Any]:
+    """Combines recorded counters with those kept by the section itself,
+    section may be ``None`` for lookups recorded outside of the cache.
+    """
+    stats = {
+        "hits": metrics.hits,
+        "misses": metrics.misses,
+        "inserts": metrics.inserts,
+        "removals": metrics.removals,
+        "evictions": getattr(section, "evictions", 0),
+        "expirations": getattr(section, "expirations", 0),
+        "hit_ratio": metrics.hit_ratio,
+    }
+
+    if section is not None:
+        stats["size"] = len(section)
+
+    nbytes = getattr(section, "nbytes", None)
+    if nbytes is not None:
+        stats["bytes"] = nbytes
+
+    return stats
+
+
+_PROMETHEUS_TYPES: Tuple[Tuple[str, str, str], ...] = (
+    ("hits", "counter", "Lookups which found an item"),
+    ("misses", "counter", "Lookups which found nothing"),
+    ("inserts", "counter", "Items added or replaced"),
+    ("removals", "counter", "Items explicitly removed"),
+    ("evictions", "counter", "Items evicted to stay within limits"),
+    ("expirations", "counter", "Items removed after their TTL passed"),
+    ("size", "gauge", "Items currently cached"),
+    ("bytes", "gauge", "Approximate bytes held by cached items"),
+)
+
+
+def to_prometheus(stats: Dict[str, Dict[str, Any]], prefix: str) -> str:
+    """Formats cache stats using the Prometheus text exposition format"""
+    lines = []
+
+    for name, kind, description in _PROMETHEUS_TYPES:
+        samples = [
+            (section, values[name])
+            for section, values in stats.items()
+            if name in values
+        ]
+
+        if not samples:
+            continue
+
+        metric = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(
+            f'{metric}{{section="{section}"}} {value}' for section, value in samples
+        )
+
+    return "\n".join(lines) + "\n"
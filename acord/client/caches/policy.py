@@ -0,0 +1,246 @@
+# Eviction policies for cache sections
+from __future__ import annotations
+
+import heapq
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Literal, Optional
+from weakref import WeakValueDictionary
+
+import pydantic
+
+_MISSING = object()
+
+
+class CachePolicy(pydantic.BaseModel):
+    """Describes how a cache section stores and evicts items.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        cache = DefaultCache(
+            policies={
+                "users": CachePolicy(max_size=50000, ttl=3600),
+                "channels": CachePolicy(max_size=10000, eviction="lfu"),
+                "stage_instances": CachePolicy(disabled=True),
+            }
+        )
+
+    .. note::
+        Items are never removed by a timer,
+        expired items are removed when they are read
+        and expired or excess items are removed on insert.
+        :meth:`Cache.start_sweeper` can be used to also remove them periodically.
+    """
+
+    max_size: Optional[int] = None
+    """ Maximum number of items, ``None`` for no limit """
+    ttl: Optional[float] = None
+    """ Seconds an item is kept after it was last added, ``None`` to keep forever """
+    eviction: Literal["lru", "lfu", "fifo"] = "lru"
+    """ Which items are evicted first once ``max_size`` is reached """
+    weak: bool = False
+    """ Whether items are only kept while referenced elsewhere, other limits are ignored """
+    disabled: bool = False
+    """ Whether nothing should be stored in this section """
+
+    def build(self) -> dict:
+        """Creates an empty section which follows this policy"""
+        if self.disabled:
+            return DisabledSection()
+        if self.weak:
+            return WeakValueDictionary()
+        if self.max_size is None and self.ttl is None:
+            # Nothing to enforce
+            return {}
+        return PolicySection(self)
+
+
+class DisabledSection(dict):
+    """A cache section which never stores anything"""
+
+    disabled = True
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        pass
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        return default
+
+    def update(self, *args, **kwds) -> None:
+        pass
+
+
+class PolicySection(dict):
+    """A cache section which enforces a :class:`CachePolicy`,
+    behaves like a normal :class:`dict`.
+
+    Parameters
+    ----------
+    policy: :class:`CachePolicy`
+        Policy to follow
+
+    Attributes
+    ----------
+    evictions: :class:`int`
+        Number of items evicted because the section was full
+    expirations: :class:`int`
+        Number of items removed because their TTL passed
+    """
+
+    disabled = False
+
+    def __init__(self, policy: CachePolicy) -> None:
+        super().__init__()
+
+        self.policy = policy
+        self.evictions = 0
+        self.expirations = 0
+
+        # Recency for lru and insertion order for fifo, oldest first
+        self._order: OrderedDict[Any, None] = OrderedDict()
+        # Reads per key for lfu
+        self._hits: Dict[Any, int] = {}
+        # Deadlines in the order they were set, soonest first
+        self._deadlines: OrderedDict[Any, float] = OrderedDict()
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.get(key, _MISSING)
+
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            return default
+
+        deadline = self._deadlines.get(key)
+
+        if deadline is not None and deadline <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return default
+
+        if self.policy.eviction == "lru":
+            self._order.move_to_end(key)
+        elif self.policy.eviction == "lfu":
+            self._hits[key] += 1
+
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        policy = self.policy
+
+        if dict.__contains__(self, key):
+            if policy.eviction == "lru":
+                self._order.move_to_end(key)
+        else:
+            self._order[key] = None
+            self._hits[key] = 0
+
+        if policy.ttl is not None:
+            self._deadlines.pop(key, None)
+            self._deadlines[key] = time.monotonic() + policy.ttl
+
+        dict.__setitem__(self, key, value)
+
+        # Amortized cleanup, expired items are always at the front
+        self.sweep()
+
+        if policy.max_size is not None and len(self) > policy.max_size:
+            self._evict(len(self) - policy.max_size, keep=key)
+
+    def __delitem__(self, key: Any) -> None:
+        if not dict.__contains__(self, key):
+            raise KeyError(key)
+        self._remove(key)
+
+    def pop(self, key: Any, *args) -> Any:
+        if not dict.__contains__(self, key):
+            if args:
+                return args[0]
+            raise KeyError(key)
+
+        value = dict.__getitem__(self, key)
+        self._remove(key)
+        return value
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        value = self.get(key, _MISSING)
+
+        if value is _MISSING:
+            self[key] = value = default
+        return value
+
+    def update(self, *args, **kwds) -> None:
+        for key, value in dict(*args, **kwds).items():
+            self[key] = value
+
+    def keys(self):
+        self.sweep()
+        return dict.keys(self)
+
+    def values(self):
+        self.sweep()
+        return dict.values(self)
+
+    def items(self):
+        self.sweep()
+        return dict.items(self)
+
+    def clear(self) -> None:
+        dict.clear(self)
+
+        self._order.clear()
+        self._hits.clear()
+        self._deadlines.clear()
+
+    def sweep(self) -> int:
+        """Removes expired items, returns how many were removed"""
+        if not self._deadlines:
+            return 0
+
+        now = time.monotonic()
+        removed = 0
+
+        for key, deadline in self._deadlines.items():
+            if deadline > now:
+                break
+            removed += 1
+
+        for _ in range(removed):
+            key, _ = self._deadlines.popitem(last=False)
+            self._remove(key)
+
+        self.expirations += removed
+        return removed
+
+    def _evict(self, count: int, keep: Any = _MISSING) -> None:
+        if self.policy.eviction == "lfu":
+            # Evict a batch so finding the least used items is amortized,
+            # the item just added has no reads yet so is never a candidate
+            count = max(count, len(self) // 16)
+            keys = heapq.nsmallest(
+                count,
+                (key for key in self._hits if key != keep),
+                key=self._hits.__getitem__,
+            )
+        else:
+            keys = [key for key, _ in zip(self._order, range(count))]
+
+        for key in keys:
+            self._remove(key)
+
+        self.evictions += len(keys)
+
+    def _remove(self, key: Any) -> None:
+        dict.__delitem__(self, key)
+
+        self._order.pop(key, None)
+        self._hits.pop(key, None)
+        self._deadlines.pop(key, None)
@@ -0,0 +1,68 @@
+# Binary encoding of cached models
+from __future__ import annotations
+
+import io
+import pickle
+import typing
+
+from acord.core.http import HTTPClient
+from acord.models.lazy import LazyModel
+
+#: Errors raised when an item cannot be encoded
+ENCODE_ERRORS = (pickle.PicklingError, TypeError, AttributeError)
+
+
+class _ModelPickler(pickle.Pickler):
+    # Connections are replaced with a reference and restored on load
+    def __init__(self, file: typing.BinaryIO, conn: typing.Any) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.conn = conn
+
+    def persistent_id(self, obj: typing.Any) -> typing.Optional[str]:
+        if isinstance(obj, HTTPClient) or (obj is self.conn and obj is not None):
+            return "conn"
+        return None
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    def __init__(self, file: typing.BinaryIO, conn: typing.Any) -> None:
+        super().__init__(file)
+        self.conn = conn
+
+    def persistent_load(self, pid: str) -> typing.Any:
+        if pid == "conn":
+            return self.conn
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}")
+
+
+def encode_item(item: typing.Any, conn: typing.Any = None) -> bytes:
+    """Encodes a cached model, any connection it holds is stored as a reference.
+    Models are stored exactly as they are, so validators do not run again on decode.
+
+    Parameters
+    ----------
+    item: Any
+        Item to encode
+    conn: :class:`HTTPClient`
+        Connection to replace, in addition to any :class:`HTTPClient`
+    """
+    if type(item) is LazyModel:
+        # Proxies can't be pickled, the full model is stored instead
+        item = item.materialize()
+
+    buffer = io.BytesIO()
+    _ModelPickler(buffer, conn).dump(item)
+    return buffer.getvalue()
+
+
+def decode_item(data: bytes, conn: typing.Any = None) -> typing.Any:
+    """Decodes an item created by :func:`encode_item`
+
+    Parameters
+    ----------
+    data: :class:`bytes`
+        Encoded item
+    conn: :class:`HTTPClient`
+        Connection to restore references with
+    """
+    return _ModelUnpickler(io.BytesIO(data), conn).load()
@@ -0,0 +1,798 @@
+# Shared memory cache for running one bot across several processes
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import struct
+import threading
+import time
+import typing
+from multiprocessing import shared_memory
+
+import pydantic
+
+from acord.models import Guild, Message, StageInstance, User
+
+from .default import DefaultCache
+from .serial import ENCODE_ERRORS, decode_item, encode_item
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ACRDSHM2"
+
+# magic, seq, slots, size, active, used, count, tombstones
+_HEADER = struct.Struct("<8s7Q")
+_HEADER_SIZE = 64
+_SEQ_OFFSET = 8
+_ACTIVE_OFFSET = 32
+
+# section, key1, key2, offset, length
+_SLOT = struct.Struct("<B7xQQQI4x")
+
+_EMPTY = 0
+_TOMBSTONE = 255
+
+# Sentinels telling the writer to store or remove an item, rewrite or empty
+# the block, or to report back once everything before it is written
+_PUT = object()
+_DELETE = object()
+_PUBLISH = object()
+_CLEAR = object()
+_FLUSH = object()
+
+# Attempts at encoding an item which changed while being pickled
+_ENCODE_ATTEMPTS = 3
+
+SECTION_IDS = {
+    "users": 1,
+    "guilds": 2,
+    "channels": 3,
+    "messages": 4,
+    "stage_instances": 5,
+}
+
+# Fraction of slots which may be used before the table is considered full
+MAX_LOAD = 0.75
+# Attempts a reader makes before treating a busy store as a miss
+READ_RETRIES = 100
+
+_MASK = (1 << 64) - 1
+
+
+def _split_key(key: typing.Any) -> typing.Tuple[int, int]:
+    if isinstance(key, tuple):
+        return key
+    return key, 0
+
+
+class StoreFull(Exception):
+    """Raised when a :class:`SharedStore` has no room left for an item"""
+
+
+class SharedStore:
+    """A hash table of encoded items in a shared memory block,
+    which one process writes to and any number of processes read from.
+
+    Items are appended to a data area and indexed by an open addressing table,
+    replaced and removed items are only reclaimed by :meth:`SharedStore.clear`
+    or :meth:`SharedStore.replace`.
+    Readers use a sequence counter to detect concurrent writes and retry,
+    so they never take a lock.
+
+    The block holds two regions, each with an index and data area,
+    and readers only use the active one.
+    :meth:`SharedStore.replace` rebuilds the other region and then swaps them,
+    so readers never see a partially rebuilt store.
+
+    Parameters
+    ----------
+    name: :class:`str`
+        Name of the shared memory block
+    create: :class:`bool`
+        Whether to create the block, replacing any existing block with the same name.
+        Otherwise an existing block is attached to.
+    slots: :class:`int`
+        Number of index slots, limits how many items can be stored
+    size: :class:`int`
+        Bytes available for encoded items in each region
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        create: bool = False,
+        slots: int = 1 << 18,
+        size: int = 1 << 28,
+    ) -> None:
+        self.name = name
+        self.owner = create
+
+        if create:
+            try:
+                shared_memory.SharedMemory(name).unlink()
+            except FileNotFoundError:
+                pass
+
+            self._shm = shared_memory.SharedMemory(
+                name, create=True, size=_HEADER_SIZE + 2 * (slots * _SLOT.size + size)
+            )
+            _HEADER.pack_into(self._shm.buf, 0, MAGIC, 0, slots, size, 0, 0, 0, 0)
+        else:
+            self._shm = shared_memory.SharedMemory(name)
+            self._untrack()
+
+            magic, _, slots, size, *_ = _HEADER.unpack_from(self._shm.buf, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Shared memory block {name!r} is not an acord cache")
+
+        self.slots = slots
+        self.size = size
+
+        self._buf = self._shm.buf
+        self._index_size = slots * _SLOT.size
+        # Start of each region, the index is followed by the data area
+        self._regions = (
+            _HEADER_SIZE,
+            _HEADER_SIZE + self._index_size + size,
+        )
+
+    def _untrack(self) -> None:
+        # Attaching registers the block with the resource tracker,
+        # which would unlink it when this process exits
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+
+    # NOTE: Header
+
+    def _header(self) -> typing.Tuple[int, ...]:
+        return _HEADER.unpack_from(self._buf, 0)[1:]
+
+    def _seq(self) -> int:
+        return struct.unpack_from("<Q", self._buf, _SEQ_OFFSET)[0]
+
+    def _region(self) -> int:
+        return self._regions[self._header()[3]]
+
+    def _set_header(self, used: int, count: int, tombstones: int) -> None:
+        struct.pack_into("<3Q", self._buf, _ACTIVE_OFFSET + 8, used, count, tombstones)
+
+    def _begin(self) -> None:
+        # An odd sequence tells readers a write is in progress
+        struct.pack_into("<Q", self._buf, _SEQ_OFFSET, self._seq() + 1)
+
+    _end = _begin
+
+    def __len__(self) -> int:
+        return self._header()[5]
+
+    @property
+    def used(self) -> int:
+        """Bytes of the data area in use, including replaced items"""
+        return self._header()[4]
+
+    # NOTE: Index
+
+    def _slot_offset(self, region: int, index: int) -> int:
+        return region + index * _SLOT.size
+
+    def _probe(self, section: int, key1: int, key2: int) -> typing.Iterator[int]:
+        h = ((key1 ^ (key2 * 31) ^ section) * 0x9E3779B97F4A7C15) & _MASK
+        index = (h >> 16) % self.slots
+
+        for _ in range(self.slots):
+            yield index
+            index = (index + 1) % self.slots
+
+    def _find(
+        self, region: int, section: int, key1: int, key2: int
+    ) -> typing.Tuple[typing.Optional[int], typing.Optional[int]]:
+        # Returns the matching slot and the first free slot on its probe path
+        free = None
+
+        for index in self._probe(section, key1, key2):
+            s, k1, k2, _, _ = _SLOT.unpack_from(
+                self._buf, self._slot_offset(region, index)
+            )
+
+            if s == _EMPTY:
+                return None, index if free is None else free
+            if s == _TOMBSTONE:
+                if free is None:
+                    free = index
+            elif s == section and k1 == key1 and k2 == key2:
+                return index, free
+
+        return None, free
+
+    # NOTE: Writing
+
+    def put(self, section: int, key: typing.Any, data: bytes) -> None:
+        """Stores an encoded item, replacing any item with the same key
+
+        Raises
+        ------
+        StoreFull
+            There is no room for the item
+        """
+        key1, key2 = _split_key(key)
+        _, _, _, _, used, count, tombstones = self._header()
+        region = self._region()
+
+        if used + len(data) > self.size:
+            raise StoreFull("Shared store data area is full")
+
+        index, free = self._find(region, section, key1, key2)
+
+        if index is None:
+            if free is None or count + tombstones + 1 > self.slots * MAX_LOAD:
+                raise StoreFull("Shared store index is full")
+
+            s = _SLOT.unpack_from(self._buf, self._slot_offset(region, free))[0]
+            if s == _TOMBSTONE:
+                tombstones -= 1
+
+            index = free
+            count += 1
+
+        self._begin()
+        try:
+            self._write(region, index, section, key1, key2, used, data)
+            self._set_header(used + len(data), count, tombstones)
+        finally:
+            self._end()
+
+    def _write(
+        self,
+        region: int,
+        index: int,
+        section: int,
+        key1: int,
+        key2: int,
+        offset: int,
+        data: bytes,
+    ) -> None:
+        start = region + self._index_size + offset
+        self._buf[start : start + len(data)] = data
+        _SLOT.pack_into(
+            self._buf,
+            self._slot_offset(region, index),
+            section,
+            key1,
+            key2,
+            offset,
+            len(data),
+        )
+
+    def delete(self, section: int, key: typing.Any) -> bool:
+        """Removes an item, returns whether it was stored"""
+        key1, key2 = _split_key(key)
+        region = self._region()
+        index, _ = self._find(region, section, key1, key2)
+
+        if index is None:
+            return False
+
+        _, _, _, _, used, count, tombstones = self._header()
+
+        self._begin()
+        try:
+            _SLOT.pack_into(
+                self._buf, self._slot_offset(region, index), _TOMBSTONE, 0, 0, 0, 0
+            )
+            self._set_header(used, count - 1, tombstones + 1)
+        finally:
+            self._end()
+
+        return True
+
+    def clear(self) -> None:
+        """Removes every item and reclaims all space"""
+        region = self._region()
+
+        self._begin()
+        try:
+            self._buf[region : region + self._index_size] = bytes(self._index_size)
+            self._set_header(0, 0, 0)
+        finally:
+            self._end()
+
+    def replace(
+        self, items: typing.Iterable[typing.Tuple[int, typing.Any, bytes]]
+    ) -> int:
+        """Replaces every item at once, reclaiming all space.
+        Readers see the previous items until every new item has been written.
+        Returns the number of items which did not fit.
+
+        Parameters
+        ----------
+        items: Iterable[Tuple[:class:`int`, Any, :class:`bytes`]]
+            Section, key and encoded data of each item
+        """
+        active = self._header()[3]
+        region = self._regions[1 - active]
+        used = count = skipped = 0
+
+        # Readers only use the active region, so the other is written without locking
+        self._buf[region : region + self._index_size] = bytes(self._index_size)
+
+        for section, key, data in items:
+            key1, key2 = _split_key(key)
+
+            if used + len(data) > self.size or count + 1 > self.slots * MAX_LOAD:
+                skipped += 1
+                continue
+
+            index, free = self._find(region, section, key1, key2)
+
+            if index is None:
+                index = free
+                count += 1
+
+            self._write(region, index, section, key1, key2, used, data)
+            used += len(data)
+
+        self._begin()
+        try:
+            struct.pack_into(
+                "<4Q", self._buf, _ACTIVE_OFFSET, 1 - active, used, count, 0
+            )
+        finally:
+            self._end()
+
+        return skipped
+
+    # NOTE: Reading
+
+    def _read(self, func: typing.Callable[[], typing.Any]) -> typing.Any:
+        for _ in range(READ_RETRIES):
+            seq = self._seq()
+
+            if seq % 2:
+                time.sleep(0)
+                continue
+
+            try:
+                result = func()
+            except (struct.error, ValueError, IndexError):
+                # Read a half written slot
+                result = None
+
+            if self._seq() == seq:
+                return result
+
+        logger.debug(f"Shared store {self.name!r} stayed busy, treating read as a miss")
+        return None
+
+    def get(self, section: int, key: typing.Any) -> typing.Optional[bytes]:
+        """Returns an encoded item, ``None`` if it is not stored"""
+        key1, key2 = _split_key(key)
+
+        def read():
+            region = self._region()
+            index, _ = self._find(region, section, key1, key2)
+
+            if index is None:
+                return None
+
+            _, _, _, offset, length = _SLOT.unpack_from(
+                self._buf, self._slot_offset(region, index)
+            )
+            start = region + self._index_size + offset
+            return bytes(self._buf[start : start + length])
+
+        return self._read(read)
+
+    def keys(self, section: int) -> typing.List[typing.Tuple[int, int]]:
+        """Returns the keys stored for a section as ``(key1, key2)`` pairs"""
+
+        def read():
+            region = self._region()
+            keys = []
+            for index in range(self.slots):
+                s, key1, key2, _, _ = _SLOT.unpack_from(
+                    self._buf, self._slot_offset(region, index)
+                )
+                if s == section:
+                    keys.append((key1, key2))
+            return keys
+
+        return self._read(read) or []
+
+    def close(self) -> None:
+        """Detaches from the block, the owner also destroys it"""
+        self._buf = None
+        self._shm.close()
+
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedCache(DefaultCache):
+    """A :class:`DefaultCache` which shares its items with other processes
+    through a shared memory block.
+
+    One process owns the cache, it keeps items in memory like :class:`DefaultCache`
+    and publishes every added item to the block in an encoded form.
+    Items are encoded and written from a background thread,
+    an item added several times before the thread gets to it is only written once.
+    :meth:`SharedCache.flush` waits for queued items to be written.
+    Other processes attach as readers, and look items up in the block
+    when they are not found in their own memory.
+    So only the owner holds full copies of every item,
+    readers decode items as they are requested.
+
+    .. note::
+        Items changed in place, for example members added to a cached guild,
+        reach readers when the item is added again or on :meth:`SharedCache.publish`.
+        :meth:`SharedCache.start_publisher` can be used to publish periodically.
+
+    .. note::
+        Items added to a reader are only cached in that process.
+
+    .. warning::
+        Items are shared pickled, and readers unpickle whatever is in the block.
+        Any process which can open the shared memory block can run code in readers,
+        so only share it between processes you trust.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        # Process receiving events for every guild
+        client = Client(cache=SharedCache(name="my-bot", owner=True))
+
+        # Other processes
+        cache = SharedCache(name="my-bot", owner=False)
+        cache.get_guild(guild_id)
+
+    Parameters
+    ----------
+    name: :class:`str`
+        Name of the shared memory block, must match across processes
+    owner: :class:`bool`
+        Whether this process owns the block.
+        The owner must be created before any readers.
+    slots: :class:`int`
+        Maximum number of items in the block, only used by the owner
+    size: :class:`int`
+        Bytes available for encoded items, only used by the owner.
+        The block reserves this twice, so it can be rebuilt while readers use it.
+        Memory is only committed by the system as it is used.
+    """
+
+    name: str = "acord-cache"
+    owner: bool = True
+    slots: int = 1 << 18
+    size: int = 1 << 28
+
+    _conn: typing.Any = pydantic.PrivateAttr(default=None)
+    _store: typing.Any = pydantic.PrivateAttr(default=None)
+    _queue: typing.Any = pydantic.PrivateAttr(default=None)
+    _writer: typing.Any = pydantic.PrivateAttr(default=None)
+
+    def __init__(self, **kwds) -> None:
+        super().__init__(**kwds)
+
+        self._store = SharedStore(
+            self.name, create=self.owner, slots=self.slots, size=self.size
+        )
+
+        if self.owner:
+            self._queue = queue.Queue()
+
+            self._writer = threading.Thread(
+                target=self._write_task, name="acord-shared-cache", daemon=True
+            )
+            self._writer.start()
+
+    @property
+    def store(self) -> SharedStore:
+        """The shared memory block backing this cache"""
+        return self._store
+
+    def bind(self, conn: typing.Any) -> None:
+        self._conn = conn
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+        if self._store._buf is not None:
+            self._store.close()
+
+    # NOTE: Publishing
+
+    def _publish(self, section: str, key: typing.Any, item: typing.Any) -> None:
+        # Encoded and written by the writer, so the event loop is not blocked pickling
+        if self.owner:
+            self._queue.put((_PUT, (SECTION_IDS[section], key), item))
+
+    def _unpublish(self, section: str, key: typing.Any) -> None:
+        if self.owner:
+            self._queue.put((_DELETE, (SECTION_IDS[section], key), None))
+
+    def _encode(
+        self, key: typing.Tuple[int, typing.Any], item: typing.Any
+    ) -> typing.Optional[bytes]:
+        for _ in range(_ENCODE_ATTEMPTS):
+            try:
+                return encode_item(item, self._conn)
+            except ENCODE_ERRORS:
+                break
+            except RuntimeError:
+                # Modified by the event loop while pickling
+                continue
+
+        logger.debug(f"Failed to encode item {key}, not sharing")
+        return None
+
+    def _encode_all(self) -> typing.Iterator[typing.Tuple[int, typing.Any, bytes]]:
+        for section, section_id in SECTION_IDS.items():
+            cache = self[section]
+
+            for _ in range(_ENCODE_ATTEMPTS):
+                try:
+                    items = list(cache.items())
+                    break
+                except RuntimeError:
+                    # Resized by the event loop while copying
+                    continue
+            else:
+                items = []
+
+            for key, item in items:
+                data = self._encode((section_id, key), item)
+                if data is not None:
+                    yield section_id, key, data
+
+    def _rebuild(self) -> None:
+        if self._store.replace(self._encode_all()):
+            logger.warning(f"Shared cache {self.name!r} is full, publish incomplete")
+
+    def _write_task(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            waiters = []
+            # Latest item for each key, None for deletes
+            pending: typing.Dict[typing.Tuple[int, typing.Any], typing.Any] = {}
+            rebuild = closing = False
+
+            for entry in batch:
+                if entry is None:
+                    closing = True
+                    break
+
+                op = entry[0]
+
+                if op is _FLUSH:
+                    waiters.append(entry[1])
+                elif op is _CLEAR:
+                    pending.clear()
+                    rebuild = False
+                    self._store.clear()
+                elif op is _PUBLISH:
+                    # Memory already holds every pending change
+                    pending.clear()
+                    rebuild = True
+                else:
+                    pending[entry[1]] = entry[2] if op is _PUT else None
+
+            if rebuild:
+                self._rebuild()
+
+            for key, item in pending.items():
+                if item is None:
+                    self._store.delete(*key)
+                elif (data := self._encode(key, item)) is not None:
+                    self._put(key, data)
+
+            for waiter in waiters:
+                waiter.set()
+
+            if closing:
+                return
+
+    def _put(self, key: typing.Tuple[int, typing.Any], data: bytes) -> None:
+        try:
+            self._store.put(*key, data)
+        except StoreFull:
+            # Reclaim space used by replaced and removed items
+            self._rebuild()
+
+            try:
+                self._store.put(*key, data)
+            except StoreFull:
+                logger.warning(
+                    f"Shared cache {self.name!r} is full, item {key} is not shared"
+                )
+
+    def publish(self) -> None:
+        """Queues a rewrite of the block from the items currently in memory,
+        reclaiming space and sharing any changes made in place.
+        Readers keep seeing the previous items until the rewrite is complete.
+        Only available to the owner.
+        """
+        if not self.owner:
+            raise RuntimeError("Only the owner of a shared cache can publish")
+
+        self._queue.put((_PUBLISH, None, None))
+
+    def flush(self, timeout: float = None) -> None:
+        """Blocks until every queued change has been written to the block.
+        Only available to the owner.
+
+        Parameters
+        ----------
+        timeout: :class:`float`
+            Maximum seconds to wait
+        """
+        if not self.owner:
+            raise RuntimeError("Only the owner of a shared cache can flush")
+
+        if not self._writer.is_alive():
+            return
+
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def start_publisher(
+        self, interval: float = 60, *, loop: asyncio.AbstractEventLoop = None
+    ) -> asyncio.Task:
+        """Starts a task which calls :meth:`SharedCache.publish` every ``interval`` seconds
+
+        Parameters
+        ----------
+        interval: :class:`float`
+            Seconds between publishes
+        loop: :obj:`py:asyncio.AbstractEventLoop`
+            Loop to create the task on
+        """
+
+        async def publisher():
+            while True:
+                await asyncio.sleep(interval)
+                self.publish()
+
+        return (loop or asyncio.get_event_loop()).create_task(publisher())
+
+    # NOTE: Lookups
+
+    def _lookup(self, section: str, key: typing.Any) -> typing.Any:
+        data = self._store.get(SECTION_IDS[section], key)
+
+        if data is None:
+            return None
+
+        try:
+            return decode_item(data, self._conn)
+        except Exception:
+            logger.debug(f"Failed to decode shared {section} item {key}")
+            return None
+
+    def _iter_section(self, section: str) -> typing.Iterator[typing.Any]:
+        cache = self[section]
+        yield from list(cache.values())
+
+        if self.owner:
+            return
+
+        for key1, key2 in self._store.keys(SECTION_IDS[section]):
+            key = (key1, key2) if section == "messages" else key1
+
+            if key in cache:
+                continue
+
+            item = self._lookup(section, key)
+            if item is not None:
+                yield item
+
+    def clear(self):
+        super().clear()
+
+        if self.owner:
+            self._queue.put((_CLEAR, None, None))
+
+    # NOTE: Users
+
+    def users(self) -> typing.Iterator[User]:
+        return self._iter_section("users")
+
+    def get_user(self, user_id: int, /) -> typing.Optional[User]:
+        return super().get_user(user_id) or self._lookup("users", user_id)
+
+    def add_user(self, user: User, /) -> User:
+        user = super().add_user(user)
+        self._publish("users", user.id, user)
+        return user
+
+    def remove_user(self, user_id: int, *args) -> typing.Optional[User]:
+        self._unpublish("users", user_id)
+        return super().remove_user(user_id, *args)
+
+    # NOTE: Guilds
+
+    def guilds(self) -> typing.Iterator[Guild]:
+        return self._iter_section("guilds")
+
+    def get_guild(self, guild_id: int, /) -> typing.Optional[Guild]:
+        return super().get_guild(guild_id) or self._lookup("guilds", guild_id)
+
+    def add_guild(self, guild: Guild, /) -> None:
+        super().add_guild(guild)
+        self._publish("guilds", guild.id, guild)
+
+    def remove_guild(self, guild_id: int, *args) -> typing.Optional[Guild]:
+        self._unpublish("guilds", guild_id)
+        return super().remove_guild(guild_id, *args)
+
+    # NOTE: Channels
+
+    def channels(self):
+        return self._iter_section("channels")
+
+    def get_channel(self, channel_id: int, /):
+        return super().get_channel(channel_id) or self._lookup("channels", channel_id)
+
+    def add_channel(self, channel, /) -> None:
+        super().add_channel(channel)
+        self._publish("channels", channel.id, channel)
+
+    def remove_channel(self, channel_id: int, *args):
+        self._unpublish("channels", channel_id)
+        return super().remove_channel(channel_id, *args)
+
+    # NOTE: Messages
+
+    def messages(self) -> typing.Iterator[Message]:
+        return self._iter_section("messages")
+
+    def get_message(
+        self, channel_id: int, message_id: int, /
+    ) -> typing.Optional[Message]:
+        return super().get_message(channel_id, message_id) or self._lookup(
+            "messages", (channel_id, message_id)
+        )
+
+    def add_message(self, message: Message, /) -> None:
+        super().add_message(message)
+        self._publish("messages", (message.channel_id, message.id), message)
+
+    def remove_message(
+        self, channel_id: int, message_id: int, *args
+    ) -> typing.Optional[Message]:
+        self._unpublish("messages", (channel_id, message_id))
+        return super().remove_message(channel_id, message_id, *args)
+
+    # NOTE: Stage Instances
+
+    def stage_instances(self) -> typing.Iterator[StageInstance]:
+        return self._iter_section("stage_instances")
+
+    def get_stage_instance(self, id: int, /) -> typing.Optional[StageInstance]:
+        return super().get_stage_instance(id) or self._lookup("stage_instances", id)
+
+    def add_stage_instance(self, stage_instance: StageInstance) -> None:
+        super().add_stage_instance(stage_instance)
+        self._publish("stage_instances", stage_instance.id, stage_instance)
+
+    def remove_stage_instance(self, id: int, *args):
+        self._unpublish("stage_instances", id)
+        return super().remove_stage_instance(id, *args)
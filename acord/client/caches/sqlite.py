@@ -0,0 +1,352 @@
+# SQLite backed cache for acord
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+import typing
+
+import pydantic
+
+from acord.models import Guild, Message, StageInstance, User
+
+from .default import DefaultCache
+from .serial import ENCODE_ERRORS, decode_item, encode_item
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    section TEXT NOT NULL,
+    key1 INTEGER NOT NULL,
+    key2 INTEGER NOT NULL DEFAULT 0,
+    data BLOB NOT NULL,
+    PRIMARY KEY (section, key1, key2)
+) WITHOUT ROWID
+"""
+
+_UPSERT = (
+    "INSERT OR REPLACE INTO entries (section, key1, key2, data) VALUES (?, ?, ?, ?)"
+)
+_DELETE = "DELETE FROM entries WHERE section = ? AND key1 = ? AND key2 = ?"
+_SELECT = "SELECT data FROM entries WHERE section = ? AND key1 = ? AND key2 = ?"
+_SELECT_SECTION = "SELECT key1, key2, data FROM entries WHERE section = ?"
+
+# Sentinels telling the writer to commit and report back, or to empty the file
+_FLUSH = object()
+_CLEAR = object()
+
+# Attempts at serializing an item which changed while being pickled
+_ENCODE_ATTEMPTS = 3
+
+
+def _split_key(key: typing.Any) -> typing.Tuple[int, int]:
+    if isinstance(key, tuple):
+        return key
+    return key, 0
+
+
+class SQLiteCache(DefaultCache):
+    """A :class:`DefaultCache` which persists items to a local SQLite file,
+    so cached data survives restarts.
+
+    Items are kept in memory following the cache policies,
+    and every change is written to SQLite in batches from a background thread,
+    which also serializes them.
+    An item changed several times within a batch is only written once.
+    Items which are not in memory are read from the file on lookup
+    and only deserialized when requested.
+    Call :meth:`SQLiteCache.close` on shutdown to snapshot the memory layer,
+    :meth:`Client.disconnect` does this automatically.
+
+    .. note::
+        Items are stored pickled, so are rebuilt exactly as they were cached
+        without running validators again.
+        Items which cannot be rebuilt, for example after upgrading acord,
+        are treated as missing.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        cache = SQLiteCache(
+            path="cache.sqlite3",
+            policies={"guilds": CachePolicy(max_size=1000)},
+        )
+        client = Client(cache=cache)
+
+    Parameters
+    ----------
+    path: :class:`str`
+        Path of the SQLite file, created if it does not exist
+    batch_size: :class:`int`
+        Maximum number of writes per transaction
+    flush_interval: :class:`float`
+        Maximum seconds a write waits before being committed
+    """
+
+    path: str = "acord-cache.sqlite3"
+    batch_size: int = 500
+    flush_interval: float = 1.0
+
+    _conn: typing.Any = pydantic.PrivateAttr(default=None)
+    _reader: typing.Any = pydantic.PrivateAttr(default=None)
+    _queue: typing.Any = pydantic.PrivateAttr(default=None)
+    _writer: typing.Any = pydantic.PrivateAttr(default=None)
+
+    def __init__(self, **kwds) -> None:
+        super().__init__(**kwds)
+
+        reader = sqlite3.connect(self.path, check_same_thread=False)
+        reader.execute("PRAGMA journal_mode=WAL")
+        reader.execute(SCHEMA)
+        reader.commit()
+
+        self._reader = reader
+        self._queue = queue.Queue()
+
+        self._writer = threading.Thread(
+            target=self._write_task, name="acord-sqlite-cache", daemon=True
+        )
+        self._writer.start()
+
+    def bind(self, conn: typing.Any) -> None:
+        self._conn = conn
+
+    # NOTE: Persistence
+
+    def _persist(self, section: str, key: typing.Any, item: typing.Any) -> None:
+        # Serialized by the writer, so the event loop is not blocked pickling
+        self._queue.put((_UPSERT, (section, *_split_key(key)), item))
+
+    def _forget(self, section: str, key: typing.Any) -> None:
+        self._queue.put((_DELETE, (section, *_split_key(key)), None))
+
+    def _encode(
+        self, key: typing.Tuple[str, int, int], item: typing.Any
+    ) -> typing.Optional[bytes]:
+        section, *ids = key
+
+        for _ in range(_ENCODE_ATTEMPTS):
+            try:
+                return encode_item(item, self._conn)
+            except ENCODE_ERRORS:
+                break
+            except RuntimeError:
+                # Modified by the event loop while pickling
+                continue
+
+        logger.debug(f"Failed to serialize {section} item {ids}, not persisting")
+        return None
+
+    def _load(self, section: str, key: typing.Any) -> typing.Any:
+        row = self._reader.execute(_SELECT, (section, *_split_key(key))).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            item = decode_item(row[0], self._conn)
+        except Exception:
+            logger.debug(f"Failed to rebuild {section} item {key}, discarding")
+            self._forget(section, key)
+            return None
+
+        # Keep it in memory for next time, without writing it back
+        if section == "messages":
+            DefaultCache.add_message(self, item)
+        else:
+            self[section][key] = item
+
+        return item
+
+    def _iter_section(self, section: str) -> typing.Iterator[typing.Any]:
+        cache = self[section]
+        yield from list(cache.values())
+
+        for key1, key2, data in self._reader.execute(_SELECT_SECTION, (section,)):
+            key = (key1, key2) if section == "messages" else key1
+
+            if key in cache:
+                continue
+
+            try:
+                yield decode_item(data, self._conn)
+            except Exception:
+                continue
+
+    def _write_task(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        while True:
+            batch = [self._queue.get()]
+
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            waiters = []
+            # Latest item for each key, None for deletes
+            pending: typing.Dict[typing.Tuple[str, int, int], typing.Any] = {}
+            closing = False
+
+            for entry in batch:
+                if entry is None:
+                    closing = True
+                    break
+
+                op = entry[0]
+
+                if op is _FLUSH:
+                    waiters.append(entry[1])
+                elif op is _CLEAR:
+                    pending.clear()
+                    conn.execute("DELETE FROM entries")
+                else:
+                    pending[entry[1]] = entry[2] if op is _UPSERT else None
+
+            for key, item in pending.items():
+                if item is None:
+                    conn.execute(_DELETE, key)
+                elif (data := self._encode(key, item)) is not None:
+                    conn.execute(_UPSERT, (*key, data))
+
+            conn.commit()
+
+            for waiter in waiters:
+                waiter.set()
+
+            if closing:
+                conn.close()
+                return
+
+    def flush(self, timeout: float = None) -> None:
+        """Blocks until every queued write has been committed
+
+        Parameters
+        ----------
+        timeout: :class:`float`
+            Maximum seconds to wait
+        """
+        if not self._writer.is_alive():
+            return
+
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def snapshot(self) -> None:
+        """Writes every item currently in memory to the file"""
+        for section in ("users", "guilds", "channels", "messages", "stage_instances"):
+            for key, item in list(self[section].items()):
+                self._persist(section, key, item)
+
+        self.flush()
+
+    def close(self) -> None:
+        """Snapshots the cache and closes the file"""
+        if not self._writer.is_alive():
+            return
+
+        self.snapshot()
+
+        self._queue.put(None)
+        self._writer.join()
+        self._reader.close()
+
+    def clear(self):
+        super().clear()
+
+        self._queue.put((_CLEAR, None, None))
+
+    # NOTE: Users
+
+    def users(self) -> typing.Iterator[User]:
+        return self._iter_section("users")
+
+    def get_user(self, user_id: int, /) -> typing.Optional[User]:
+        return super().get_user(user_id) or self._load("users", user_id)
+
+    def add_user(self, user: User, /) -> User:
+        user = super().add_user(user)
+        self._persist("users", user.id, user)
+        return user
+
+    def remove_user(self, user_id: int, *args) -> typing.Optional[User]:
+        self._forget("users", user_id)
+        return super().remove_user(user_id, *args)
+
+    # NOTE: Guilds
+
+    def guilds(self) -> typing.Iterator[Guild]:
+        return self._iter_section("guilds")
+
+    def get_guild(self, guild_id: int, /) -> typing.Optional[Guild]:
+        return super().get_guild(guild_id) or self._load("guilds", guild_id)
+
+    def add_guild(self, guild: Guild, /) -> None:
+        super().add_guild(guild)
+        self._persist("guilds", guild.id, guild)
+
+    def remove_guild(self, guild_id: int, *args) -> typing.Optional[Guild]:
+        self._forget("guilds", guild_id)
+        return super().remove_guild(guild_id, *args)
+
+    # NOTE: Channels
+
+    def channels(self):
+        return self._iter_section("channels")
+
+    def get_channel(self, channel_id: int, /):
+        return super().get_channel(channel_id) or self._load("channels", channel_id)
+
+    def add_channel(self, channel, /) -> None:
+        super().add_channel(channel)
+        self._persist("channels", channel.id, channel)
+
+    def remove_channel(self, channel_id: int, *args):
+        self._forget("channels", channel_id)
+        return super().remove_channel(channel_id, *args)
+
+    # NOTE: Messages
+
+    def messages(self) -> typing.Iterator[Message]:
+        return self._iter_section("messages")
+
+    def get_message(
+        self, channel_id: int, message_id: int, /
+    ) -> typing.Optional[Message]:
+        return super().get_message(channel_id, message_id) or self._load(
+            "messages", (channel_id, message_id)
+        )
+
+    def add_message(self, message: Message, /) -> None:
+        super().add_message(message)
+        self._persist("messages", (message.channel_id, message.id), message)
+
+    def remove_message(
+        self, channel_id: int, message_id: int, *args
+    ) -> typing.Optional[Message]:
+        self._forget("messages", (channel_id, message_id))
+        return super().remove_message(channel_id, message_id, *args)
+
+    # NOTE: Stage Instances
+
+    def stage_instances(self) -> typing.Iterator[StageInstance]:
+        return self._iter_section("stage_instances")
+
+    def get_stage_instance(self, id: int, /) -> typing.Optional[StageInstance]:
+        return super().get_stage_instance(id) or self._load("stage_instances", id)
+
+    def add_stage_instance(self, stage_instance: StageInstance) -> None:
+        super().add_stage_instance(stage_instance)
+        self._persist("stage_instances", stage_instance.id, stage_instance)
+
+    def remove_stage_instance(self, id: int, *args):
+        self._forget("stage_instances", id)
+        return super().remove_stage_instance(id, *args)
@@ -0,0 +1,116 @@
+# Tracks member chunk requests sent through the gateway
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, Generator, List, Optional
+
+
+def generate_nonce() -> str:
+    # Discord allows nonces of up to 32 bytes
+    return os.urandom(16).hex()
+
+
+class ChunkRequest:
+    """A pending REQUEST_GUILD_MEMBERS request,
+    which can be awaited to get the members once every chunk has arrived.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        request = await shard.request_guild_members(guild_id, wait=False)
+
+        members = await request
+
+    Attributes
+    ----------
+    guild_id: :class:`Snowflake`
+        ID of the guild members were requested from
+    nonce: :class:`str`
+        Nonce sent with the request, used to match chunks
+    members: List[:class:`Member`]
+        Members received so far
+    not_found: List[:class:`Snowflake`]
+        IDs which were requested but are not members of the guild
+    presences: List[:class:`dict`]
+        Raw presences received, only sent if presences were requested
+    chunk_count: Optional[:class:`int`]
+        Number of chunks discord will send, ``None`` until the first arrives
+    received: :class:`int`
+        Number of chunks received so far
+    """
+
+    __slots__ = (
+        "guild_id",
+        "nonce",
+        "members",
+        "not_found",
+        "presences",
+        "chunk_count",
+        "received",
+        "_future",
+    )
+
+    def __init__(
+        self, guild_id: int, nonce: str, *, loop: asyncio.AbstractEventLoop = None
+    ) -> None:
+        self.guild_id = guild_id
+        self.nonce = nonce
+        self.members: List[Any] = []
+        self.not_found: List[int] = []
+        self.presences: List[Dict[str, Any]] = []
+        self.chunk_count: Optional[int] = None
+        self.received = 0
+
+        self._future = (loop or asyncio.get_event_loop()).create_future()
+
+    def __await__(self) -> Generator[Any, None, List[Any]]:
+        return asyncio.shield(self._future).__await__()
+
+    def done(self) -> bool:
+        """Whether every chunk has arrived, or the request failed"""
+        return self._future.done()
+
+    def feed(self, data: Dict[str, Any], members: List[Any]) -> bool:
+        """Adds a GUILD_MEMBERS_CHUNK to this request,
+        returns whether it was the last chunk.
+
+        Parameters
+        ----------
+        data: :class:`dict`
+            Chunk received from discord
+        members: List[:class:`Member`]
+            Members built from the chunk
+        """
+        self.members.extend(members)
+        self.not_found.extend(int(i) for i in data.get("not_found") or ())
+        self.presences.extend(data.get("presences") or ())
+
+        self.chunk_count = data.get("chunk_count", 1)
+        self.received += 1
+
+        if self.received >= self.chunk_count:
+            if not self._future.done():
+                self._future.set_result(self.members)
+            return True
+        return False
+
+    def fail(self, exc: BaseException) -> None:
+        """Fails the request, raising ``exc`` to anything awaiting it
+
+        Parameters
+        ----------
+        exc: :class:`BaseException`
+            Exception to raise
+        """
+        if not self._future.done():
+            self._future.set_exception(exc)
+            # Retrieve it, so unawaited requests are not logged
+            self._future.exception()
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkRequest(guild_id={self.guild_id}, nonce={self.nonce!r}, "
+            f"received={self.received}, chunk_count={self.chunk_count})"
+        )
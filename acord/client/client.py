@@ -3,6 +3,7 @@
     AsyncIterator,
     Coroutine,
     Dict,
+    Iterable,
     Iterator,
     List,
     Union,
@@ -25,10 +26,20 @@
 )
 from acord.ext.application_commands import ApplicationCommand, UDAppCommand
 from acord.bases import Intents, _C
-from acord.models import Message, Snowflake, User, Channel, Guild, StageInstance
+from acord.models import (
+    Message,
+    Snowflake,
+    User,
+    Channel,
+    Guild,
+    Member,
+    StageInstance,
+)
 from acord.utils import _d_to_channel
 
 from .shard import Shard
+from .handler import EventRegistry
+from .scheduler import IdentifyScheduler
 from .caches.cache import Cache
 from .caches.default import DefaultCache
 from .ratelimiter import GatewayRatelimiter, DefaultGatewayRatelimiter
@@ -52,7 +63,10 @@ class Client(object):
         Presence to be sent in the identity packet
     encoding: :class:`str`
         Any of ``ETF`` and ``JSON`` are allowed to be chosen, controls data recieved by discord,
-        defaults to ``False``.
+        defaults to ``JSON``.
+
+        .. note::
+            When using ``ETF``, snowflakes are received as :class:`int` rather then :class:`str`.
     compress: :class:`bool`
         Whether to read compressed stream when receiving requests, defaults to ``False``
     dispatch_on_recv: :class:`bool`
@@ -65,6 +79,26 @@ class Client(object):
         Gateway ratelimiter for client to use
 
         .. versionadded:: 0.2.3a0
+    event_registry: :class:`EventRegistry`
+        Registry of handlers for gateway events,
+        defaults to a registry containing the built in handlers.
+    skip_unused_events: :class:`bool`
+        Whether to skip gateway events which have no listeners,
+        before any models are built.
+        Message events are still handled while the cache has a ``messages`` section,
+        which :class:`DefaultCache` always has,
+        so they are only skipped once it is disabled with
+        ``policies={"messages": CachePolicy(disabled=True)}``.
+        Events which update guild members are always handled.
+        Defaults to ``False``.
+    lazy_events: :class:`bool`
+        Whether to dispatch messages as a :class:`LazyModel`,
+        which only validates fields when they are first accessed.
+        Defaults to ``False``.
+    shard_ids: Optional[List[:class:`int`]]
+        IDs of the shards this client should run,
+        defaults to every shard.
+        Requires :attr:`Client.num_shards` to be set, used by :class:`ClusterSupervisor`.
 
     Attributes
     ----------
@@ -128,6 +162,20 @@ class Client(object):
         List of guilds client has access to
     rest: :class:`RestApi`
         An instance of the Rest API object
+    event_registry: :class:`EventRegistry`
+        Handlers used for gateway events,
+        can be used to add, overwrite or disable handlers.
+    skip_unused_events: :class:`bool`
+        Whether gateway events with no listeners are skipped
+    lazy_events: :class:`bool`
+        Whether messages are dispatched as lazy models
+    shard_ids: Optional[List[:class:`int`]]
+        IDs of the shards this client runs, ``None`` for every shard
+    resume_data: Dict[:class:`int`, Tuple[:class:`str`, :class:`int`]]
+        Session ID and sequence for each shard which should resume instead of identifying
+    cluster: Optional[:class:`Cluster`]
+        IPC channel to the other clusters,
+        only set when running under a :class:`ClusterSupervisor`
     """
 
     cache: Cache
@@ -145,6 +193,10 @@ def __init__(
         compress: Optional[bool] = False,
         cache: Cache = DefaultCache(),
         gateway_ratelimiter: GatewayRatelimiter = DefaultGatewayRatelimiter(),
+        event_registry: EventRegistry = None,
+        skip_unused_events: bool = False,
+        lazy_events: bool = False,
+        shard_ids: Optional[List[int]] = None,
     ) -> None:
 
         self.loop = loop
@@ -176,6 +228,12 @@ def __init__(
 
         self.cache = cache
         self.gateway_ratelimiter = gateway_ratelimiter
+        self.event_registry = event_registry or EventRegistry()
+        self.skip_unused_events = skip_unused_events
+        self.lazy_events = lazy_events
+        self.shard_ids = shard_ids
+        self.resume_data = dict()
+        self.cluster = None
 
         self.shards = dict()
         self.max_concurrency = 0
@@ -375,6 +433,45 @@ def get_shard(self, guild_id: Snowflake) -> Optional[Shard]:
 
         return shard
 
+    async def chunk_guilds(
+        self,
+        guilds: Iterable[Union[Guild, Snowflake]] = None,
+        *,
+        presences: bool = False,
+        timeout: Optional[float] = 60.0,
+    ) -> Dict[Snowflake, List[Member]]:
+        """|coro|
+
+        Requests every member of many guilds through the gateway,
+        see :meth:`Guild.chunk`.
+        Requests are sent by each guild's shard through the gateway ratelimiter,
+        so shards request members concurrently without exceeding their limits.
+
+        Parameters
+        ----------
+        guilds: Iterable[Union[:class:`Guild`, :class:`Snowflake`]]
+            Guilds to chunk, defaults to every large guild in cache
+        presences: :class:`bool`
+            Whether to include presences, requires the ``GUILD_PRESENCES`` intent
+        timeout: Optional[:class:`float`]
+            Seconds to wait for each guild once its request is sent
+        """
+        if guilds is None:
+            guilds = [g.id for g in self.cache.guilds() if g.large]
+
+        guild_ids = [int(getattr(g, "id", g)) for g in guilds]
+
+        results = await asyncio.gather(
+            *(
+                self.get_shard(guild_id).request_guild_members(
+                    guild_id, query="", presences=presences, timeout=timeout
+                )
+                for guild_id in guild_ids
+            )
+        )
+
+        return dict(zip(guild_ids, results))
+
     def register_application_command(
         self,
         command: UDAppCommand,
@@ -531,17 +628,21 @@ async def shard_handler(self, *ready_scripts) -> None:
 
         if self.compress:
             GATEWAY_WEBHOOK_URL += "&compress=zlib-stream"
-        GATEWAY_WEBHOOK_URL += f"&encoding={self.encoding}"
+        GATEWAY_WEBHOOK_URL += f"&encoding={self.encoding.lower()}"
 
         if not self.num_shards:
             self.num_shards = gateway["shards"]
 
-        self.max_concurrency = gateway["session_start_limit"]["max_concurrency"]
-        TASK_LIST = []
+        session_start_limit = gateway["session_start_limit"]
+        self.max_concurrency = session_start_limit["max_concurrency"]
+
+        shards = []
 
-        c = 0
+        shard_ids = self.shard_ids
+        if shard_ids is None:
+            shard_ids = range(self.num_shards)
 
-        for i in range(self.num_shards):
+        for i in shard_ids:
             # shard_id = i
             shard = Shard(
                 url=GATEWAY_WEBHOOK_URL,
@@ -550,19 +651,14 @@ async def shard_handler(self, *ready_scripts) -> None:
                 client=self,
             )
 
-            await shard.connect()
-            await shard.receive_hello()
-            await shard.send_identity(self.token, self.intents, self.presence)
-
-            task = shard.listen(shard=shard)
-            TASK_LIST.append(task)
+            if i in self.resume_data:
+                shard.session_id, shard.sequence = self.resume_data[i]
 
+            shards.append(shard)
             self.shards.update({i: shard})
-            c += 1
 
-            if c == self.max_concurrency:
-                await asyncio.sleep(5)
-                c = 0
+        scheduler = IdentifyScheduler(self, session_start_limit)
+        TASK_LIST = await scheduler.start(shards)
 
         for script in ready_scripts:
             await script
@@ -617,6 +713,7 @@ def run(
             self.http = HTTPClient(self, loop=self.loop, token=self.token)
 
         self.http.client = self
+        self.cache.bind(self.http)
 
         # Login to create session
         # Also validates token
@@ -655,13 +752,11 @@ def run(
             )
             logger.info("Finished setting up rest api for client")
 
-        self.loop.run_until_complete(
-            self.shard_handler(
-                self._bulk_write_app_commands(exclude_app_cmds)
-                if update_app_commands
-                else None
-            )
-        )
+        ready_scripts = []
+        if update_app_commands:
+            ready_scripts.append(self._bulk_write_app_commands(exclude_app_cmds))
+
+        self.loop.run_until_complete(self.shard_handler(*ready_scripts))
 
     async def disconnect(self):
         """|coro|
@@ -681,6 +776,8 @@ async def disconnect(self):
         for _, vc in self.voice_connections.items():
             await vc.disconnect()
 
+        self.cache.close()
+
     # NOTE: Fetch from cache:
 
     def get_message(self, channel_id: int, message_id: int) -> Optional[Message]:
@@ -751,6 +848,26 @@ def application_commands(self) -> dict:
             return self.glob_app_store
         return self.rest.application_commands
 
+    @property
+    def latency(self) -> float:
+        """Average heartbeat latency across all shards in seconds,
+        ``inf`` if no shard has received a heartbeat ACK yet.
+        """
+        latencies = [
+            shard.latency
+            for shard in self.shards.values()
+            if shard.latency != float("inf")
+        ]
+
+        if not latencies:
+            return float("inf")
+        return sum(latencies) / len(latencies)
+
+    @property
+    def latencies(self) -> Dict[int, float]:
+        """Mapping of shard ids to their heartbeat latency in seconds"""
+        return {shard_id: shard.latency for shard_id, shard in self.shards.items()}
+
     # NOTE: default event handlers
 
     async def on_voice_server_update(self, vc) -> None:
@@ -4,6 +4,7 @@ from typing import (
     AsyncGenerator,
     Callable,
     Dict,
+    Iterable,
     List,
     Literal,
     Optional,
@@ -20,6 +21,7 @@ from acord import (
     StageInstance,
     StagePrivacyLevel,
     Guild,
+    Member,
     UDAppCommand,
     ApplicationCommand,
     VoiceConnection,
@@ -27,6 +29,8 @@ from acord import (
     Channel,
     Shard,
 )
+from acord.client.handler import EventRegistry
+from acord.client.cluster import Cluster
 
 class Client(object):
     INTERNAL_STORAGE: Dict[str, Any]
@@ -42,7 +46,14 @@ class Client(object):
     voice_connections: Dict[int, VoiceConnection]
     acked_at: float
     latency: float
+    latencies: Dict[int, float]
     shards: Shard
+    event_registry: EventRegistry
+    skip_unused_events: bool
+    lazy_events: bool
+    shard_ids: Optional[List[int]]
+    resume_data: Dict[int, Tuple[str, int]]
+    cluster: Optional[Cluster]
 
     # Properties and what not
     guilds: List[Guild]
@@ -145,6 +156,14 @@ class Client(object):
         commands: List[UDAppCommand],
     ) -> None: ...
     @overload
+    async def chunk_guilds(
+        self,
+        guilds: Iterable[Union[Guild, Snowflake]] = None,
+        *,
+        presences: bool = False,
+        timeout: Optional[float] = 60.0,
+    ) -> Dict[Snowflake, List[Member]]: ...
+    @overload
     async def disconnect(self): ...
     @overload
     def get_message(self, channel_id: int, message_id: int) -> Optional[Message]: ...
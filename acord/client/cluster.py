@@ -0,0 +1,687 @@
+# Runs shards across multiple processes on a single host
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from acord.core.abc import buildURL
+from acord.errors import ClusterError
+from acord.models import MemberStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds between resume data reports sent by each cluster
+RESUME_REPORT_INTERVAL = 5
+
+ClusterMethod = Callable[..., Any]
+CLUSTER_METHODS: Dict[str, ClusterMethod] = {}
+
+
+def cluster_method(name: str) -> Callable[[ClusterMethod], ClusterMethod]:
+    """Registers a method which other clusters can call through :meth:`Cluster.request`,
+    methods receive the client followed by any arguments.
+
+    Parameters
+    ----------
+    name: :class:`str`
+        Name of the method
+    """
+
+    def inner(func: ClusterMethod) -> ClusterMethod:
+        CLUSTER_METHODS[name] = func
+        return func
+
+    return inner
+
+
+def _strip_conn(obj: Any) -> Any:
+    # Connections can't be sent between processes
+    if isinstance(obj, dict):
+        return {k: _strip_conn(v) for k, v in obj.items() if k != "conn"}
+    if isinstance(obj, MemberStore):
+        return {k: _strip_conn(v.dict()) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        return type(obj)(_strip_conn(v) for v in obj)
+    return obj
+
+
+@cluster_method("guild")
+async def _guild(client, guild_id: int) -> Optional[dict]:
+    guild = client.cache.get_guild(guild_id)
+
+    if guild is None:
+        return None
+    return _strip_conn(guild.dict())
+
+
+@cluster_method("eval")
+async def _eval(client, func: Callable[[Any], Any]) -> Any:
+    result = func(client)
+
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+@cluster_method("stats")
+async def _stats(client) -> dict:
+    return {
+        "shards": list(client.shards),
+        "guilds": len(list(client.cache.guilds())),
+        "users": len(list(client.cache.users())),
+        "latencies": client.latencies,
+    }
+
+
+class Cluster:
+    """The worker side of a cluster,
+    available as :attr:`Client.cluster` when running under a :class:`ClusterSupervisor`.
+
+    Requests are sent to the supervisor,
+    which forwards them to the target clusters and returns their results.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        # Fetch a guild from whichever cluster owns it
+        guild = await client.cluster.fetch_guild(guild_id)
+
+        # Run a function on every cluster
+        def count_guilds(client):
+            return len(list(client.cache.guilds()))
+
+        counts = await client.cluster.broadcast_eval(count_guilds)
+
+    Parameters
+    ----------
+    client: :class:`Client`
+        Client running in this cluster
+    cluster_id: :class:`int`
+        ID of this cluster
+    shard_ranges: Dict[:class:`int`, Tuple[:class:`int`, :class:`int`]]
+        Mapping of cluster IDs to the first and last shard they run
+    conn: :class:`~multiprocessing.connection.Connection`
+        Pipe to the supervisor
+
+    Attributes
+    ----------
+    cluster_id: :class:`int`
+        ID of this cluster
+    shard_ranges: Dict[:class:`int`, Tuple[:class:`int`, :class:`int`]]
+        Mapping of cluster IDs to the first and last shard they run
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cluster_id: int,
+        shard_ranges: Dict[int, Tuple[int, int]],
+        conn: Connection,
+    ) -> None:
+        self.client = client
+        self.cluster_id = cluster_id
+        self.shard_ranges = shard_ranges
+
+        self._conn = conn
+        self._nonce = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Begins reading from the supervisor and reporting resume data"""
+        loop = self.client.loop
+
+        # Pipes can't be awaited on every platform,
+        # so they are read from a daemon thread which won't block the process exiting
+        reader = threading.Thread(
+            target=self._reader,
+            name=f"acord-cluster-{self.cluster_id}-reader",
+            daemon=True,
+        )
+        reader.start()
+
+        self._tasks.append(loop.create_task(self._report_resume_task()))
+
+    def cluster_for_shard(self, shard_id: int, /) -> int:
+        """Returns the ID of the cluster which runs a shard
+
+        Parameters
+        ----------
+        shard_id: :class:`int`
+            ID of the shard
+        """
+        for cluster_id, (first, last) in self.shard_ranges.items():
+            if first <= shard_id <= last:
+                return cluster_id
+
+        raise ClusterError(f"No cluster runs shard {shard_id}")
+
+    def cluster_for_guild(self, guild_id: int, /) -> int:
+        """Returns the ID of the cluster which receives events for a guild
+
+        Parameters
+        ----------
+        guild_id: :class:`int`
+            ID of the guild
+        """
+        return self.cluster_for_shard((guild_id >> 22) % self.client.num_shards)
+
+    async def request(
+        self,
+        method: str,
+        *args,
+        target: Optional[int] = None,
+        timeout: Optional[float] = 30.0,
+    ) -> Dict[int, Any]:
+        """|coro|
+
+        Calls a method on other clusters,
+        returns a mapping of cluster IDs to results.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            Name of a method registered with :func:`cluster_method`
+        *args:
+            Arguments for the method, must be picklable
+        target: Optional[:class:`int`]
+            Cluster to call, defaults to every cluster including this one
+        timeout: Optional[:class:`float`]
+            Seconds to wait for every cluster to reply before raising :class:`asyncio.TimeoutError`,
+            ``None`` to wait forever
+        """
+        self._nonce += 1
+        nonce = self._nonce
+
+        future = self.client.loop.create_future()
+        self._pending[nonce] = future
+
+        try:
+            self._send(
+                {
+                    "op": "request",
+                    "nonce": nonce,
+                    "target": target,
+                    "method": method,
+                    "args": args,
+                }
+            )
+
+            results = await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Lets the supervisor forget the request
+            self._send({"op": "cancel", "nonce": nonce})
+            raise
+        finally:
+            self._pending.pop(nonce, None)
+
+        for cluster_id, (result, error) in results.items():
+            if error is not None:
+                raise ClusterError(
+                    f"Cluster {cluster_id} failed to run {method}: {error}",
+                    cluster_id=cluster_id,
+                )
+
+        return {cluster_id: result for cluster_id, (result, _) in results.items()}
+
+    async def fetch_guild(self, guild_id: int, /) -> Optional[dict]:
+        """|coro|
+
+        Fetches a guild from the cache of the cluster which owns it,
+        returned as a :class:`dict` without connection objects.
+
+        Parameters
+        ----------
+        guild_id: :class:`int`
+            ID of the guild
+        """
+        target = self.cluster_for_guild(guild_id)
+
+        if target == self.cluster_id:
+            return await _guild(self.client, guild_id)
+
+        results = await self.request("guild", guild_id, target=target)
+        return results[target]
+
+    async def broadcast_eval(self, func: Callable[[Any], Any]) -> Dict[int, Any]:
+        """|coro|
+
+        Runs a function with the client of every cluster,
+        returns a mapping of cluster IDs to results.
+
+        .. note::
+            Functions are pickled,
+            so they must be defined at the top level of a module.
+
+        Parameters
+        ----------
+        func: Callable[[:class:`Client`], Any]
+            Function to run, may be a coroutine function
+        """
+        return await self.request("eval", func)
+
+    async def stats(self) -> Dict[int, dict]:
+        """|coro|
+
+        Returns shard, guild, user and latency stats for every cluster
+        """
+        return await self.request("stats")
+
+    def report_resume(self) -> None:
+        """Sends the session ID and sequence of each shard to the supervisor,
+        used to resume the shards if this cluster crashes.
+        """
+        data = {
+            shard_id: (shard.session_id, shard.sequence)
+            for shard_id, shard in self.client.shards.items()
+            if shard.session_id is not None
+        }
+
+        if data:
+            self._send({"op": "resume", "d": data})
+
+    def _send(self, message: dict) -> None:
+        try:
+            self._conn.send(message)
+        except (OSError, ValueError):
+            logger.error(f"Cluster {self.cluster_id} lost its supervisor connection")
+
+    async def _report_resume_task(self) -> None:
+        while True:
+            await asyncio.sleep(RESUME_REPORT_INTERVAL)
+            self.report_resume()
+
+    def _reader(self) -> None:
+        loop = self.client.loop
+
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                logger.error(
+                    f"Supervisor closed the pipe for cluster {self.cluster_id}"
+                )
+                return
+
+            loop.call_soon_threadsafe(self._on_message, message)
+
+    def _on_message(self, message: dict) -> None:
+        if message["op"] == "call":
+            self.client.loop.create_task(self._handle_call(message))
+
+        elif message["op"] == "response":
+            future = self._pending.get(message["nonce"])
+
+            if future is not None and not future.done():
+                future.set_result(message["results"])
+
+    async def _handle_call(self, message: dict) -> None:
+        result = error = None
+
+        try:
+            method = CLUSTER_METHODS[message["method"]]
+            result = await method(self.client, *message["args"])
+        except Exception as exc:
+            error = repr(exc)
+
+        reply = {"op": "reply", "nonce": message["nonce"], "result": result}
+
+        try:
+            self._conn.send({**reply, "error": error})
+        except Exception as exc:
+            # Result could not be pickled,
+            # a reply is still sent so the caller is not left waiting
+            self._send({**reply, "result": None, "error": repr(exc)})
+
+
+def _run_cluster(
+    factory: Callable[[], Any],
+    token: str,
+    cluster_id: int,
+    num_shards: int,
+    shard_ranges: Dict[int, Tuple[int, int]],
+    conn: Connection,
+    resume_data: Dict[int, Tuple[str, int]],
+    run_kwds: Dict[str, Any],
+) -> None:
+    first, last = shard_ranges[cluster_id]
+
+    client = factory()
+    client.num_shards = num_shards
+    client.shard_ids = list(range(first, last + 1))
+    client.resume_data = resume_data
+
+    client.cluster = Cluster(client, cluster_id, shard_ranges, conn)
+    client.cluster.start()
+
+    # Only one cluster needs to write application commands
+    run_kwds.setdefault("update_app_commands", cluster_id == 0)
+
+    logger.info(f"Cluster {cluster_id} running shards {first}-{last}")
+
+    client.run(token, **run_kwds)
+
+
+async def fetch_shard_count(token: str) -> int:
+    """|coro|
+
+    Fetches the number of shards discord recommends for a bot
+
+    Parameters
+    ----------
+    token: :class:`str`
+        Bot token
+    """
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            buildURL("gateway", "bot"), headers={"Authorization": "Bot " + token}
+        ) as r:
+            r.raise_for_status()
+            data = await r.json()
+
+    return data["shards"]
+
+
+class ClusterSupervisor:
+    """Runs shards across multiple worker processes on one host.
+
+    Each cluster is a process running its own :class:`Client`
+    with a contiguous range of shard IDs.
+    Crashed clusters are restarted and identify again.
+    With ``resume`` they resume their previous sessions instead,
+    using the session IDs and sequences last reported to the supervisor.
+
+    .. warning::
+        Clusters are spawned as new processes,
+        so ``factory`` must be defined at the top level of a module
+        and the script should be guarded with ``if __name__ == "__main__":``.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        def make_client():
+            return MyClient(intents=Intents.ALL)
+
+        if __name__ == "__main__":
+            supervisor = ClusterSupervisor(make_client, token="...", clusters=4)
+            supervisor.run()
+
+    Parameters
+    ----------
+    factory: Callable[[], :class:`Client`]
+        Creates the client for each cluster
+    token: :class:`str`
+        Bot token
+    clusters: :class:`int`
+        Number of worker processes, defaults to the number of CPUs
+    num_shards: Optional[:class:`int`]
+        Total number of shards, fetched from discord if not provided
+    restart: :class:`bool`
+        Whether to restart clusters which exit with an error
+    restart_delay: :class:`float`
+        Seconds to wait before restarting a cluster
+    resume: :class:`bool`
+        Whether restarted clusters resume their previous sessions.
+        Resuming does not send guilds again,
+        so this should only be used with a cache which survives restarts,
+        such as :class:`SQLiteCache`.
+    **run_kwds:
+        Additional kwargs passed through to :meth:`Client.run`
+
+    Attributes
+    ----------
+    shard_ranges: Dict[:class:`int`, Tuple[:class:`int`, :class:`int`]]
+        Mapping of cluster IDs to the first and last shard they run
+    processes: Dict[:class:`int`, :class:`~multiprocessing.Process`]
+        Running cluster processes
+    resume_data: Dict[:class:`int`, Tuple[:class:`str`, :class:`int`]]
+        Last reported session ID and sequence for each shard
+    restarts: Dict[:class:`int`, :class:`int`]
+        Number of times each cluster has been restarted
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        token: str,
+        clusters: int = None,
+        num_shards: int = None,
+        restart: bool = True,
+        restart_delay: float = 5.0,
+        resume: bool = False,
+        **run_kwds,
+    ) -> None:
+        self.factory = factory
+        self.token = token
+        self.clusters = clusters or multiprocessing.cpu_count()
+        self.num_shards = num_shards
+        self.restart = restart
+        self.restart_delay = restart_delay
+        self.resume = resume
+        self.run_kwds = run_kwds
+
+        self.shard_ranges: Dict[int, Tuple[int, int]] = {}
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.resume_data: Dict[int, Tuple[str, int]] = {}
+        self.restarts: Dict[int, int] = {}
+
+        self._context = multiprocessing.get_context("spawn")
+        self._pipes: Dict[int, Connection] = {}
+        self._pending: Dict[Tuple[int, int], dict] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = False
+
+    def split_shards(self) -> Dict[int, Tuple[int, int]]:
+        """Splits shards into contiguous ranges, one per cluster"""
+        clusters = min(self.clusters, self.num_shards)
+        per_cluster, extra = divmod(self.num_shards, clusters)
+
+        ranges = {}
+        first = 0
+
+        for cluster_id in range(clusters):
+            count = per_cluster + (cluster_id < extra)
+            ranges[cluster_id] = (first, first + count - 1)
+            first += count
+
+        return ranges
+
+    def run(self) -> None:
+        """Starts every cluster and supervises them, blocking until they all exit"""
+        if not self.num_shards:
+            self.num_shards = asyncio.run(fetch_shard_count(self.token))
+
+        self.shard_ranges = self.split_shards()
+
+        logger.info(
+            f"Starting {len(self.shard_ranges)} clusters for {self.num_shards} shards"
+        )
+
+        for cluster_id in self.shard_ranges:
+            self._spawn(cluster_id)
+
+        try:
+            while self.processes or self._restart_at:
+                self._poll(timeout=1.0)
+                self._restart_due()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def stop(self) -> None:
+        """Terminates every cluster"""
+        self._stopping = True
+        self._restart_at.clear()
+
+        for process in self.processes.values():
+            process.terminate()
+
+        for process in self.processes.values():
+            process.join()
+
+        for conn in self._pipes.values():
+            conn.close()
+
+        self.processes.clear()
+        self._pipes.clear()
+
+    def _spawn(self, cluster_id: int) -> None:
+        first, last = self.shard_ranges[cluster_id]
+        resume_data = {}
+
+        if self.resume:
+            resume_data = {
+                shard_id: data
+                for shard_id, data in self.resume_data.items()
+                if first <= shard_id <= last
+            }
+
+        parent_conn, child_conn = self._context.Pipe()
+
+        process = self._context.Process(
+            target=_run_cluster,
+            args=(
+                self.factory,
+                self.token,
+                cluster_id,
+                self.num_shards,
+                self.shard_ranges,
+                child_conn,
+                resume_data,
+                dict(self.run_kwds),
+            ),
+            name=f"acord-cluster-{cluster_id}",
+        )
+        process.start()
+        child_conn.close()
+
+        self.processes[cluster_id] = process
+        self._pipes[cluster_id] = parent_conn
+
+    def _poll(self, timeout: float) -> None:
+        by_object: Dict[Any, Tuple[str, int]] = {}
+
+        for cluster_id, conn in self._pipes.items():
+            by_object[conn] = ("pipe", cluster_id)
+        for cluster_id, process in self.processes.items():
+            by_object[process.sentinel] = ("exit", cluster_id)
+
+        for ready in wait(list(by_object), timeout=timeout):
+            kind, cluster_id = by_object[ready]
+
+            if kind == "pipe":
+                try:
+                    while ready.poll():
+                        self._handle(cluster_id, ready.recv())
+                except (EOFError, OSError):
+                    # Process exit is handled through its sentinel
+                    self._pipes.pop(cluster_id, None)
+            elif cluster_id in self.processes:
+                self._on_exit(cluster_id)
+
+    def _handle(self, cluster_id: int, message: dict) -> None:
+        op = message["op"]
+
+        if op == "resume":
+            self.resume_data.update(message["d"])
+
+        elif op == "request":
+            key = (cluster_id, message["nonce"])
+            target = message["target"]
+            targets = list(self.shard_ranges) if target is None else [target]
+
+            self._pending[key] = {"waiting": set(targets), "results": {}}
+
+            for target in targets:
+                conn = self._pipes.get(target)
+
+                try:
+                    conn.send(
+                        {
+                            "op": "call",
+                            "nonce": key,
+                            "method": message["method"],
+                            "args": message["args"],
+                        }
+                    )
+                except (AttributeError, OSError):
+                    self._reply(key, target, None, "Cluster is not running")
+
+        elif op == "cancel":
+            # The caller stopped waiting, late replies are dropped
+            self._pending.pop((cluster_id, message["nonce"]), None)
+
+        elif op == "reply":
+            self._reply(
+                tuple(message["nonce"]), cluster_id, message["result"], message["error"]
+            )
+
+    def _reply(self, key: Tuple[int, int], cluster_id: int, result, error) -> None:
+        pending = self._pending.get(key)
+
+        if pending is None:
+            return
+
+        pending["results"][cluster_id] = (result, error)
+        pending["waiting"].discard(cluster_id)
+
+        if pending["waiting"]:
+            return
+
+        del self._pending[key]
+        requester, nonce = key
+        conn = self._pipes.get(requester)
+
+        if conn is not None:
+            try:
+                conn.send(
+                    {"op": "response", "nonce": nonce, "results": pending["results"]}
+                )
+            except OSError:
+                pass
+
+    def _on_exit(self, cluster_id: int) -> None:
+        process = self.processes.pop(cluster_id)
+        process.join()
+
+        conn = self._pipes.pop(cluster_id, None)
+        if conn is not None:
+            conn.close()
+
+        # Fail anything the cluster was still working on
+        for key, pending in list(self._pending.items()):
+            if cluster_id in pending["waiting"]:
+                self._reply(key, cluster_id, None, "Cluster exited")
+
+        for key in [key for key in self._pending if key[0] == cluster_id]:
+            del self._pending[key]
+
+        if self._stopping or not self.restart or process.exitcode == 0:
+            logger.info(f"Cluster {cluster_id} exited with code {process.exitcode}")
+            return
+
+        logger.warning(
+            f"Cluster {cluster_id} exited with code {process.exitcode}, "
+            f"restarting in {self.restart_delay} seconds"
+        )
+        self._restart_at[cluster_id] = time.monotonic() + self.restart_delay
+
+    def _restart_due(self) -> None:
+        now = time.monotonic()
+
+        for cluster_id, restart_at in list(self._restart_at.items()):
+            if restart_at <= now:
+                del self._restart_at[cluster_id]
+
+                self.restarts[cluster_id] = self.restarts.get(cluster_id, 0) + 1
+                self._spawn(cluster_id)
@@ -1,7 +1,7 @@
 import asyncio
 import datetime
-import time
 import logging
+from typing import Any, Callable, Coroutine, Dict, Optional, Set, Tuple
 from aiohttp import WSMsgType
 
 from acord.core.decoders import decodeResponse
@@ -10,6 +10,9 @@
 from acord.utils import _d_to_channel
 from acord.errors import *
 from acord.models import *
+from acord.models.lazy import LazyModel
+from acord.models.trusted import construct_trusted
+from acord.models.patch import patch_model, copy_with
 from acord.bases import *
 
 CLOSE_CODES = (WSMsgType.CLOSED, WSMsgType.CLOSING, WSMsgType.CLOSE)
@@ -72,10 +75,6 @@ async def handle_websocket(shard):
 
 
 async def _handle_websocket(shard):
-    from acord.rest.rest import get_slash_options, get_command, exec_handler
-
-    UNAVAILABLE = dict()
-
     ws = shard.ws
     client = shard.client
 
@@ -88,6 +87,11 @@ async def _handle_websocket(shard):
                 f"Websocket connection has been closed, resuming if possible : code={message.data}"
             )
 
+            if ws is not shard.ws:
+                # Already reconnected, e.g. by the heartbeat after a zombied connection
+                ws = shard.ws
+                continue
+
             _ = close_code_handler(message.data)
 
             if _ == "sequence":
@@ -103,7 +107,7 @@ async def _handle_websocket(shard):
         if client.dispatch_on_recv:
             client.dispatch("socket_receive", message)
 
-        data = decodeResponse(message.data)
+        data = decodeResponse(message.data, shard.inflator)
 
         if not data:
             continue
@@ -117,7 +121,16 @@ async def _handle_websocket(shard):
         if SEQUENCE is not None:
             shard.sequence = SEQUENCE
 
-        if OPERATION == gateway.INVALIDSESSION:
+        if OPERATION == gateway.DISPATCH:
+            if client.skip_unused_events and not event_is_consumed(client, EVENT):
+                continue
+
+            handler = client.event_registry.get(EVENT)
+
+            if handler is not None:
+                await handler(shard, DATA)
+
+        elif OPERATION == gateway.INVALIDSESSION:
 
             if shard.resuming:
                 await shard.send_identity(client.token, client.intents, client.presence)
@@ -134,566 +147,1071 @@ async def _handle_websocket(shard):
             client.dispatch("resume")
 
         elif OPERATION == gateway.HEARTBEAT:
-            shard._keep_alive.send_heartbeat()
+            await shard._keep_alive.send_heartbeat()
             logger.debug("Server requested heartbeat has been sent")
 
         elif OPERATION == gateway.HEARTBEATACK:
             shard._keep_alive.ack()
             client.dispatch("heartbeat", shard._keep_alive.latency)
 
-        elif EVENT == "READY":
-            client.dispatch("ready")
 
-            shard.session_id = DATA["session_id"]
-            shard.gateway_version = DATA["v"]
-            client.user = User(conn=client.http, **DATA["user"])
+# Gateway events which only dispatch events or fill optional caches,
+# mapped to the events they dispatch and the cache section they maintain.
+# Anything missing from here changes client state and is never skipped.
+# Events maintaining a section are only skipped once its policy is disabled,
+# DefaultCache always builds a messages section, so by default they are consumed.
+SKIPPABLE_EVENTS: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {
+    "MESSAGE_CREATE": (("message_create",), "messages"),
+    "MESSAGE_UPDATE": (("message_update", "partial_message_update"), "messages"),
+    "MESSAGE_DELETE": (("message_delete", "partial_message_delete"), "messages"),
+    "MESSAGE_DELETE_BULK": (("bulk_message_delete",), "messages"),
+    "MESSAGE_REACTION_ADD": (("message_reaction_create",), None),
+    "MESSAGE_REACTION_REMOVE": (("message_reaction_remove",), None),
+    "MESSAGE_REACTION_REMOVE_ALL": (("message_reactions_clear",), None),
+    "MESSAGE_REACTION_REMOVE_EMOJI": (("message_reaction_emoji_clear",), None),
+    "CHANNEL_PINS_UPDATE": (("message_pin",), None),
+    "INVITE_CREATE": (("invite_create",), None),
+    "INVITE_DELETE": (("invite_delete",), None),
+    "INTERACTION_UPDATE": (("interaction_update",), None),
+    "INTERACTION_DELETE": (("interaction_delete",), None),
+    "GUILD_INTEGRATIONS_UPDATE": (("guild_integrations_update",), None),
+}
+
+
+def event_is_consumed(client, event: str) -> bool:
+    """Checks whether anything consumes a gateway event,
+    either through a listener, an ``on_`` method or the cache.
+    Events not in :data:`SKIPPABLE_EVENTS` are always consumed.
+    """
+    try:
+        dispatches, section = SKIPPABLE_EVENTS[event]
+    except KeyError:
+        return True
 
-            UNAVAILABLE = {i["id"]: i["unavailable"] for i in DATA["guilds"]}
-            client.cache.add_user(client.user)
+    if section is not None and section in client.cache:
+        # Sections built from a disabled policy never store anything
+        if not getattr(client.cache[section], "disabled", False):
+            return True
 
-            shard.ready_event.set()
+    for name in dispatches:
+        if client._events.get(name) or hasattr(client, "on_" + name):
+            return True
 
-        # NOTE: Interactions
+    return False
 
-        elif EVENT == "INTERACTION_CREATE":
-            data = Interaction(conn=client.http, **DATA)
 
-            if data.type == InteractionType.APPLICATION_COMMAND_AUTOCOMPLETE:
-                udac = get_command(client, data.data.name, data.data.type)
+EventHandler = Callable[[Any, dict], Coroutine[Any, Any, None]]
+DEFAULT_EVENT_HANDLERS: Dict[str, EventHandler] = dict()
 
-                if not udac:
-                    continue
 
-                # Command is a slash command so were good with __pre_calls__
-                handlers = udac.__pre_calls__.get("__autocompleters__")
+def gateway_event(name: str) -> Callable[[EventHandler], EventHandler]:
+    # Registers a default handler for a gateway dispatch event
+    def inner(func: EventHandler) -> EventHandler:
+        DEFAULT_EVENT_HANDLERS[name] = func
+        return func
+
+    return inner
+
+
+class EventRegistry(object):
+    """Mapping of gateway dispatch events to the coroutines which handle them.
+
+    Each client has its own registry,
+    which is populated with the default handlers.
+    Handlers are called with the :class:`Shard` which received the event,
+    and the event data.
 
-                if not handlers:
-                    udac.auto_complete_handlers()
-                    # Should be defined now
-                    handlers = udac.__pre_calls__["__autocompleters__"]
+    .. rubric:: Example
 
-                d = []
+    .. code-block:: py
 
-                for option in data.data.options:
-                    if not option.focused:
-                        continue
-                    handler = handlers.get("*", handlers.get(option.name))
+        client = Client(...)
 
-                    if not handler:
-                        continue
-                    result, dev_handled = await exec_handler(handler, data, option)
+        @client.event_registry.register("TYPING_START")
+        async def typing_start(shard, data):
+            shard.client.dispatch("typing", data)
 
-                    if dev_handled or not result:
-                        continue
+        # Stop handling presences completely
+        client.event_registry.disable("PRESENCE_UPDATE")
 
-                    if isinstance(result, list):
-                        d.extend(result)
-                    else:
-                        d.append(result)
+    Parameters
+    ----------
+    handlers: Dict[:class:`str`, Callable[..., Coroutine[Any, Any, None]]]
+        Handlers to start with,
+        defaults to the built in handlers.
+    """
 
-                await data.respond_to_autocomplete(d)
+    def __init__(self, handlers: Dict[str, EventHandler] = None) -> None:
+        if handlers is None:
+            handlers = DEFAULT_EVENT_HANDLERS
 
-            elif data.type == InteractionType.APPLICATION_COMMAND:
-                udac = get_command(client, data.data.name, data.data.type)
+        self.handlers: Dict[str, EventHandler] = dict(handlers)
+        self.disabled: Set[str] = set()
 
-                if not udac:
-                    continue
+    def get(self, event: str, /) -> Optional[EventHandler]:
+        """Gets the handler for an event,
+        returns ``None`` if the event has no handler or has been disabled.
 
-                args, kwds = (), {}
-                if data.data.type == ApplicationCommandType.CHAT_INPUT:
-                    kwds = get_slash_options(data)
-                elif data.data.type == ApplicationCommandType.MESSAGE:
-                    message = client.get_message(data.channel_id, data.data.target_id)
-                    if not message:
-                        message = data.data.target_id
-                    args = (message,)
-                else:
-                    user = client.get_user(data.data.target_id)
-                    if not user:
-                        user = data.data.target_id
-                    args = (user,)
+        Parameters
+        ----------
+        event: :class:`str`
+            Name of the gateway event, e.g. ``MESSAGE_CREATE``
+        """
+        if event in self.disabled:
+            return None
+        return self.handlers.get(event)
 
-                fut = client.loop.create_future()
-                client.loop.create_task(
-                    udac.dispatcher(data, fut, *args, **kwds),
-                    name=f"app_cmd dispatcher : {udac.name}",
-                )
+    def register(
+        self, event: str, handler: EventHandler = None
+    ) -> Callable[[EventHandler], EventHandler]:
+        """Registers a handler for an event,
+        overwriting any existing handler.
+        Can be used as a decorator.
 
-                possible_exc = await asyncio.wait_for(fut, None)
-                if isinstance(possible_exc, Exception):
-                    client.on_error(
-                        f"app_cmd dispatcher : {udac.name}",
-                        err=(
-                            type(possible_exc),
-                            possible_exc,
-                            possible_exc.__traceback__,
-                        ),
-                    )
+        Parameters
+        ----------
+        event: :class:`str`
+            Name of the gateway event
+        handler: Callable[..., Coroutine[Any, Any, None]]
+            Coroutine function to handle the event
+        """
 
-            client.dispatch("interaction_create", data)
+        def inner(func: EventHandler) -> EventHandler:
+            self.handlers[event] = func
+            return func
 
-        elif EVENT == "INTERACTION_UPDATE":
-            data = Interaction(conn=client.http, **DATA)
+        if handler is not None:
+            return inner(handler)
+        return inner
 
-            client.dispatch("interaction_update", data)
+    def unregister(self, event: str, /) -> Optional[EventHandler]:
+        """Removes the handler for an event
 
-        elif EVENT == "INTERACTION_DELETE":
-            try:
-                id, guild_id, application_id = DATA.values()
-            except ValueError:
-                id, guild_id, application_id = DATA.values(), None
+        Parameters
+        ----------
+        event: :class:`str`
+            Name of the gateway event
+        """
+        return self.handlers.pop(event, None)
 
-            client.dispatch("interaction_delete", id, guild_id, application_id)
+    def disable(self, event: str, /) -> None:
+        """Disables an event,
+        it will be ignored until re-enabled.
 
-        # NOTE: Messages
+        Parameters
+        ----------
+        event: :class:`str`
+            Name of the gateway event
+        """
+        self.disabled.add(event)
+
+    def enable(self, event: str, /) -> None:
+        """Enables an event which was previously disabled
 
-        elif EVENT == "MESSAGE_CREATE":
-            message = Message(conn=client.http, **DATA)
+        Parameters
+        ----------
+        event: :class:`str`
+            Name of the gateway event
+        """
+        self.disabled.discard(event)
+
+    def __contains__(self, event: str) -> bool:
+        return self.get(event) is not None
+
+
+# NOTE: Ready
+
+
+@gateway_event("READY")
+async def _ready(shard, DATA: dict) -> None:
+    client = shard.client
 
-            try:
-                if hasattr(message.channel, "last_message_id"):
-                    message.channel.last_message_id = message.id
-            except ValueError:
-                pass
-
-            client.cache.add_message(message)
+    client.dispatch("ready")
 
-            client.dispatch("message_create", message)
-
-        elif EVENT == "MESSAGE_UPDATE":
-            pre_existing: Message = client.get_message(
-                int(DATA["channel_id"]), int(DATA["id"])
-            )
-            if not pre_existing:
-                client.dispatch("partial_message_update", DATA)
+    shard.session_id = DATA["session_id"]
+    shard.gateway_version = DATA["v"]
+    client.user = client.cache.intern_user(
+        construct_trusted(User, DATA["user"], conn=client.http)
+    )
+
+    shard.unavailable_guilds = {i["id"]: i["unavailable"] for i in DATA["guilds"]}
+
+    shard.ready_event.set()
+
+
+# NOTE: Interactions
+
+
+@gateway_event("INTERACTION_CREATE")
+async def _interaction_create(shard, DATA: dict) -> None:
+    from acord.rest.rest import get_slash_options, get_command, exec_handler
+
+    client = shard.client
+
+    data = construct_trusted(Interaction, DATA, conn=client.http)
+
+    if data.type == InteractionType.APPLICATION_COMMAND_AUTOCOMPLETE:
+        udac = get_command(client, data.data.name, data.data.type)
+
+        if not udac:
+            return
+
+        # Command is a slash command so were good with __pre_calls__
+        handlers = udac.__pre_calls__.get("__autocompleters__")
+
+        if not handlers:
+            udac.auto_complete_handlers()
+            # Should be defined now
+            handlers = udac.__pre_calls__["__autocompleters__"]
+
+        d = []
+
+        for option in data.data.options:
+            if not option.focused:
                 continue
+            handler = handlers.get("*", handlers.get(option.name))
 
-            message = pre_existing.copy(update=DATA)
-            client.cache.add_message(message)
+            if not handler:
+                continue
+            result, dev_handled = await exec_handler(handler, data, option)
 
-            client.dispatch("message_update", message)
+            if dev_handled or not result:
+                continue
 
-        elif EVENT == "MESSAGE_DELETE":
-            message = client.cache.remove_message(
-                int(DATA["channel_id"]), int(DATA["id"]), None
-            )
-            if message:
-                client.dispatch("message_delete", message)
+            if isinstance(result, list):
+                d.extend(result)
             else:
-                client.dispatch(
-                    "partial_message_delete",
-                    Snowflake(DATA["channel_id"]),
-                    Snowflake(DATA["id"]),
-                    Snowflake(DATA["guild_id"])
-                    if DATA["guild_id"] is not None
-                    else None,
-                )
-
-        elif EVENT == "MESSAGE_DELETE_BULK":
-            messages = [
-                (
-                    client.cache.remove_message(
-                        int(DATA["channel_id"]), int(DATA["id"]), None
-                    )
-                    or Snowflake(id)
-                )
-                for id in DATA["ids"]
-            ]
-
-            client.dispatch(
-                "bulk_message_delete",
-                messages,
-                Snowflake(DATA["channel_id"]),
-                Snowflake(DATA["guild_id"]) if DATA["guild_id"] is not None else None,
+                d.append(result)
+
+        await data.respond_to_autocomplete(d)
+
+    elif data.type == InteractionType.APPLICATION_COMMAND:
+        udac = get_command(client, data.data.name, data.data.type)
+
+        if not udac:
+            return
+
+        args, kwds = (), {}
+        if data.data.type == ApplicationCommandType.CHAT_INPUT:
+            kwds = get_slash_options(data)
+        elif data.data.type == ApplicationCommandType.MESSAGE:
+            message = client.get_message(data.channel_id, data.data.target_id)
+            if not message:
+                message = data.data.target_id
+            args = (message,)
+        else:
+            user = client.get_user(data.data.target_id)
+            if not user:
+                user = data.data.target_id
+            args = (user,)
+
+        fut = client.loop.create_future()
+        client.loop.create_task(
+            udac.dispatcher(data, fut, *args, **kwds),
+            name=f"app_cmd dispatcher : {udac.name}",
+        )
+
+        possible_exc = await asyncio.wait_for(fut, None)
+        if isinstance(possible_exc, Exception):
+            client.on_error(
+                f"app_cmd dispatcher : {udac.name}",
+                err=(
+                    type(possible_exc),
+                    possible_exc,
+                    possible_exc.__traceback__,
+                ),
             )
 
-        elif EVENT == "MESSAGE_REACTION_ADD":
-            reaction = MessageReaction(**DATA)
+    client.dispatch("interaction_create", data)
 
-            client.dispatch("message_reaction_create", reaction)
 
-        elif EVENT == "MESSAGE_REACTION_REMOVE":
-            reaction = MessageReaction(**DATA)
+@gateway_event("INTERACTION_UPDATE")
+async def _interaction_update(shard, DATA: dict) -> None:
+    client = shard.client
 
-            client.dispatch("message_reaction_remove", reaction)
+    data = construct_trusted(Interaction, DATA, conn=client.http)
 
-        elif EVENT == "MESSAGE_REACTION_REMOVE_ALL":
-            client.dispatch(
-                "message_reactions_clear",
-                Snowflake(DATA["channel_id"]),
-                Snowflake(DATA["message_id"]),
-                Snowflake(DATA["guild_id"])
-                if DATA.get("guild_id") is not None
-                else None,
-            )
+    client.dispatch("interaction_update", data)
 
-        elif EVENT == "MESSAGE_REACTION_REMOVE_EMOJI":
-            reaction = MessageReaction(**DATA)
 
-            client.dispatch("message_reaction_emoji_clear", reaction)
+@gateway_event("INTERACTION_DELETE")
+async def _interaction_delete(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "CHANNEL_PINS_UPDATE":
-            channel = client.get_channel(int(DATA["channel_id"]))
-            ts = datetime.datetime.fromisoformat(DATA["last_pin_timestamp"])
+    try:
+        id, guild_id, application_id = DATA.values()
+    except ValueError:
+        id, guild_id, application_id = DATA.values(), None
 
-            client.dispatch("message_pin", channel, ts)
+    client.dispatch("interaction_delete", id, guild_id, application_id)
 
-        # NOTE: invites
-        elif EVENT == "INVITE_CREATE":
-            invite = Invite(conn=client.http, **DATA)
-            client.dispatch("invite_create", invite)
 
-        elif EVENT == "INVITE_DELETE":
-            channel_id = DATA["channel_id"]
-            guild_id = DATA.get("guild_id", 0)
-            code = DATA["code"]
+# NOTE: Messages
 
-            channel = client.get_channel(channel_id) or Snowflake(channel_id)
-            guild = client.get_guild(guild_id) or (
-                Snowflake(guild_id) if guild_id is not None else None
-            )
 
-            client.dispatch("invite_delete", channel, guild, code)
+def _intern_message_users(client, message: Message) -> None:
+    # Point the message at cached users instead of its own copies
+    message.author = client.cache.intern_user(message.author)
+    message.mentions = [
+        client.cache.intern_user(user) if isinstance(user, User) else user
+        for user in message.mentions
+    ]
 
-        # NOTE: Guilds
 
-        elif EVENT == "GUILD_CREATE":
-            guild = Guild(conn=client.http, **DATA)
+@gateway_event("MESSAGE_CREATE")
+async def _message_create(shard, DATA: dict) -> None:
+    client = shard.client
 
-            if DATA["id"] in UNAVAILABLE:
-                UNAVAILABLE.pop(DATA["id"])
-                client.dispatch("guild_recv", guild)
-            else:
-                client.dispatch("guild_create", guild)
+    if client.lazy_events:
+        message = LazyModel(Message, client.http, DATA)
+    else:
+        message = construct_trusted(Message, DATA, conn=client.http)
+        _intern_message_users(client, message)
 
-            client.cache.add_guild(guild)
+    try:
+        if hasattr(message.channel, "last_message_id"):
+            message.channel.last_message_id = message.id
+    except ValueError:
+        pass
 
-        elif EVENT == "GUILD_DELETE":
-            if DATA.get("unavailable", None) is not None:
-                guild = Guild(conn=client.http, **DATA)
-                UNAVAILABLE.pop(DATA["id"])
-                client.dispatch("guild_outage", guild)
+    client.cache.add_message(message)
 
-                client.cache.add_guild(guild)
-            else:
-                guild = client.cache.remove_guild(int(DATA["id"]), None)
-                client.dispatch("guild_remove", guild)
+    client.dispatch("message_create", message)
 
-        elif EVENT == "GUILD_UPDATE":
-            guild = Guild(conn=client.http, **DATA)
 
-            client.cache.add_guild(guild)
-            client.dispatch("guild_update", guild)
+@gateway_event("MESSAGE_UPDATE")
+async def _message_update(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "GUILD_BAN_ADD":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            user = User(conn=client.http, **DATA["user"])
+    pre_existing: Message = client.get_message(int(DATA["channel_id"]), int(DATA["id"]))
+    if not pre_existing:
+        client.dispatch("partial_message_update", DATA)
+        return
 
-            guild.members.pop(user.id, None)
+    message = pre_existing
+    if type(message) is LazyModel:
+        message = message.materialize()
 
-            client.cache.add_user(user)
-            client.dispatch("guild_ban", guild, user)
+    # Updated in place, references to the cached message stay valid
+    previous = patch_model(message, DATA)
+    b_message = copy_with(message, previous)
 
-        elif EVENT == "GUILD_BAN_REMOVE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            user = User(conn=client.http, **DATA["user"])
+    client.cache.add_message(message)
 
-            client.cache.add_user(user)
-            client.dispatch("guild_ban_remove", guild, user)
+    client.dispatch("message_update", b_message, message)
 
-        elif EVENT == "GUILD_EMOJIS_UPDATE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            emojis = DATA["emojis"]
-            bulk = list()
 
-            for emoji in emojis:
-                e = Emoji(conn=client.http, guild_id=guild.id, **emoji)
-                guild.emojis.update({e.id: e})
-                bulk.append(e)
+@gateway_event("MESSAGE_DELETE")
+async def _message_delete(shard, DATA: dict) -> None:
+    client = shard.client
 
-                client.dispatch("guild_emoji_update", e)
+    message = client.cache.remove_message(
+        int(DATA["channel_id"]), int(DATA["id"]), None
+    )
+    if message:
+        client.dispatch("message_delete", message)
+    else:
+        client.dispatch(
+            "partial_message_delete",
+            Snowflake(DATA["channel_id"]),
+            Snowflake(DATA["id"]),
+            Snowflake(DATA["guild_id"]) if DATA["guild_id"] is not None else None,
+        )
 
-            client.dispatch("guild_emojis_update", bulk)
 
-        elif EVENT == "GUILD_STICKERS_UPDATE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            stickers = DATA["stickers"]
-            bulk = list()
+@gateway_event("MESSAGE_DELETE_BULK")
+async def _message_delete_bulk(shard, DATA: dict) -> None:
+    client = shard.client
 
-            for sticker in stickers:
-                s = Sticker(conn=client.http, guild_id=guild.id, **sticker)
-                guild.stickers.update({s.id: s})
-                bulk.append(s)
+    messages = [
+        (
+            client.cache.remove_message(int(DATA["channel_id"]), int(id), None)
+            or Snowflake(id)
+        )
+        for id in DATA["ids"]
+    ]
 
-                client.dispatch("guild_sticker_update", s)
+    client.dispatch(
+        "bulk_message_delete",
+        messages,
+        Snowflake(DATA["channel_id"]),
+        Snowflake(DATA["guild_id"]) if DATA["guild_id"] is not None else None,
+    )
 
-            client.dispatch("guild_stickers_update", bulk)
 
-        elif EVENT == "GUILD_INTEGRATIONS_UPDATE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            if guild is None:
-                guild = Snowflake(DATA["guild_id"])
-            client.dispatch("guild_integrations_update", guild)
+@gateway_event("MESSAGE_REACTION_ADD")
+async def _message_reaction_add(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "GUILD_MEMBER_ADD":
-            member = Member(conn=client.http, **DATA)
-            guild = client.get_guild(member.guild_id)
+    reaction = MessageReaction(**DATA)
 
-            if guild is not None:
-                guild.members.update({member.user.id: member})
-            else:
-                guild = Snowflake(DATA["guild_id"])
+    client.dispatch("message_reaction_create", reaction)
 
-            client.dispatch("member_join", member, guild)
 
-        elif EVENT == "GUILD_MEMBER_REMOVE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            user = User(conn=client.http, **DATA["user"])
+@gateway_event("MESSAGE_REACTION_REMOVE")
+async def _message_reaction_remove(shard, DATA: dict) -> None:
+    client = shard.client
 
-            if guild is not None:
-                user = guild.members.pop(user.id, user)
-            else:
-                guild = Snowflake(DATA["guild_id"])
+    reaction = MessageReaction(**DATA)
 
-            client.dispatch("member_remove", user, guild)
+    client.dispatch("message_reaction_remove", reaction)
 
-        elif EVENT == "GUILD_MEMBER_UPDATE":
-            guild = client.get_guild(int(DATA["guild_id"]))
 
-            if guild is None:
-                client.dispatch("u_member_update", DATA)
-                continue
+@gateway_event("MESSAGE_REACTION_REMOVE_ALL")
+async def _message_reaction_remove_all(shard, DATA: dict) -> None:
+    client = shard.client
 
-            b_member = guild.get_member(int(DATA["user"]["id"]))
-            if not b_member:
-                b_member = await guild.fetch_member(int(DATA["user"]["id"]))
-            a_member = b_member.copy(update=DATA)
+    client.dispatch(
+        "message_reactions_clear",
+        Snowflake(DATA["channel_id"]),
+        Snowflake(DATA["message_id"]),
+        Snowflake(DATA["guild_id"]) if DATA.get("guild_id") is not None else None,
+    )
 
-            client.dispatch("member_update", b_member, a_member, guild)
 
-        elif EVENT == "GUILD_ROLE_CREATE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            role = Role(conn=client.http, **(DATA["role"]))
+@gateway_event("MESSAGE_REACTION_REMOVE_EMOJI")
+async def _message_reaction_remove_emoji(shard, DATA: dict) -> None:
+    client = shard.client
 
-            guild.roles.update({role.id: role})
+    reaction = MessageReaction(**DATA)
 
-            client.dispatch("role_create", role, guild)
+    client.dispatch("message_reaction_emoji_clear", reaction)
 
-        elif EVENT == "GUILD_ROLE_UPDATE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            a_role = Role(conn=client.http, **(DATA["role"]))
-            b_role = guild.roles.get(a_role.id)
 
-            guild.roles.update({role.id: role})
+@gateway_event("CHANNEL_PINS_UPDATE")
+async def _channel_pins_update(shard, DATA: dict) -> None:
+    client = shard.client
 
-            client.dispatch("role_update", a_role, b_role, guild)
+    channel = client.get_channel(int(DATA["channel_id"]))
+    ts = datetime.datetime.fromisoformat(DATA["last_pin_timestamp"])
 
-        elif EVENT == "GUILD_ROLE_DELETE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            role = guild.roles.get(Snowflake(DATA["role_id"]))
+    client.dispatch("message_pin", channel, ts)
 
-            client.dispatch("role_delete", role, guild)
 
-        # NOTE: Guild scheduled events
+# NOTE: invites
 
-        elif EVENT == "GUILD_SCHEDULED_EVENT_CREATE":
-            event = GuildScheduledEvent(conn=client.http, **DATA)
-            guild = client.get_guild(event.guild_id)
-            guild.guild_scheduled_events.update({event.id: event})
 
-            client.dispatch("guild_scheduled_event_create", event, guild)
+@gateway_event("INVITE_CREATE")
+async def _invite_create(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "GUILD_SCHEDULED_EVENT_UPDATE":
-            event = GuildScheduledEvent(conn=client.http, **DATA)
-            guild = client.get_guild(event.guild_id)
-            guild.guild_scheduled_events.update({event.id: event})
+    invite = construct_trusted(Invite, DATA, conn=client.http)
+    client.dispatch("invite_create", invite)
 
-            client.dispatch("guild_scheduled_event_update", event, guild)
 
-        elif EVENT == "GUILD_SCHEDULED_EVENT_DELETE":
-            event = GuildScheduledEvent(conn=client.http, **DATA)
-            guild = client.get_guild(event.guild_id)
+@gateway_event("INVITE_DELETE")
+async def _invite_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    channel_id = DATA["channel_id"]
+    guild_id = DATA.get("guild_id", 0)
+    code = DATA["code"]
 
-            event = guild.scheduled_events.pop(event.id, event)
+    channel = client.get_channel(channel_id) or Snowflake(channel_id)
+    guild = client.get_guild(guild_id) or (
+        Snowflake(guild_id) if guild_id is not None else None
+    )
 
-            client.dispatch("guild_scheduled_event_delete", event, guild)
+    client.dispatch("invite_delete", channel, guild, code)
 
-        # NOTE: Integrations
 
-        elif EVENT == "ON_INTEGRATION_CREATE":
-            d = Integration(conn=client.http, **DATA)
+# NOTE: Guilds
 
-            client.dispatch("guild_integration_create", d.guild_id, d)
 
-        elif EVENT == "ON_INTEGRATION_UPDATE":
-            d = Integration(conn=client.http, **DATA)
+@gateway_event("GUILD_CREATE")
+async def _guild_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = construct_trusted(Guild, DATA, conn=client.http)
 
-            client.dispatch("guild_integration_update", d.guild_id, d)
+    if DATA["id"] in shard.unavailable_guilds:
+        shard.unavailable_guilds.pop(DATA["id"])
+        client.dispatch("guild_recv", guild)
+    else:
+        client.dispatch("guild_create", guild)
 
-        elif EVENT == "ON_INTEGRATION_DELETE":
-            integration_id = Snowflake(DATA["id"])
-            guild_id = Snowflake(DATA["guild_id"])
+    client.cache.add_guild(guild)
+
+
+@gateway_event("GUILD_DELETE")
+async def _guild_delete(shard, DATA: dict) -> None:
+    client = shard.client
 
-            if application_id := DATA.pop("application_id", None):
-                application_id = Snowflake(application_id)
+    if DATA.get("unavailable", None) is not None:
+        guild = construct_trusted(Guild, DATA, conn=client.http)
+        shard.unavailable_guilds.pop(DATA["id"], None)
+        client.dispatch("guild_outage", guild)
 
-            client.dispatch(
-                "guild_integration_delete", integration_id, guild_id, application_id
+        client.cache.add_guild(guild)
+    else:
+        guild = client.cache.remove_guild(int(DATA["id"]), None)
+        client.dispatch("guild_remove", guild)
+
+
+@gateway_event("GUILD_UPDATE")
+async def _guild_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["id"]))
+    b_guild = None
+
+    if guild is None:
+        guild = construct_trusted(Guild, DATA, conn=client.http)
+    else:
+        # Roles are updated in place, so the copy keeps them as they were
+        roles = {role_id: copy_with(role, {}) for role_id, role in guild.roles.items()}
+
+        # Members, channels and threads are not sent with updates
+        previous = patch_model(
+            guild, DATA, exclude=("members", "channels", "threads", "roles")
+        )
+        b_guild = copy_with(guild, {**previous, "roles": roles})
+        _patch_roles(client, guild, DATA.get("roles"))
+
+    client.cache.add_guild(guild)
+    client.dispatch("guild_update", b_guild, guild)
+
+
+def _patch_roles(client, guild: Guild, roles: Optional[list]) -> None:
+    # Updates roles in place so existing references stay valid
+    if roles is None:
+        return
+
+    seen = set()
+
+    for data in roles:
+        role_id = int(data["id"])
+        role = guild.roles.get(role_id)
+        seen.add(role_id)
+
+        if role is None:
+            guild.roles[role_id] = construct_trusted(
+                Role, data, conn=client.http, guild_id=guild.id
             )
+        else:
+            patch_model(role, data)
 
-        # NOTE: Invites
+    for role_id in guild.roles.keys() - seen:
+        del guild.roles[role_id]
 
-        elif EVENT == "ON_INVITE_CREATE":
-            inv = Invite(conn=client.http, **DATA)
 
-            client.dispatch("invite_create", inv)
+@gateway_event("GUILD_BAN_ADD")
+async def _guild_ban_add(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "ON_INVITE_DELETE":
-            channel_id = Snowflake(DATA["channel_id"])
-            code = DATA["code"]
+    guild = client.get_guild(int(DATA["guild_id"]))
+    user = client.cache.intern_user(
+        construct_trusted(User, DATA["user"], conn=client.http)
+    )
 
-            if guild_id := DATA.pop("guild_id", None):
-                guild_id = Snowflake(guild_id)
+    guild.members.pop(user.id, None)
+    client.dispatch("guild_ban", guild, user)
 
-            client.dispatch("invite_delete", code, channel_id, guild_id)
 
-        # NOTE: channels
+@gateway_event("GUILD_BAN_REMOVE")
+async def _guild_ban_remove(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "CHANNEL_CREATE":
-            channel, _ = _d_to_channel(DATA, client.http)
+    guild = client.get_guild(int(DATA["guild_id"]))
+    user = client.cache.intern_user(
+        construct_trusted(User, DATA["user"], conn=client.http)
+    )
 
-            client.cache.add_channel(channel)
-            client.dispatch("channel_create", channel)
+    client.dispatch("guild_ban_remove", guild, user)
 
-        elif EVENT == "CHANNEL_UPDATE":
-            channel, _ = _d_to_channel(DATA, client.http)
 
-            client.cache.add_channel(channel)
-            client.dispatch("channel_update", channel)
+@gateway_event("GUILD_EMOJIS_UPDATE")
+async def _guild_emojis_update(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "CHANNEL_DELETE":
-            channel = client.cache.remove_channel(channel.id, None)
-            client.dispatch("channel_delete", channel)
+    guild = client.get_guild(int(DATA["guild_id"]))
+    emojis = DATA["emojis"]
+    bulk = list()
 
-        # NOTE: threads
+    for emoji in emojis:
+        e = construct_trusted(Emoji, emoji, conn=client.http, guild_id=guild.id)
+        guild.emojis.update({e.id: e})
+        bulk.append(e)
 
-        elif EVENT == "THREAD_CREATE":
-            thread = Thread(conn=client.http, **DATA)
-            client.cache.add_channel(thread)
+        client.dispatch("guild_emoji_update", e)
 
-            guild = client.get_guild(thread.guild_id)
-            guild.threads.update({thread.id: thread})
+    client.dispatch("guild_emojis_update", bulk)
 
-            client.dispatch("thread_create", thread)
 
-        elif EVENT == "THREAD_UPDATE":
-            thread = Thread(conn=client.http, **DATA)
-            client.cache.add_channel(thread)
+@gateway_event("GUILD_STICKERS_UPDATE")
+async def _guild_stickers_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["guild_id"]))
+    stickers = DATA["stickers"]
+    bulk = list()
 
-            guild = client.get_guild(thread.guild_id)
-            guild.threads.update({thread.id: thread})
+    for sticker in stickers:
+        s = construct_trusted(Sticker, sticker, conn=client.http, guild_id=guild.id)
+        guild.stickers.update({s.id: s})
+        bulk.append(s)
 
-            client.dispatch("thread_update", thread)
+        client.dispatch("guild_sticker_update", s)
 
-        elif EVENT == "THREAD_DELETE":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            thread = guild.threads.pop(int(DATA["id"]), None)
-            client.cache.remove_channel(int(DATA["id"]), None)
+    client.dispatch("guild_stickers_update", bulk)
 
-            client.dispatch("thread_delete")
 
-        elif EVENT == "THREAD_SYNC_LIST":
-            guild = client.get_guild(int(DATA["guild_id"]))
-            threads = list()
+@gateway_event("GUILD_INTEGRATIONS_UPDATE")
+async def _guild_integrations_update(shard, DATA: dict) -> None:
+    client = shard.client
 
-            for thread in DATA["threads"]:
-                tr = Thread(conn=client.http, **thread)
-                threads.append(tr)
+    guild = client.get_guild(int(DATA["guild_id"]))
+    if guild is None:
+        guild = Snowflake(DATA["guild_id"])
+    client.dispatch("guild_integrations_update", guild)
 
-                guild.threads.update({tr.id: tr})
-                client.cache.add_channel(tr)
 
-            client.dispatch("thread_sync", threads)
+@gateway_event("GUILD_MEMBER_ADD")
+async def _guild_member_add(shard, DATA: dict) -> None:
+    client = shard.client
 
-        elif EVENT == "THREAD_MEMBER_UPDATE":
-            guild = client.get_guild(int(DATA.pop("guild_id")))
-            member = ThreadMember(**DATA)
+    member = construct_trusted(Member, DATA, conn=client.http)
+    member.user = client.cache.intern_user(member.user)
+    guild = client.get_guild(member.guild_id)
 
-            guild.threads[member.id].members.update({member.user_id: member})
+    if guild is not None:
+        guild.members.update({member.user.id: member})
+    else:
+        guild = Snowflake(DATA["guild_id"])
 
-            client.dispatch("thread_member_update", member)
+    client.dispatch("member_join", member, guild)
 
-        elif EVENT == "THREAD_MEMBERS_UPDATE":
-            guild = client.get_guild(int(DATA.pop("guild_id")))
-            thread = guild.threads[int(DATA.pop("id"))]
 
-            thread.member_count = DATA["member_count"]
+@gateway_event("GUILD_MEMBERS_CHUNK")
+async def _guild_members_chunk(shard, DATA: dict) -> None:
+    client = shard.client
 
-            for member in DATA["added_members"]:
-                trm = ThreadMember(**member)
-                thread.members.update({trm.id: trm})
+    guild = client.get_guild(int(DATA["guild_id"]))
+    request = shard.chunk_requests.get(DATA.get("nonce"))
+    members = []
 
-            for member in DATA["removed_member_ids"]:
-                thread.members.pop(int(member), None)
-                # Not all members may be in the thread
+    if guild is not None:
+        store = guild.members
 
-            client.dispatch("thread_members_update", thread)
+        for data in DATA["members"]:
+            # Stored without building a model, unless it was requested
+            store.add_payload(data)
 
-        elif EVENT == "VOICE_STATE_UPDATE":
-            client.awaiting_voice_connections.update(
-                {DATA["guild_id"]: (DATA["session_id"], DATA["channel_id"])}
-            )
+            if request is not None:
+                members.append(store[int(data["user"]["id"])])
 
-            m = Member(
-                conn=client.http,
-                guild_id=DATA["guild_id"],
-                voice_state=DATA,
-                **DATA["member"],
+    elif request is not None:
+        for data in DATA["members"]:
+            member = construct_trusted(
+                Member, data, conn=client.http, guild_id=int(DATA["guild_id"])
             )
+            member.user = client.cache.intern_user(member.user)
+            members.append(member)
 
-            if m.user.id == client.user.id:
-                # call manual disconnect if OP 13 has not already been recieved
-                conn = client.voice_connections.pop(DATA["guild_id"], None)
-                if conn is not None:
-                    await conn.disconnect()
+    if request is not None and request.feed(DATA, members):
+        shard.chunk_requests.pop(request.nonce, None)
 
-            guild = client.cache.get_guild(m.guild_id)
 
-            if not guild:
-                continue
+@gateway_event("GUILD_MEMBER_REMOVE")
+async def _guild_member_remove(shard, DATA: dict) -> None:
+    client = shard.client
 
-            guild.members.update({m.user.id: m})
-            channel_id = DATA["channel_id"]
+    guild = client.get_guild(int(DATA["guild_id"]))
+    user = client.cache.intern_user(
+        construct_trusted(User, DATA["user"], conn=client.http)
+    )
 
-            client.dispatch("voice_state_update", channel_id, m)
+    if guild is not None:
+        user = guild.members.pop(user.id, user)
+    else:
+        guild = Snowflake(DATA["guild_id"])
 
-        # NOTE: Presences
+    client.dispatch("member_remove", user, guild)
 
-        elif EVENT == "PRESENCE_UPDATE":
-            user_id = DATA.pop("user").get("id")
-            presence = MemberPresence(user_id=user_id, **DATA)
 
-            guild = client.get_guild(presence.guild_id)
+@gateway_event("GUILD_MEMBER_UPDATE")
+async def _guild_member_update(shard, DATA: dict) -> None:
+    client = shard.client
 
-            if guild and (member := guild.get_member(presence.user_id)):
-                member.presence = presence
+    guild = client.get_guild(int(DATA["guild_id"]))
 
-            client.dispatch("presence_update", presence)
+    if guild is None:
+        client.dispatch("u_member_update", DATA)
+        return
 
-        # NOTE: VOICE EVENTS
+    b_member = guild.get_member(int(DATA["user"]["id"]))
+    client.cache.metrics.lookup("members", b_member is not None)
 
-        elif EVENT == "VOICE_SERVER_UPDATE":
-            session_id, channel_id = client.awaiting_voice_connections.pop(
-                DATA["guild_id"], None
-            )
+    if not b_member:
+        b_member = await guild.fetch_member(int(DATA["user"]["id"]))
 
-            if not session_id:
-                continue
-            data["d"]["session_id"] = session_id
-            data["d"]["user_id"] = client.user.id
+    # Only the fields sent are validated, b_member keeps the previous values
+    a_member = copy_with(b_member, {})
+    patch_model(a_member, DATA, exclude=("user",))
+
+    user = a_member.user
+    if user is not None:
+        # The user is shared with other models, so is updated in place
+        b_member = copy_with(b_member, {"user": copy_with(user, {})})
+        patch_model(user, DATA["user"])
+        a_member.user = client.cache.intern_user(user)
+
+    guild.members[a_member.id] = a_member
+
+    client.dispatch("member_update", b_member, a_member, guild)
+
+
+@gateway_event("GUILD_ROLE_CREATE")
+async def _guild_role_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["guild_id"]))
+    role = construct_trusted(Role, DATA["role"], conn=client.http)
+
+    guild.roles.update({role.id: role})
+
+    client.dispatch("role_create", role, guild)
+
+
+@gateway_event("GUILD_ROLE_UPDATE")
+async def _guild_role_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["guild_id"]))
+    a_role = guild.roles.get(int(DATA["role"]["id"]))
+
+    if a_role is None:
+        b_role = None
+        a_role = construct_trusted(
+            Role, DATA["role"], conn=client.http, guild_id=guild.id
+        )
+        guild.roles[a_role.id] = a_role
+    else:
+        previous = patch_model(a_role, DATA["role"])
+        b_role = copy_with(a_role, previous)
+
+    client.dispatch("role_update", b_role, a_role, guild)
+
+
+@gateway_event("GUILD_ROLE_DELETE")
+async def _guild_role_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["guild_id"]))
+    role = guild.roles.get(Snowflake(DATA["role_id"]))
+
+    client.dispatch("role_delete", role, guild)
+
+
+# NOTE: Guild scheduled events
+
+
+@gateway_event("GUILD_SCHEDULED_EVENT_CREATE")
+async def _guild_scheduled_event_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    event = construct_trusted(GuildScheduledEvent, DATA, conn=client.http)
+    guild = client.get_guild(event.guild_id)
+    guild.guild_scheduled_events.update({event.id: event})
+
+    client.dispatch("guild_scheduled_event_create", event, guild)
+
+
+@gateway_event("GUILD_SCHEDULED_EVENT_UPDATE")
+async def _guild_scheduled_event_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    event = construct_trusted(GuildScheduledEvent, DATA, conn=client.http)
+    guild = client.get_guild(event.guild_id)
+    guild.guild_scheduled_events.update({event.id: event})
+
+    client.dispatch("guild_scheduled_event_update", event, guild)
+
+
+@gateway_event("GUILD_SCHEDULED_EVENT_DELETE")
+async def _guild_scheduled_event_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    event = construct_trusted(GuildScheduledEvent, DATA, conn=client.http)
+    guild = client.get_guild(event.guild_id)
+
+    event = guild.scheduled_events.pop(event.id, event)
+
+    client.dispatch("guild_scheduled_event_delete", event, guild)
+
+
+# NOTE: Integrations
+
+
+@gateway_event("ON_INTEGRATION_CREATE")
+async def _on_integration_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    d = construct_trusted(Integration, DATA, conn=client.http)
+
+    client.dispatch("guild_integration_create", d.guild_id, d)
+
+
+@gateway_event("ON_INTEGRATION_UPDATE")
+async def _on_integration_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    d = construct_trusted(Integration, DATA, conn=client.http)
+
+    client.dispatch("guild_integration_update", d.guild_id, d)
+
+
+@gateway_event("ON_INTEGRATION_DELETE")
+async def _on_integration_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    integration_id = Snowflake(DATA["id"])
+    guild_id = Snowflake(DATA["guild_id"])
+
+    if application_id := DATA.pop("application_id", None):
+        application_id = Snowflake(application_id)
+
+    client.dispatch(
+        "guild_integration_delete", integration_id, guild_id, application_id
+    )
+
+
+# NOTE: Invites
+
+
+@gateway_event("ON_INVITE_CREATE")
+async def _on_invite_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    inv = construct_trusted(Invite, DATA, conn=client.http)
+
+    client.dispatch("invite_create", inv)
+
+
+@gateway_event("ON_INVITE_DELETE")
+async def _on_invite_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    channel_id = Snowflake(DATA["channel_id"])
+    code = DATA["code"]
+
+    if guild_id := DATA.pop("guild_id", None):
+        guild_id = Snowflake(guild_id)
+
+    client.dispatch("invite_delete", code, channel_id, guild_id)
+
+
+# NOTE: channels
+
+
+def _update_guild_channel(client, DATA: dict, channel: Optional[Channel]) -> None:
+    # Keeps the guild mapping, and any indexes on it, in sync with the cache
+    guild_id = DATA.get("guild_id")
+    guild = client.get_guild(int(guild_id)) if guild_id is not None else None
+
+    if guild is None:
+        return
+
+    if channel is None:
+        guild.channels.pop(int(DATA["id"]), None)
+    else:
+        guild.channels[channel.id] = channel
+
+
+@gateway_event("CHANNEL_CREATE")
+async def _channel_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    channel, _ = _d_to_channel(DATA, client.http)
+
+    client.cache.add_channel(channel)
+    _update_guild_channel(client, DATA, channel)
+
+    client.dispatch("channel_create", channel)
+
+
+@gateway_event("CHANNEL_UPDATE")
+async def _channel_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    channel, _ = _d_to_channel(DATA, client.http)
+
+    client.cache.add_channel(channel)
+    _update_guild_channel(client, DATA, channel)
+
+    client.dispatch("channel_update", channel)
+
+
+@gateway_event("CHANNEL_DELETE")
+async def _channel_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    channel = client.cache.remove_channel(int(DATA["id"]), None)
+    _update_guild_channel(client, DATA, None)
+
+    client.dispatch("channel_delete", channel)
+
+
+# NOTE: threads
+
+
+@gateway_event("THREAD_CREATE")
+async def _thread_create(shard, DATA: dict) -> None:
+    client = shard.client
+
+    thread = construct_trusted(Thread, DATA, conn=client.http)
+    client.cache.add_channel(thread)
+
+    guild = client.get_guild(thread.guild_id)
+    guild.threads.update({thread.id: thread})
+
+    client.dispatch("thread_create", thread)
+
+
+@gateway_event("THREAD_UPDATE")
+async def _thread_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    thread = construct_trusted(Thread, DATA, conn=client.http)
+    client.cache.add_channel(thread)
+
+    guild = client.get_guild(thread.guild_id)
+    guild.threads.update({thread.id: thread})
+
+    client.dispatch("thread_update", thread)
+
+
+@gateway_event("THREAD_DELETE")
+async def _thread_delete(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["guild_id"]))
+    thread = guild.threads.pop(int(DATA["id"]), None)
+    client.cache.remove_channel(int(DATA["id"]), None)
+
+    client.dispatch("thread_delete")
+
+
+@gateway_event("THREAD_SYNC_LIST")
+async def _thread_sync_list(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA["guild_id"]))
+    threads = list()
+
+    for thread in DATA["threads"]:
+        tr = construct_trusted(Thread, thread, conn=client.http)
+        threads.append(tr)
+
+        guild.threads.update({tr.id: tr})
+        client.cache.add_channel(tr)
+
+    client.dispatch("thread_sync", threads)
+
+
+@gateway_event("THREAD_MEMBER_UPDATE")
+async def _thread_member_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA.pop("guild_id")))
+    member = ThreadMember(**DATA)
+
+    guild.threads[member.id].members.update({member.user_id: member})
+
+    client.dispatch("thread_member_update", member)
+
+
+@gateway_event("THREAD_MEMBERS_UPDATE")
+async def _thread_members_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    guild = client.get_guild(int(DATA.pop("guild_id")))
+    thread = guild.threads[int(DATA.pop("id"))]
+
+    thread.member_count = DATA["member_count"]
+
+    for member in DATA["added_members"]:
+        trm = ThreadMember(**member)
+        thread.members.update({trm.id: trm})
+
+    for member in DATA["removed_member_ids"]:
+        thread.members.pop(int(member), None)
+        # Not all members may be in the thread
+
+    client.dispatch("thread_members_update", thread)
+
+
+@gateway_event("VOICE_STATE_UPDATE")
+async def _voice_state_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    client.awaiting_voice_connections.update(
+        {DATA["guild_id"]: (DATA["session_id"], DATA["channel_id"])}
+    )
+
+    m = Member(
+        conn=client.http,
+        guild_id=DATA["guild_id"],
+        voice_state=DATA,
+        **DATA["member"],
+    )
+    m.user = client.cache.intern_user(m.user)
+
+    if m.user.id == client.user.id:
+        # call manual disconnect if OP 13 has not already been recieved
+        conn = client.voice_connections.pop(DATA["guild_id"], None)
+        if conn is not None:
+            await conn.disconnect()
+
+    guild = client.cache.get_guild(m.guild_id)
+
+    if not guild:
+        return
+
+    guild.members.update({m.user.id: m})
+    channel_id = DATA["channel_id"]
+
+    client.dispatch("voice_state_update", channel_id, m)
+
+
+# NOTE: Presences
+
+
+@gateway_event("PRESENCE_UPDATE")
+async def _presence_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    user_id = DATA.pop("user").get("id")
+    presence = MemberPresence(user_id=user_id, **DATA)
+
+    guild = client.get_guild(presence.guild_id)
+
+    if guild and (member := guild.get_member(presence.user_id)):
+        member.presence = presence
+        guild.members[member.id] = member
+
+    client.dispatch("presence_update", presence)
+
+
+# NOTE: VOICE EVENTS
+
+
+@gateway_event("VOICE_SERVER_UPDATE")
+async def _voice_server_update(shard, DATA: dict) -> None:
+    client = shard.client
+
+    session_id, channel_id = client.awaiting_voice_connections.pop(
+        DATA["guild_id"], None
+    )
+
+    if not session_id:
+        return
+    DATA["session_id"] = session_id
+    DATA["user_id"] = client.user.id
 
-            vc = VoiceConnection(data, client.loop, client, channel_id)
-            client.voice_connections.update({DATA["guild_id"]: vc})
+    packet = {"op": gateway.DISPATCH, "t": "VOICE_SERVER_UPDATE", "d": DATA}
+    vc = VoiceConnection(packet, client.loop, client, channel_id)
+    client.voice_connections.update({DATA["guild_id"]: vc})
 
-            # Handled by default handler in Client.on_voice_server_update
-            client.dispatch("voice_server_update", vc)
+    # Handled by default handler in Client.on_voice_server_update
+    client.dispatch("voice_server_update", vc)
@@ -0,0 +1,170 @@
+# Schedules shard identifies
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Seconds between identifies within a single concurrency bucket
+IDENTIFY_DELAY = 5
+# Seconds between session start limit resets
+SESSION_RESET_AFTER = 60 * 60 * 24
+
+
+class IdentifyScheduler:
+    """Starts shards concurrently while following discord's identify limits.
+
+    Shards are grouped into buckets by ``shard_id % max_concurrency``,
+    every bucket is started at the same time
+    and shards within a bucket identify one after another, 5 seconds apart.
+    Identifies also count towards the ``session_start_limit``,
+    once no sessions remain the scheduler waits until it resets.
+    Shards which already have a session ID resume instead of identifying.
+
+    The client receives ``shard_start`` after each shard identifies
+    and ``shards_start`` once every shard has been started.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        gateway = await client.http.fetch_gateway()
+        scheduler = IdentifyScheduler(client, gateway["session_start_limit"])
+
+        await scheduler.start(shards)
+
+    Parameters
+    ----------
+    client: :class:`Client`
+        Client the shards belong to
+    session_start_limit: :class:`dict`
+        Session start limit received from ``/gateway/bot``
+
+    Attributes
+    ----------
+    max_concurrency: :class:`int`
+        Number of buckets which can identify at the same time
+    remaining: :class:`int`
+        Number of sessions which can still be started
+    total: :class:`int`
+        Number of sessions allowed per reset
+    reset_at: :class:`float`
+        Monotonic timestamp of when :attr:`IdentifyScheduler.remaining` resets
+    started: :class:`int`
+        Number of shards started by the last call to :meth:`IdentifyScheduler.start`
+    """
+
+    def __init__(self, client: Any, session_start_limit: Dict[str, int]) -> None:
+        self.client = client
+
+        self.max_concurrency = max(session_start_limit.get("max_concurrency", 1), 1)
+        self.remaining = session_start_limit.get("remaining", 1000)
+        self.total = session_start_limit.get("total", self.remaining)
+        self.reset_at = (
+            time.monotonic() + session_start_limit.get("reset_after", 0) / 1000
+        )
+
+        self.started = 0
+        self._session_lock = asyncio.Lock()
+
+    def buckets(self, shards: Iterable[Any]) -> Dict[int, List[Any]]:
+        """Groups shards by their identify bucket, in the order they should start
+
+        Parameters
+        ----------
+        shards: Iterable[:class:`Shard`]
+            Shards to group
+        """
+        buckets: Dict[int, List[Any]] = {}
+
+        for shard in sorted(shards, key=lambda s: s.shard_id):
+            buckets.setdefault(shard.shard_id % self.max_concurrency, []).append(shard)
+
+        return buckets
+
+    async def acquire_session(self) -> None:
+        """|coro|
+
+        Uses up a session start,
+        waits for the limit to reset if none are remaining
+        """
+        async with self._session_lock:
+            now = time.monotonic()
+
+            if now >= self.reset_at:
+                self._reset(now)
+
+            if self.remaining <= 0:
+                delay = self.reset_at - now
+                logger.warning(
+                    f"Session start limit reached, waiting {delay:.0f} seconds for it to reset"
+                )
+
+                await asyncio.sleep(delay)
+                self._reset(time.monotonic())
+
+            self.remaining -= 1
+
+    def _reset(self, now: float) -> None:
+        self.remaining = self.total
+        self.reset_at = now + SESSION_RESET_AFTER
+
+    async def start(self, shards: Iterable[Any]) -> List[asyncio.Task]:
+        """|coro|
+
+        Connects, identifies and begins listening on each shard,
+        returns the listening tasks.
+
+        Parameters
+        ----------
+        shards: Iterable[:class:`Shard`]
+            Shards to start
+        """
+        buckets = self.buckets(shards)
+        total = sum(len(bucket) for bucket in buckets.values())
+        started_at = time.monotonic()
+
+        self.started = 0
+
+        logger.info(f"Starting {total} shards across {len(buckets)} identify buckets")
+
+        results = await asyncio.gather(
+            *(self._start_bucket(bucket, total) for bucket in buckets.values())
+        )
+
+        self.client.dispatch("shards_start", total, time.monotonic() - started_at)
+
+        return [task for tasks in results for task in tasks]
+
+    async def _start_bucket(self, shards: List[Any], total: int) -> List[asyncio.Task]:
+        tasks = []
+        identified = False
+
+        for shard in shards:
+            await shard.connect()
+            await shard.receive_hello()
+
+            if shard.session_id is not None:
+                # Resumes are not limited by identify buckets
+                await shard.resume()
+            else:
+                if identified:
+                    await asyncio.sleep(IDENTIFY_DELAY)
+                identified = True
+
+                await self.acquire_session()
+                await shard.send_identity(
+                    self.client.token, self.client.intents, self.client.presence
+                )
+
+            tasks.append(shard.listen(shard=shard))
+
+            self.started += 1
+            logger.info(f"Started shard {shard.shard_id} ({self.started}/{total})")
+
+            self.client.dispatch("shard_start", shard, self.started, total)
+
+        return tasks
@@ -3,23 +3,31 @@
 from __future__ import annotations
 import asyncio
 import sys
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
 import logging
+import pydantic
 
 
 from acord.errors import GatewayError
 from acord.models import Snowflake
 
 from acord.core.signals import gateway
-from acord.core.decoders import decodeResponse
+from acord.core.decoders import (
+    decodeResponse,
+    encodeETF,
+    encodeJSON,
+    ZlibStreamInflator,
+)
 from acord.core.heartbeat import GatewayKeepAlive
 
 from acord.payloads import (
     GenericWebsocketPayload,
+    RequestGuildMembersPayload,
     VoiceStateUpdatePresence,
 )
 from acord.bases import Presence
 
+from .chunker import ChunkRequest, generate_nonce
 from .handler import handle_websocket
 from .ratelimiter import GatewayRatelimiter
 
@@ -113,6 +121,18 @@ class Shard:
         Whether the shard is in a resuming state
     ratelimit_key: :class:`int`
         Ratelimit key used for bucket ratelimiting gateway requests
+    unavailable_guilds: Dict[:class:`Snowflake`, :class:`bool`]
+        Guilds which were unavailable when the shard received READY
+    inflator: Optional[:class:`ZlibStreamInflator`]
+        Decompression context for this shard,
+        ``None`` if :attr:`Client.compress` is disabled.
+        Tracks compressed and decompressed byte counts.
+    latency: :class:`float`
+        Latency of the last acknowledged heartbeat in seconds
+    latency_history: List[:class:`float`]
+        Latencies of recently acknowledged heartbeats in seconds
+    chunk_requests: Dict[:class:`str`, :class:`ChunkRequest`]
+        Member chunk requests waiting for chunks, mapped by nonce
     """
 
     def __init__(
@@ -141,6 +161,11 @@ def __init__(
         self.session_id = None
         self.gateway_version = None
         self.resuming = False
+        self.unavailable_guilds: Dict[Snowflake, bool] = dict()
+        self.chunk_requests: Dict[str, ChunkRequest] = dict()
+
+        self.inflator = ZlibStreamInflator() if client.compress else None
+        self._keep_alive: Optional[GatewayKeepAlive] = None
 
     def contains_guild(self, guild_id: Snowflake, /) -> bool:
         return ((guild_id >> 22) % self.num_shards) == self.shard_id
@@ -169,6 +194,10 @@ async def connect(self, **kwds) -> None:
         self.ws = await self.session.ws_connect(self.url, **kwds)
         self._snd_kwds = kwds
 
+        if self.inflator is not None:
+            # New connections start a new zlib stream
+            self.inflator.reset()
+
         logger.info(f"Shard {self.shard_id} has connected successfully")
 
     async def receive_hello(self):
@@ -180,11 +209,14 @@ async def receive_hello(self):
         logger.debug(f"Receiving hello packet for Shard {self.shard_id}")
 
         packet = await self.ws.receive()
-        data = decodeResponse(packet.data)
+        data = decodeResponse(packet.data, self.inflator)
 
         if not data.get("op", 0) == gateway.HELLO:
             raise GatewayError(f"Invalid op code recieved")
 
+        if self._keep_alive is not None:
+            self._keep_alive.end()
+
         self._keep_alive = GatewayKeepAlive(
             self, data["d"]["heartbeat_interval"], self.loop
         )
@@ -228,10 +260,34 @@ async def send_identity(
 
             lock.increment(self.ratelimit_key, lock_if_exceed=True)
 
-        await self.ws.send_str(payload.json())
+        await self.send(payload)
 
         logger.info(f"Sent identity packet for Shard {self.shard_id}")
 
+    async def send(self, payload: Union[dict, pydantic.BaseModel]) -> None:
+        """|coro|
+
+        Sends a payload through the websocket,
+        encoded using :attr:`Client.encoding`.
+
+        Parameters
+        ----------
+        payload: Union[:class:`dict`, :class:`~pydantic.BaseModel`]
+            Payload to send
+        """
+        if self.client.encoding.upper() == "ETF":
+            if isinstance(payload, pydantic.BaseModel):
+                payload = payload.dict()
+
+            await self.ws.send_bytes(encodeETF(payload))
+        else:
+            if isinstance(payload, pydantic.BaseModel):
+                payload = payload.json()
+            else:
+                payload = encodeJSON(payload)
+
+            await self.ws.send_str(payload)
+
     def listen(self, **kwds):
         """Generates task using handler,
         this task is automatically terminated by :meth:`Shard.disconnect`.
@@ -251,10 +307,15 @@ async def disconnect(self):
         """
         logger.info(f"Disconnecting from shard {self.shard_id}")
 
-        self._keep_alive._ended = True
+        if self._keep_alive is not None:
+            self._keep_alive.end()
 
         await self.ws.close(code=4000)
 
+        for request in self.chunk_requests.values():
+            request.fail(GatewayError("Shard disconnected before all chunks arrived"))
+        self.chunk_requests.clear()
+
         if getattr(self, "task", None):
             self.task.cancel(msg="Disconnect called")
 
@@ -269,10 +330,14 @@ async def resume(self, *, restart: bool = False):
             Whether to restart the session
         """
         if restart:
-            await self.ws.close(code=4000)
+            old = self.ws
+
+            # Swap the websocket before closing the old one,
+            # so the handler picks up the new connection instead of resuming again
             await self.connect(**self._snd_kwds)
+            await self.receive_hello()
 
-            self._keep_alive._ws = self.ws
+            await old.close(code=4000)
 
         async with self.ratelimiter as lock:
             if lock.exceeded(self.ratelimit_key):
@@ -282,7 +347,7 @@ async def resume(self, *, restart: bool = False):
 
         self.resuming = True
 
-        await self.ws.send_json(
+        await self.send(
             {
                 "op": gateway.RESUME,
                 "d": {
@@ -317,7 +382,7 @@ async def change_presence(self, presence: Presence) -> None:
 
             lock.increment(self.ratelimit_key, lock_if_exceed=True)
 
-        await self.ws.send_str(payload.json())
+        await self.send(payload)
 
     async def update_voice_state(self, **data) -> None:
         """|coro|
@@ -344,7 +409,113 @@ async def update_voice_state(self, **data) -> None:
 
             lock.increment(self.ratelimit_key, lock_if_exceed=True)
 
-        await self.ws.send_str(payload.json())
+        await self.send(payload)
+
+    async def request_guild_members(
+        self,
+        guild_id: Snowflake,
+        *,
+        query: str = None,
+        limit: int = 0,
+        user_ids: List[Snowflake] = None,
+        presences: bool = False,
+        wait: bool = True,
+        timeout: Optional[float] = 60.0,
+    ) -> Union[List[Any], ChunkRequest]:
+        """|coro|
+
+        Requests members of a guild through the gateway,
+        members are added to the guild as chunks arrive.
+
+        Requests go through the gateway ratelimiter,
+        so requesting members of many guilds at once is spread out over time.
+
+        .. note::
+            Requesting every member requires the ``GUILD_MEMBERS`` intent,
+            and ``presences`` requires the ``GUILD_PRESENCES`` intent.
+
+        Parameters
+        ----------
+        guild_id: :class:`Snowflake`
+            ID of guild to request members from
+        query: :class:`str`
+            Only include members whose username starts with this,
+            an empty string returns every member.
+            Defaults to every member if ``user_ids`` is not provided.
+        limit: :class:`int`
+            Maximum number of members to return when using ``query``,
+            0 for no limit
+        user_ids: List[:class:`Snowflake`]
+            IDs of members to request, up to 100
+        presences: :class:`bool`
+            Whether to include presences
+        wait: :class:`bool`
+            Whether to wait for every chunk,
+            else the :class:`ChunkRequest` is returned and can be awaited later
+        timeout: Optional[:class:`float`]
+            Seconds to wait for every chunk before raising :class:`asyncio.TimeoutError`,
+            only used with ``wait``
+        """
+        if query is None and user_ids is None:
+            query = ""
+
+        nonce = generate_nonce()
+        request = ChunkRequest(int(guild_id), nonce, loop=self.loop)
+
+        d = RequestGuildMembersPayload(
+            guild_id=guild_id,
+            query=query,
+            limit=limit,
+            user_ids=user_ids,
+            presences=presences,
+            nonce=nonce,
+        )
+        payload = GenericWebsocketPayload(
+            op=gateway.GUILDMEMBERS, d=d.dict(exclude_none=True)
+        )
+
+        logger.debug(f"Requesting members of guild {guild_id} on shard {self.shard_id}")
+
+        async with self.ratelimiter as lock:
+            if lock.exceeded(self.ratelimit_key):
+                await lock.hold_until_reset(self.ratelimit_key)
+
+            lock.increment(self.ratelimit_key, lock_if_exceed=True)
+
+        # Registered before sending, chunks can arrive before send returns
+        self.chunk_requests[nonce] = request
+
+        try:
+            await self.send(payload)
+        except BaseException:
+            self.chunk_requests.pop(nonce, None)
+            raise
+
+        if not wait:
+            return request
+
+        try:
+            return await asyncio.wait_for(request, timeout)
+        finally:
+            if not request.done():
+                request.fail(asyncio.TimeoutError())
+                self.chunk_requests.pop(nonce, None)
+
+    @property
+    def latency(self) -> float:
+        """Latency of the last acknowledged heartbeat in seconds,
+        ``inf`` if no heartbeat has been acknowledged yet.
+        """
+        if self._keep_alive is None:
+            return float("inf")
+        return self._keep_alive.latency
+
+    @property
+    def latency_history(self) -> List[float]:
+        """Latencies of recently acknowledged heartbeats in seconds, oldest first"""
+        if self._keep_alive is None:
+            return []
+        return list(self._keep_alive.latency_history)
 
     @property
     def ratelimit_key(self):
@@ -3,13 +3,22 @@
 """
 from functools import wraps
 import yarl
-from typing import Optional, Literal, Type, Union
+from typing import Dict, List, Optional, Literal, Tuple, Type, Union
 
 API_VERSION = 10
 BASE_API_URL = "https://discord.com/api"
 GATEWAY_ENCODING = Literal["JSON", "ETF"]
 DISCORD_EPOCH = 1420070400000
 
+# Parameters which discord gives separate buckets, keyed by the segment before them
+MAJOR_PARAMETERS = {
+    "channels": "channel_id",
+    "guilds": "guild_id",
+    "webhooks": "webhook_id",
+}
+# Segments which follow these are variable but never numeric
+_VARIABLE_AFTER = {"reactions": "{emoji}", "interactions": "{interaction_id}"}
+
 
 def buildURL(*paths, **parameters) -> Union[str, yarl.URL]:
     URI = f"{BASE_API_URL}/v{API_VERSION}"
@@ -58,6 +67,43 @@ def inner(*args, **kwargs):
     return inner
 
 
+def split_route(paths: List[str]) -> Tuple[str, Dict[str, str]]:
+    """Splits a path into its route template and major parameters,
+    e.g. ``channels/1/messages/2`` becomes ``channels/{channel_id}/messages/{id}``
+    with a ``channel_id`` of ``1``.
+
+    Parameters
+    ----------
+    paths: List[:class:`str`]
+        Segments of the path
+    """
+    template = []
+    major = {}
+    previous = None
+
+    for segment in paths:
+        name = MAJOR_PARAMETERS.get(previous)
+
+        if name is not None and name not in major and isInt(segment):
+            major[name] = segment
+            template.append("{%s}" % name)
+        elif previous == "{webhook_id}" or previous == "{interaction_id}":
+            # Webhook and interaction tokens
+            if previous == "{webhook_id}":
+                major["webhook_token"] = segment
+            template.append("{token}")
+        elif previous in _VARIABLE_AFTER:
+            template.append(_VARIABLE_AFTER[previous])
+        elif segment and isInt(segment):
+            template.append("{id}")
+        else:
+            template.append(segment)
+
+        previous = template[-1]
+
+    return "/".join(template), major
+
+
 class Route(object):
     """Simple object representing a route"""
 
@@ -78,6 +124,30 @@ def __init__(
         self.webhook_id: Optional[int] = bucket.get("webhook_id")
         self.webhook_token: Optional[str] = bucket.get("webhook_token")
 
+        self.template, major = split_route(self.path.split("/"))
+
+        # Parameters passed explicitly take priority over those in the path
+        for name, value in major.items():
+            if getattr(self, name) is None:
+                setattr(self, name, value)
+
+    @property
+    def key(self) -> str:
+        """Method and template of this route,
+        routes with the same key share a bucket hash
+        """
+        return f"{self.method} {self.template}"
+
+    @property
+    def major(self) -> str:
+        """Major parameters of this route,
+        buckets are separate for each set of major parameters
+        """
+        return (
+            f"{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}"
+        )
+
     @property
-    def bucket(self):
-        return f"{self.channel_id}:{self.guild_id}:{self.path}"
+    def bucket(self) -> str:
+        """Bucket used before discord has sent the bucket hash for this route"""
+        return f"{self.key}:{self.major}"
@@ -0,0 +1,465 @@
+# Shares HTTP ratelimits between processes using the same token
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, NamedTuple, Optional, Tuple, Union
+
+from pydantic import PrivateAttr
+
+from .decoders import JSON, encodeJSON
+from .ratelimiter import DefaultHTTPRatelimiter
+
+logger = logging.getLogger(__name__)
+
+Address = Union[str, Tuple[str, int]]
+
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS: Address = os.path.join(
+        tempfile.gettempdir(), "acord-ratelimit.sock"
+    )
+else:
+    DEFAULT_ADDRESS: Address = ("127.0.0.1", 7464)
+
+
+class _RouteInfo(NamedTuple):
+    # Enough of a route for DefaultHTTPRatelimiter.throttle
+    template: str
+
+
+def _route_key(bucket: str) -> str:
+    # Buckets end with 4 major parameters, see Route.major
+    return bucket.rsplit(":", 4)[0]
+
+
+async def _open_connection(address: Address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (encodeJSON(message) + "\n").encode()
+
+
+class RatelimitCoordinator:
+    """A small server which enforces ratelimits for every process on a host,
+    processes connect to it using :class:`CoordinatedRatelimiter`.
+
+    Every process using the same token should use the same coordinator,
+    it keeps the buckets, global limit and invalid request budget for all of them.
+    Requests held by a process which disconnects are released.
+
+    The coordinator can run in its own process,
+
+    .. code-block:: sh
+
+        python -m acord.core.coordinator --path /tmp/acord-ratelimit.sock
+
+    or inside an existing event loop, such as the one running a :class:`ClusterSupervisor`.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        coordinator = RatelimitCoordinator("/tmp/acord-ratelimit.sock")
+        await coordinator.start()
+
+    Parameters
+    ----------
+    address: Union[:class:`str`, Tuple[:class:`str`, :class:`int`]]
+        Path of a unix socket, or host and port to listen on
+    ratelimiter: :class:`DefaultHTTPRatelimiter`
+        Ratelimiter holding the shared state
+    """
+
+    def __init__(
+        self,
+        address: Address = DEFAULT_ADDRESS,
+        *,
+        ratelimiter: DefaultHTTPRatelimiter = None,
+    ) -> None:
+        self.address = address
+        self.ratelimiter = ratelimiter or DefaultHTTPRatelimiter(
+            max_requests=(10000, 60 * 10)
+        )
+        self.connections = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts listening for processes
+        """
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                # Left behind by a coordinator which did not shut down cleanly
+                os.unlink(self.address)
+
+            self._server = await asyncio.start_unix_server(self._handle, self.address)
+        else:
+            self._server = await asyncio.start_server(self._handle, *self.address)
+
+        logger.info(f"Ratelimit coordinator listening on {self.address}")
+
+    async def serve_forever(self) -> None:
+        """|coro|
+
+        Starts the coordinator and serves until cancelled
+        """
+        if self._server is None:
+            await self.start()
+
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops the coordinator
+        """
+        if self._server is None:
+            return
+
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Acquired buckets and unanswered calls, by message ID
+        held: Dict[int, str] = {}
+        tasks: Dict[int, asyncio.Task] = {}
+
+        self.connections += 1
+
+        try:
+            while line := await reader.readline():
+                message = JSON(line)
+                op = message["op"]
+
+                if op == "acquire":
+                    coro = self._acquire(message, writer, held)
+                elif op == "throttle":
+                    coro = self._throttle(message, writer)
+                else:
+                    self._apply(message, held, tasks)
+                    continue
+
+                id = message["id"]
+                task = tasks[id] = asyncio.create_task(coro)
+                task.add_done_callback(lambda _, id=id: tasks.pop(id, None))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+
+            for task in list(tasks.values()):
+                task.cancel()
+
+            # Release anything the process was holding
+            for id in list(held):
+                self._release(held, id)
+
+            writer.close()
+
+    def _release(self, held: Dict[int, str], id: int) -> None:
+        bucket = held.pop(id, None)
+
+        if bucket is not None:
+            self.ratelimiter._get_bucket(bucket).release()
+
+    def _apply(
+        self,
+        message: Dict[str, Any],
+        held: Dict[int, str],
+        tasks: Dict[int, asyncio.Task],
+    ) -> None:
+        ratelimiter = self.ratelimiter
+        op = message["op"]
+
+        if op == "release":
+            self._release(held, message["id"])
+        elif op == "cancel":
+            # The caller stopped waiting, so will never release what it was granted
+            task = tasks.pop(message["id"], None)
+
+            if task is not None:
+                task.cancel()
+            self._release(held, message["id"])
+        elif op == "update":
+            ratelimiter.add_bucket(message["bucket"], message["data"])
+        elif op == "learn":
+            ratelimiter.route_buckets[message["route"]] = message["hash"]
+        elif op == "response":
+            ratelimiter.record_response(
+                None, message["status"], {"X-RateLimit-Scope": message.get("scope")}
+            )
+        elif op == "global_lock":
+            if not ratelimiter.global_lock:
+                ratelimiter.global_lock_set(message["retry_after"])
+        else:
+            logger.warning(f"Ratelimit coordinator received unknown op {op!r}")
+
+    async def _acquire(
+        self,
+        message: Dict[str, Any],
+        writer: asyncio.StreamWriter,
+        held: Dict[int, str],
+    ) -> None:
+        bucket = message["bucket"]
+        _bucket = self.ratelimiter._get_bucket(bucket)
+
+        await _bucket.acquire()
+
+        if writer.is_closing():
+            # The reply can't be delivered, so nothing would release it
+            _bucket.release()
+            return
+
+        self.ratelimiter.increment(bucket)
+        held[message["id"]] = bucket
+
+        reply = {"id": message["id"]}
+
+        if bucket_hash := self.ratelimiter.route_buckets.get(_route_key(bucket)):
+            # Another process has already discovered this bucket
+            reply["hash"] = bucket_hash
+
+        writer.write(_encode(reply))
+
+    async def _throttle(
+        self, message: Dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        await self.ratelimiter.throttle(_RouteInfo(message["template"]))
+
+        writer.write(_encode({"id": message["id"]}))
+
+
+class CoordinatedRatelimiter(DefaultHTTPRatelimiter):
+    """A :class:`DefaultHTTPRatelimiter` which shares its limits with other processes
+    through a :class:`RatelimitCoordinator`.
+
+    While the coordinator cannot be reached,
+    ratelimits are enforced for this process only,
+    connecting is retried every ``reconnect_delay`` seconds.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        ratelimiter = CoordinatedRatelimiter(
+            max_requests=(10000, 600), address="/tmp/acord-ratelimit.sock"
+        )
+        client.http = HTTPClient(client, ratelimiter=ratelimiter)
+
+    Parameters
+    ----------
+    address: Union[:class:`str`, Tuple[:class:`str`, :class:`int`]]
+        Address of the coordinator
+    reconnect_delay: :class:`float`
+        Seconds to wait before connecting again after failing to connect
+    """
+
+    address: Any = DEFAULT_ADDRESS
+    reconnect_delay: float = 5.0
+
+    _reader: Any = PrivateAttr(default=None)
+    _writer: Any = PrivateAttr(default=None)
+    _reader_task: Any = PrivateAttr(default=None)
+    _pending: Dict[int, Any] = PrivateAttr(default_factory=dict)
+    _ids: Any = PrivateAttr(default_factory=itertools.count)
+    _connect_lock: Any = PrivateAttr(default=None)
+    _failed_at: float = PrivateAttr(default=0.0)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the coordinator is connected"""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _connect(self) -> bool:
+        if self.connected:
+            return True
+        if time.monotonic() - self._failed_at < self.reconnect_delay:
+            return False
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self.connected:
+                return True
+
+            try:
+                self._reader, self._writer = await _open_connection(self.address)
+            except OSError as exc:
+                self._failed_at = time.monotonic()
+                logger.warning(
+                    f"Failed to connect to ratelimit coordinator at {self.address}, "
+                    f"using local ratelimits: {exc}"
+                )
+                return False
+
+            self._reader_task = asyncio.create_task(self._read_task(self._reader))
+            logger.info(f"Connected to ratelimit coordinator at {self.address}")
+
+        return True
+
+    async def _read_task(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                reply = JSON(line)
+                future = self._pending.pop(reply["id"], None)
+
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            logger.warning("Lost connection to ratelimit coordinator")
+
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = None
+
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Coordinator disconnected"))
+            self._pending.clear()
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if self.connected:
+            self._writer.write(_encode(message))
+
+    async def _call(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        message["id"] = id = next(self._ids)
+        future = self._pending[id] = asyncio.get_running_loop().create_future()
+
+        try:
+            self._send(message)
+            return await future
+        except asyncio.CancelledError:
+            # The coordinator may have answered already,
+            # it releases anything granted to this call
+            self._send({"op": "cancel", "id": id})
+            raise
+        finally:
+            self._pending.pop(id, None)
+
+    @asynccontextmanager
+    async def acquire(self, bucket: str, /) -> AsyncIterator[None]:
+        reply = None
+
+        if await self._connect():
+            try:
+                reply = await self._call({"op": "acquire", "bucket": bucket})
+            except ConnectionError:
+                pass
+
+        if reply is None:
+            async with super().acquire(bucket):
+                yield
+            return
+
+        if bucket_hash := reply.get("hash"):
+            self.route_buckets.setdefault(_route_key(bucket), bucket_hash)
+
+        self.current_requests += 1
+
+        try:
+            yield
+        finally:
+            self._send({"op": "release", "id": reply["id"]})
+
+    async def throttle(self, route: Any, /) -> None:
+        if self.connected:
+            try:
+                await self._call({"op": "throttle", "template": route.template})
+                return
+            except ConnectionError:
+                pass
+
+        await super().throttle(route)
+
+    def learn_bucket(self, route: Any, bucket_hash: str, /) -> str:
+        if self.route_buckets.get(route.key) != bucket_hash:
+            self._send({"op": "learn", "route": route.key, "hash": bucket_hash})
+
+        return super().learn_bucket(route, bucket_hash)
+
+    def add_bucket(self, bucket: str, data: dict, /) -> None:
+        if self.connected:
+            self._send({"op": "update", "bucket": bucket, "data": data})
+        else:
+            super().add_bucket(bucket, data)
+
+    def record_response(self, route: Any, status: int, headers: Any, /) -> None:
+        # Kept locally as well, so stats reflect this process
+        super().record_response(route, status, headers)
+
+        if self._invalid.is_invalid(status, headers):
+            self._send(
+                {
+                    "op": "response",
+                    "status": status,
+                    "scope": headers.get("X-RateLimit-Scope"),
+                }
+            )
+
+    def global_lock_set(self, released_at: int, /) -> None:
+        if self.connected:
+            self._send({"op": "global_lock", "retry_after": released_at})
+        else:
+            super().global_lock_set(released_at)
+
+    async def close(self) -> None:
+        """|coro|
+
+        Disconnects from the coordinator
+        """
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Shares acord HTTP ratelimits between processes on this host"
+    )
+    parser.add_argument("--path", help="Unix socket to listen on")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on")
+    parser.add_argument(
+        "--port", type=int, help="Port to listen on, instead of a socket"
+    )
+    args = parser.parse_args()
+
+    if args.port is not None:
+        address = (args.host, args.port)
+    else:
+        address = args.path or DEFAULT_ADDRESS
+
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        asyncio.run(RatelimitCoordinator(address).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
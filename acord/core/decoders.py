@@ -1,35 +1,147 @@
 import zlib
 import json
+from typing import Any, Callable, Optional, Union
+
+from . import etf
 
 ZLIB_SUFFIX = b"\x00\x00\xff\xff"
-INFLATOR = zlib.decompressobj()
 
 
-def decompressResponse(msg):
-    BUFFER = bytearray()
+def _stdlib_dumps(obj: Any, *, default: Callable = None, **kwds) -> str:
+    return json.dumps(obj, default=default, **kwds)
 
-    if type(msg) is bytes:
-        BUFFER.extend(msg)
 
-        if len(msg) < 4 or msg[-4:] != b"\x00\x00\xff\xff":
-            return
-        msg = INFLATOR.decompress(BUFFER)
-        msg = msg.decode("utf-8")
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+
+    def _loads(msg: Union[str, bytes]) -> Any:
+        return orjson.loads(msg)
+
+    def _dumps(obj: Any, *, default: Callable = None, **kwds) -> str:
+        if set(kwds) - {"indent", "sort_keys"} or kwds.get("indent") not in (None, 2):
+            # Options orjson doesn't support, keep the output the same as json
+            return _stdlib_dumps(obj, default=default, **kwds)
+
+        option = orjson.OPT_NON_STR_KEYS
+
+        if kwds.get("indent") == 2:
+            option |= orjson.OPT_INDENT_2
+        if kwds.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+
+        return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+
+except ImportError:
+    try:
+        import ujson
+
+        JSON_BACKEND = "ujson"
+
+        def _loads(msg: Union[str, bytes]) -> Any:
+            return ujson.loads(msg)
+
+        def _dumps(obj: Any, *, default: Callable = None, **kwds) -> str:
+            if set(kwds) - {"indent", "sort_keys"}:
+                # Options ujson doesn't support, keep the output the same as json
+                return _stdlib_dumps(obj, default=default, **kwds)
+
+            if default is not None:
+                kwds["default"] = default
+            return ujson.dumps(obj, **kwds)
+
+    except ImportError:
+        JSON_BACKEND = "json"
+
+        def _loads(msg: Union[str, bytes]) -> Any:
+            return json.loads(msg)
+
+        _dumps = _stdlib_dumps
+
+
+class ZlibStreamInflator:
+    """Decompression context for a single ``zlib-stream`` gateway connection.
+
+    Discord shares one zlib context across every message sent over a connection,
+    so each shard must own its own inflator.
+    Frames which arrive in fragments are buffered until the zlib suffix is received.
+
+    .. note::
+        The inflator should be reset whenever a new connection is made,
+        byte counters are kept across resets.
+
+    Attributes
+    ----------
+    compressed_bytes: :class:`int`
+        Total number of compressed bytes received
+    decompressed_bytes: :class:`int`
+        Total number of bytes produced after decompression
+    """
+
+    __slots__ = ("_inflator", "_buffer", "compressed_bytes", "decompressed_bytes")
+
+    def __init__(self) -> None:
+        self._inflator = zlib.decompressobj()
+        self._buffer = bytearray()
+
+        self.compressed_bytes = 0
+        self.decompressed_bytes = 0
+
+    def reset(self) -> None:
+        """Discards the current zlib context and any buffered fragments"""
+        self._inflator = zlib.decompressobj()
+        self._buffer.clear()
+
+    def feed(self, msg: bytes) -> Optional[bytes]:
+        """Feeds a frame into the inflator,
+        returns the decompressed message or ``None`` if the frame is incomplete.
+
+        Parameters
+        ----------
+        msg: :class:`bytes`
+            Frame received from the gateway
+        """
+        self._buffer.extend(msg)
+        self.compressed_bytes += len(msg)
+
+        if len(self._buffer) < 4 or self._buffer[-4:] != ZLIB_SUFFIX:
+            return None
+
+        data = self._inflator.decompress(self._buffer)
+        self._buffer.clear()
+
+        self.decompressed_bytes += len(data)
+
+        return data
+
+    @property
+    def saved_bytes(self) -> int:
+        """Number of bytes saved by compression"""
+        return self.decompressed_bytes - self.compressed_bytes
+
+
+def decompressResponse(msg, inflator: ZlibStreamInflator):
+    if type(msg) is bytes:
+        msg = inflator.feed(msg)
 
     return msg
 
 
-def decodeResponse(data) -> dict:
-    if type(data) is bytes:
+def decodeResponse(
+    data: Union[str, bytes], inflator: ZlibStreamInflator = None
+) -> dict:
+    if type(data) is bytes and inflator is not None:
         try:
-            data = decompressResponse(data)
+            data = decompressResponse(data, inflator)
         except Exception:
             data = None
 
     if not data:
         return {}
 
-    if not data.startswith("{"):
+    if data[:1] == b"\x83":
+        # ETF version byte
         data = ETF(data)
     else:
         data = JSON(data)
@@ -37,9 +149,25 @@ def decodeResponse(data) -> dict:
     return data
 
 
-def ETF(msg):
-    raise NotImplementedError()
+def ETF(msg: bytes) -> Any:
+    """Decodes an ETF encoded message,
+    snowflakes are decoded directly to :class:`int`.
+    """
+    return etf.unpack(msg)
+
+
+def JSON(msg: Union[str, bytes]) -> Any:
+    """Decodes a JSON document using the selected backend,
+    bytes are decoded directly without an intermediate ``str``.
+    """
+    return _loads(msg)
+
+
+def encodeJSON(obj: Any, **kwds) -> str:
+    """Encodes an object to JSON using the selected backend"""
+    return _dumps(obj, **kwds)
 
 
-def JSON(msg):
-    return json.loads(msg)
+def encodeETF(obj: Any) -> bytes:
+    """Encodes an object to ETF"""
+    return etf.pack(obj)
@@ -0,0 +1,324 @@
+# Erlang External Term Format, used by the gateway when ETF is selected
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, Callable, Dict, Tuple
+import struct
+import zlib
+
+FORMAT_VERSION = 131
+
+NEW_FLOAT_EXT = 70
+BIT_BINARY_EXT = 77
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+ATOMS = {"nil": None, "true": True, "false": False}
+
+_u16 = struct.Struct(">H").unpack_from
+_u32 = struct.Struct(">I").unpack_from
+_i32 = struct.Struct(">i").unpack_from
+_f64 = struct.Struct(">d").unpack_from
+
+
+class ETFError(ValueError):
+    """Raised when a term cannot be encoded or decoded"""
+
+
+def _atom(name: str) -> Any:
+    return ATOMS.get(name, name)
+
+
+def _decode_term(data: bytes, offset: int) -> Tuple[Any, int]:
+    tag = data[offset]
+    offset += 1
+
+    try:
+        handler = _DECODERS[tag]
+    except KeyError:
+        raise ETFError(f"Unknown ETF tag {tag}") from None
+
+    return handler(data, offset)
+
+
+def _small_integer(data, offset):
+    return data[offset], offset + 1
+
+
+def _integer(data, offset):
+    return _i32(data, offset)[0], offset + 4
+
+
+def _new_float(data, offset):
+    return _f64(data, offset)[0], offset + 8
+
+
+def _float(data, offset):
+    return float(data[offset : offset + 31].split(b"\x00", 1)[0]), offset + 31
+
+
+def _atom_ext(data, offset):
+    length = _u16(data, offset)[0]
+    offset += 2
+    return _atom(data[offset : offset + length].decode("latin-1")), offset + length
+
+
+def _small_atom_ext(data, offset):
+    length = data[offset]
+    offset += 1
+    return _atom(data[offset : offset + length].decode("latin-1")), offset + length
+
+
+def _atom_utf8(data, offset):
+    length = _u16(data, offset)[0]
+    offset += 2
+    return _atom(data[offset : offset + length].decode("utf-8")), offset + length
+
+
+def _small_atom_utf8(data, offset):
+    length = data[offset]
+    offset += 1
+    return _atom(data[offset : offset + length].decode("utf-8")), offset + length
+
+
+def _tuple(data, offset, arity):
+    items = []
+    for _ in range(arity):
+        item, offset = _decode_term(data, offset)
+        items.append(item)
+    return tuple(items), offset
+
+
+def _small_tuple(data, offset):
+    return _tuple(data, offset + 1, data[offset])
+
+
+def _large_tuple(data, offset):
+    return _tuple(data, offset + 4, _u32(data, offset)[0])
+
+
+def _nil(data, offset):
+    return [], offset
+
+
+def _string(data, offset):
+    # Erlang strings are lists of bytes, not text
+    length = _u16(data, offset)[0]
+    offset += 2
+    return list(data[offset : offset + length]), offset + length
+
+
+def _list(data, offset):
+    length = _u32(data, offset)[0]
+    offset += 4
+    items = []
+
+    for _ in range(length):
+        item, offset = _decode_term(data, offset)
+        items.append(item)
+
+    # Proper lists end with NIL_EXT
+    tail, offset = _decode_term(data, offset)
+    if tail != []:
+        items.append(tail)
+
+    return items, offset
+
+
+def _binary(data, offset):
+    length = _u32(data, offset)[0]
+    offset += 4
+    return data[offset : offset + length].decode("utf-8"), offset + length
+
+
+def _bit_binary(data, offset):
+    length = _u32(data, offset)[0]
+    offset += 5
+    return data[offset : offset + length], offset + length
+
+
+def _big(data, offset, length):
+    sign = data[offset]
+    offset += 1
+    value = int.from_bytes(data[offset : offset + length], "little")
+    return (-value if sign else value), offset + length
+
+
+def _small_big(data, offset):
+    return _big(data, offset + 1, data[offset])
+
+
+def _large_big(data, offset):
+    return _big(data, offset + 4, _u32(data, offset)[0])
+
+
+def _map(data, offset):
+    arity = _u32(data, offset)[0]
+    offset += 4
+    mapping = {}
+
+    for _ in range(arity):
+        key, offset = _decode_term(data, offset)
+        value, offset = _decode_term(data, offset)
+        mapping[key] = value
+
+    return mapping, offset
+
+
+def _compressed(data, offset):
+    size = _u32(data, offset)[0]
+    inflated = zlib.decompress(data[offset + 4 :])
+
+    if len(inflated) != size:
+        raise ETFError("Compressed term size does not match")
+
+    term, _ = _decode_term(inflated, 0)
+    return term, len(data)
+
+
+_DECODERS: Dict[int, Callable[[bytes, int], Tuple[Any, int]]] = {
+    NEW_FLOAT_EXT: _new_float,
+    BIT_BINARY_EXT: _bit_binary,
+    COMPRESSED: _compressed,
+    SMALL_INTEGER_EXT: _small_integer,
+    INTEGER_EXT: _integer,
+    FLOAT_EXT: _float,
+    ATOM_EXT: _atom_ext,
+    SMALL_TUPLE_EXT: _small_tuple,
+    LARGE_TUPLE_EXT: _large_tuple,
+    NIL_EXT: _nil,
+    STRING_EXT: _string,
+    LIST_EXT: _list,
+    BINARY_EXT: _binary,
+    SMALL_BIG_EXT: _small_big,
+    LARGE_BIG_EXT: _large_big,
+    SMALL_ATOM_EXT: _small_atom_ext,
+    MAP_EXT: _map,
+    ATOM_UTF8_EXT: _atom_utf8,
+    SMALL_ATOM_UTF8_EXT: _small_atom_utf8,
+}
+
+
+def unpack(data: bytes) -> Any:
+    """Decodes an ETF encoded term.
+
+    Binaries are decoded to :class:`str`,
+    the atoms ``nil``, ``true`` and ``false`` are converted to their python equivalents
+    and snowflakes are decoded directly to :class:`int`.
+
+    Parameters
+    ----------
+    data: :class:`bytes`
+        Data to decode, must start with the version byte
+    """
+    if not data or data[0] != FORMAT_VERSION:
+        raise ETFError("Data is not ETF encoded")
+
+    term, _ = _decode_term(data, 1)
+    return term
+
+
+# Encoding
+
+
+def _encode_atom(name: str, buffer: bytearray) -> None:
+    encoded = name.encode("utf-8")
+    buffer.append(SMALL_ATOM_UTF8_EXT)
+    buffer.append(len(encoded))
+    buffer.extend(encoded)
+
+
+def _encode_term(obj: Any, buffer: bytearray) -> None:
+    if isinstance(obj, Enum):
+        obj = obj.value
+
+    if obj is None:
+        _encode_atom("nil", buffer)
+    elif obj is True:
+        _encode_atom("true", buffer)
+    elif obj is False:
+        _encode_atom("false", buffer)
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            buffer.append(SMALL_INTEGER_EXT)
+            buffer.append(obj)
+        elif -(2**31) <= obj < 2**31:
+            buffer.append(INTEGER_EXT)
+            buffer.extend(struct.pack(">i", obj))
+        else:
+            value = abs(obj)
+            length = (value.bit_length() + 7) // 8
+
+            if length > 255:
+                buffer.append(LARGE_BIG_EXT)
+                buffer.extend(struct.pack(">I", length))
+            else:
+                buffer.append(SMALL_BIG_EXT)
+                buffer.append(length)
+
+            buffer.append(1 if obj < 0 else 0)
+            buffer.extend(value.to_bytes(length, "little"))
+    elif isinstance(obj, float):
+        buffer.append(NEW_FLOAT_EXT)
+        buffer.extend(struct.pack(">d", obj))
+    elif isinstance(obj, str):
+        encoded = obj.encode("utf-8")
+        buffer.append(BINARY_EXT)
+        buffer.extend(struct.pack(">I", len(encoded)))
+        buffer.extend(encoded)
+    elif isinstance(obj, (bytes, bytearray)):
+        buffer.append(BINARY_EXT)
+        buffer.extend(struct.pack(">I", len(obj)))
+        buffer.extend(obj)
+    elif isinstance(obj, dict):
+        buffer.append(MAP_EXT)
+        buffer.extend(struct.pack(">I", len(obj)))
+
+        for key, value in obj.items():
+            _encode_term(key, buffer)
+            _encode_term(value, buffer)
+    elif isinstance(obj, (list, tuple, set)):
+        # Discord expects arrays, so tuples are sent as lists
+        if not obj:
+            buffer.append(NIL_EXT)
+            return
+
+        buffer.append(LIST_EXT)
+        buffer.extend(struct.pack(">I", len(obj)))
+
+        for item in obj:
+            _encode_term(item, buffer)
+
+        buffer.append(NIL_EXT)
+    else:
+        raise ETFError(f"Cannot encode object of type {type(obj).__name__}")
+
+
+def pack(obj: Any) -> bytes:
+    """Encodes an object to ETF.
+
+    Parameters
+    ----------
+    obj: Any
+        Object to encode,
+        may only contain dicts, lists, tuples, strings, numbers, booleans and ``None``
+    """
+    buffer = bytearray((FORMAT_VERSION,))
+    _encode_term(obj, buffer)
+
+    return bytes(buffer)
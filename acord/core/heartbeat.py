@@ -1,16 +1,30 @@
 # Basic heartbeat controller
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from threading import Thread
+from collections import deque
+from typing import Deque, Optional
 import asyncio
+import random
 import time
 from .signals import gateway  # type: ignore
+from .decoders import encodeJSON
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of latencies kept by each keep alive handler
+LATENCY_HISTORY = 50
+
 
-class KeepAlive(Thread, ABC):
-    """Represents a keep alive handler.
+class KeepAlive(ABC):
+    """Represents a keep alive handler,
+    heartbeats are sent from a task on the event loop.
+
+    The first heartbeat is sent after ``interval * jitter`` seconds,
+    where jitter is a random value between 0 and 1 as required by discord.
+    If a heartbeat has not been acknowledged by the time the next one is due,
+    :meth:`KeepAlive.on_zombie` is called.
 
     .. DANGER::
         If you are not overwriting :meth:`KeepAlive.run`,
@@ -20,32 +34,68 @@ class KeepAlive(Thread, ABC):
     ----------
     _ended: :class:`bool`
         Whether heartbeating has ended
-    _interval: :class:`int`
+    _interval: :class:`float`
         Time to wait between heartbeats,
         in seconds.
+    _waiting_for_ack: :class:`bool`
+        Whether the last heartbeat is yet to be acknowledged
     """
 
     _ended: bool
-    _interval: int
+    _interval: float
+    _waiting_for_ack: bool
+    _loop: asyncio.AbstractEventLoop
+    _task: Optional[asyncio.Task] = None
 
-    def run(self):
-        """Default .run function,
-        calls :meth:`KeepAlive.send_heartbeat` every n seconds.
+    def start(self) -> asyncio.Task:
+        """Starts heartbeating, returns the created task"""
+        self._ended = False
+        self._task = self._loop.create_task(self.run())
+
+        return self._task
+
+    def end(self) -> None:
+        """Stops heartbeating"""
+        self._ended = True
+
+        task = self._task
+        self._task = None
+
+        # Zombie handlers may end their own keep alive
+        if task is not None and task is not asyncio.current_task(self._loop):
+            task.cancel()
+
+    async def run(self) -> None:
+        """|coro|
 
-        .. note::
-            Once ended,
-            ``.join`` is called within this function
+        Default .run function,
+        calls :meth:`KeepAlive.send_heartbeat` every n seconds.
         """
+        await asyncio.sleep(self._interval * random.random())
+
         while not self._ended:
-            self.send_heartbeat()
+            if self._waiting_for_ack:
+                await self.on_zombie()
+                return
+
+            await self.send_heartbeat()
+            await asyncio.sleep(self._interval)
 
-            time.sleep(self._interval)
+    async def on_zombie(self) -> None:
+        """|coro|
 
-        self.join()
+        Called when a heartbeat was not acknowledged before the next one is due,
+        by default heartbeating is stopped.
+        """
+        logger.warning("Heartbeat was not acknowledged, ending heartbeats")
+        self.end()
 
     @abstractmethod
-    def send_heartbeat(self):
-        """Sends a heartbeat"""
+    async def send_heartbeat(self):
+        """|coro|
+
+        Sends a heartbeat
+        """
 
     @abstractmethod
     def get_payload(self):
@@ -56,80 +106,91 @@ def ack(self):
         """Called when server responds with an ACK to our heartbeat"""
 
 
-class GatewayKeepAlive(KeepAlive):
-    def __init__(self, shard, interval, loop=asyncio.get_event_loop()):
-        self.sent_at = None
-        self.latency = float("inf")
-        self.shard = shard
+class _LatencyTracker:
+    sent_at: Optional[float]
+    latency: float
+    latency_history: Deque[float]
 
-        self._loop: asyncio.AbstractEventLoop = loop
-        self._ws = shard.ws
-        self._interval = interval / 1000
+    def _sent(self) -> None:
+        self.sent_at = time.perf_counter()
+        self._waiting_for_ack = True
 
-        self._ended = False
+    def ack(self) -> None:
         self._waiting_for_ack = False
 
-        super().__init__(daemon=True)
+        if self.sent_at is None:
+            return
 
-    def run(self):
-        while not self._ended:
-            self.send_heartbeat()
+        self.latency = time.perf_counter() - self.sent_at
+        self.latency_history.append(self.latency)
+
+
+class GatewayKeepAlive(_LatencyTracker, KeepAlive):
+    """Heartbeats for a gateway shard,
+    zombied connections are resumed through :meth:`Shard.resume`.
+
+    Attributes
+    ----------
+    shard: :class:`Shard`
+        Shard being kept alive
+    latency: :class:`float`
+        Latency of the last acknowledged heartbeat, in seconds
+    latency_history: Deque[:class:`float`]
+        Latencies of the last 50 acknowledged heartbeats, oldest first
+    """
 
-            time.sleep(self._interval)
+    def __init__(self, shard, interval, loop=None):
+        self.sent_at = None
+        self.latency = float("inf")
+        self.latency_history = deque(maxlen=LATENCY_HISTORY)
+        self.shard = shard
 
-        self.join()
+        self._loop: asyncio.AbstractEventLoop = loop or asyncio.get_event_loop()
+        self._interval = interval / 1000
 
-    def send_heartbeat(self):
-        coro = self._ws.send_json(self.get_payload())
-        asyncio.run_coroutine_threadsafe(coro, self._loop)
+        self._ended = False
+        self._waiting_for_ack = False
 
-        self.sent_at = time.perf_counter()
-        self._waiting_for_ack = True
+    async def send_heartbeat(self):
+        await self.shard.send(self.get_payload())
+        self._sent()
 
-        logger.info(
+        logger.debug(
             f"Sent heartbeat for shard {self.shard.shard_id}, waiting {self._interval} seconds..."
         )
 
-    def get_payload(self):
-        return {"op": gateway.HEARTBEAT, "d": self.shard.sequence}
+    async def on_zombie(self):
+        logger.warning(
+            f"Heartbeat was not acknowledged for shard {self.shard.shard_id}, resuming"
+        )
+        self.end()
 
-    def ack(self):
-        d = time.perf_counter()
-        self._waiting_for_ack = False
+        await self.shard.resume(restart=True)
 
-        self.latency = d - self.sent_at
+    def get_payload(self):
+        return {"op": gateway.HEARTBEAT, "d": self.shard.sequence}
 
 
-class VoiceKeepAlive(KeepAlive):
-    def __init__(self, connection, packet, loop=asyncio.get_event_loop()) -> None:
+class VoiceKeepAlive(_LatencyTracker, KeepAlive):
+    def __init__(self, connection, packet, loop=None) -> None:
         self.integer_nonce = 0
         self.sent_at = None
         self.latency = float("inf")
+        self.latency_history = deque(maxlen=LATENCY_HISTORY)
         self.connection = connection
 
-        self._loop = loop
+        self._loop = loop or asyncio.get_event_loop()
         self._interval = packet["d"]["heartbeat_interval"] / 1000
         self._ended = False
+        self._waiting_for_ack = False
         self._ws = connection._ws
 
-    def send_heartbeat(self):
-        coro = self._ws.send_json(self.get_payload())
-        asyncio.run_coroutine_threadsafe(coro, self._loop)
-
-        self.sent_at = time.perf_counter()
-        self._waiting_for_ack = True
-
-        logger.info(f"Sent Heartbeat to voice channel, conn_id={self.connection}")
+    async def send_heartbeat(self):
+        await self._ws.send_json(self.get_payload(), dumps=encodeJSON)
+        self._sent()
 
-    def ack(self):
-        d = time.perf_counter()
-        self._waiting_for_ack = False
-
-        self.latency = d - self.sent_at
+        logger.debug(f"Sent Heartbeat to voice channel, conn_id={self.connection}")
 
     def get_payload(self):
         self.integer_nonce += 1
         return {"op": 3, "d": self.integer_nonce}
-
-    def end(self):
-        self._ended = True
@@ -58,6 +58,9 @@ class HTTPClient(object):
         Loop to be used
     ratelimiter: :class:`HTTPRatelimiter`
         A ratelimiter for client to use.
+    coalesce: :class:`bool`
+        Whether identical GET requests made at the same time
+        should share a single request, see :meth:`HTTPClient.request`.
 
     Attributes
     ----------
@@ -75,6 +78,10 @@ class HTTPClient(object):
         .. note::
             This user agent is unique to this class,
             different HTTPClients may have different user agents.
+    coalesce: :class:`bool`
+        Whether identical GET requests are coalesced
+    coalesced_requests: :class:`int`
+        Number of requests which were served by another identical request
     """
 
     def __init__(
@@ -87,12 +94,18 @@ def __init__(
         ratelimiter: HTTPRatelimiter = DefaultHTTPRatelimiter(
             max_requests=(10000, (60 * 10))
         ),
+        coalesce: bool = True,
     ) -> None:
         self.client = client
         self.token = token
         self.loop = loop
         self.connector = connecter
         self.ratelimiter = ratelimiter
+        self.coalesce = coalesce
+        self.coalesced_requests = 0
+
+        # In flight GET requests, mapped by URL
+        self._inflight: typing.Dict[str, asyncio.Task] = {}
 
         user_agent = "ACord - https://github.com/Mecha-Karen/ACord {0} Python{1[0]}.{1[1]} aiohttp/{2}"
         self.user_agent = user_agent.format(
@@ -168,6 +181,12 @@ async def request(
 
         Sends a request to the desired route.
 
+        GET requests to the same URL made whilst one is in flight
+        share its response instead of being sent again,
+        unless they pass any additional arguments.
+        The body of shared responses has already been read,
+        so methods such as :meth:`~aiohttp.ClientResponse.json` can be called by each caller.
+
         Parameters
         ----------
         route: :class:`Route`
@@ -179,16 +198,53 @@ async def request(
         **kwds:
             Additional kwargs to be passed through :meth:`~aiohttp.ClientSession.request`
         """
-        if self.ratelimiter.global_lock:
-            await self.ratelimiter.hold_global_lock()
-
-        if self.ratelimiter.bucket_is_limited(route.bucket):
-            await self.ratelimiter.hold_bucket(route.bucket)
-
-        headers = kwds.pop("headers", None) or headers
-
-        if data is not None:
-            kwds["data"] = data
+        if (
+            self.coalesce
+            and route.method == "GET"
+            and data is None
+            and not headers
+            and not kwds
+        ):
+            return await self._coalesced_request(route)
+
+        return await self._request(route, data, headers, **kwds)
+
+    async def _coalesced_request(self, route: abc.Route) -> aiohttp.ClientResponse:
+        key = str(route.url)
+        task = self._inflight.get(key)
+
+        if task is None:
+            # Runs as its own task, so a caller being cancelled doesn't affect the rest
+            task = asyncio.get_running_loop().create_task(self._read_request(route))
+            self._inflight[key] = task
+
+            def done(task: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if not task.cancelled():
+                    # Retrieved so it isn't logged if every caller was cancelled
+                    task.exception()
+
+            task.add_done_callback(done)
+        else:
+            self.coalesced_requests += 1
+
+        return await asyncio.shield(task)
+
+    async def _read_request(self, route: abc.Route) -> aiohttp.ClientResponse:
+        resp = await self._request(route)
+
+        # Read once for every caller sharing the response
+        await resp.read()
+        return resp
+
+    async def _request(
+        self,
+        route: abc.Route,
+        data: typing.Union[dict, FormData, typing.Any] = None,
+        headers: dict = dict(),
+        **kwds,
+    ) -> aiohttp.ClientResponse:
+        headers = dict(kwds.pop("headers", None) or headers)
 
         headers["Authorization"] = "Bot " + self.token
         headers["User-Agent"] = self.user_agent
@@ -198,38 +254,70 @@ async def request(
 
         kwargs.update(kwds)
 
-        resp = await self._session.request(method=route.method, url=route.url, **kwargs)
-        logger.info(f"Request made at {route.path:>20} returned {resp.status}")
+        ratelimiter = self.ratelimiter
 
-        ratelimit_headers = parse_ratelimit_headers(resp.headers)
+        while True:
+            bucket = ratelimiter.resolve_bucket(route)
 
-        if ratelimit_headers:
-            self.ratelimiter.add_bucket(route.bucket, ratelimit_headers)
+            # Requests wait in line for their bucket,
+            # instead of being sent and retried once ratelimited
+            async with ratelimiter.acquire(bucket):
+                if ratelimiter.resolve_bucket(route) != bucket:
+                    # Discord sent the real bucket whilst waiting, queue there instead
+                    continue
 
-        if 200 <= resp.status < 300:
-            return resp
+                await ratelimiter.throttle(route)
 
-        respData = decodeResponse(await resp.read())
+                if data is not None:
+                    kwargs["data"] = data
 
-        if 500 <= resp.status < 600:
-            raise DiscordError(str(respData))
+                resp = await self._session.request(
+                    method=route.method, url=route.url, **kwargs
+                )
+                logger.info(f"Request made at {route.path:>20} returned {resp.status}")
+
+                ratelimiter.record_response(route, resp.status, resp.headers)
+
+                ratelimit_headers = parse_ratelimit_headers(resp.headers)
+
+                if ratelimit_headers:
+                    if bucket_hash := ratelimit_headers.get("bucket"):
+                        bucket = ratelimiter.learn_bucket(route, bucket_hash)
+
+                    ratelimiter.add_bucket(bucket, ratelimit_headers)
+
+                if 200 <= resp.status < 300:
+                    return resp
 
-        if resp.status == 429:
-            if respData.get("global", False):
-                self.ratelimiter.global_lock_set(respData["retry_after"])
-                raise HTTPException(429, "HTTP API is being ratelimited globally")
+                body = await resp.read()
 
-            else:
-                await asyncio.sleep(respData["retry_after"])
+                try:
+                    respData = decodeResponse(body)
+                except ValueError:
+                    # Not sent by discord, such as a proxy's error page
+                    respData = {"message": body.decode("utf-8", "replace")}
 
-            try:
-                return await self.request(route, data, headers, **kwds)
-            except RuntimeError:
-                # Form Data has been processed already
+                if resp.status != 429:
+                    break
+
+                if "retry_after" not in respData:
+                    raise HTTPException(429, respData.get("message"))
+
+                if respData.get("global", False):
+                    ratelimiter.global_lock_set(respData["retry_after"])
+                    raise HTTPException(429, "HTTP API is being ratelimited globally")
+
+            logger.info(f"Request made at {route.path:>20} was ratelimited, retrying")
+            await asyncio.sleep(respData["retry_after"])
+
+            if isinstance(data, FormData):
+                # Form Data can only be processed once
                 n_data = FormData()
                 n_data._fields = data._fields
+                data = n_data
 
-                return await self.request(route, n_data, headers, **kwds)
+        if 500 <= resp.status < 600:
+            raise DiscordError(str(respData))
 
         if resp.status == 403:
             raise Forbidden(str(respData), payload=respData, status_code=403)
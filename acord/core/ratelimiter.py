@@ -1,16 +1,19 @@
 # Basic ratelimiter for acord
 from __future__ import annotations
 
-from typing import Any, List, Tuple
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
 from abc import ABC, abstractmethod
-from pydantic import BaseModel
-from asyncio import get_event_loop, sleep
+from collections import deque
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, PrivateAttr
+from asyncio import CancelledError, Lock, get_running_loop, sleep
+from weakref import WeakValueDictionary
 import logging
+import time
 
 
 logger = logging.getLogger(__name__)
-loop = get_event_loop()
 
 
 def parse_ratelimit_headers(headers: dict) -> dict:
@@ -36,6 +39,314 @@ def parse_ratelimit_headers(headers: dict) -> dict:
     return d
 
 
+class Bucket:
+    """Ratelimit state of a single bucket.
+
+    Requests take one of the requests remaining before they are sent,
+    once none remain requests wait in a FIFO queue until the bucket resets.
+    Until discord has sent limits for a bucket,
+    its requests are sent one at a time.
+
+    Attributes
+    ----------
+    limit: Optional[:class:`int`]
+        Requests allowed per reset, ``None`` if the bucket is not limited
+    remaining: :class:`int`
+        Requests remaining until the bucket resets
+    reset_at: :class:`float`
+        :func:`time.monotonic` time the bucket resets at, 0 if unknown
+    """
+
+    __slots__ = (
+        "limit",
+        "remaining",
+        "reset_at",
+        "_known",
+        "_reserved",
+        "_waiters",
+        "_timer",
+    )
+
+    def __init__(self) -> None:
+        self.limit: Optional[int] = 1
+        self.remaining = 1
+        self.reset_at = 0.0
+        self._known = False
+
+        # Requests woken from the queue which have not taken a request yet
+        self._reserved = 0
+        self._waiters: Deque[Any] = deque()
+        self._timer: Any = None
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting in the queue"""
+        return len(self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        """Whether nothing is using the bucket,
+        so it can be dropped without losing any state
+        """
+        return (
+            not self._waiters
+            and not self._reserved
+            and (self.limit is None or self.remaining >= self.limit)
+        )
+
+    def available(self) -> bool:
+        """Whether a request can be sent now"""
+        if self.reset_at and time.monotonic() >= self.reset_at:
+            self.remaining = self.limit or 1
+            self.reset_at = 0.0
+
+        return self.limit is None or self.remaining - self._reserved > 0
+
+    def take(self) -> None:
+        """Takes a request from the bucket, called when a request is sent"""
+        if self.limit is not None:
+            self.remaining -= 1
+
+    def update(self, limit: float, remaining: float, reset_after: float) -> None:
+        """Updates limits from ratelimit headers
+
+        Parameters
+        ----------
+        limit: :class:`float`
+            Value of ``X-RateLimit-Limit``
+        remaining: :class:`float`
+            Value of ``X-RateLimit-Remaining``
+        reset_after: :class:`float`
+            Value of ``X-RateLimit-Reset-After``
+        """
+        reset_at = time.monotonic() + reset_after
+
+        if self.reset_at or self._known:
+            # Requests still in flight may not be counted by discord yet,
+            # the count is only raised when the window resets
+            remaining = min(self.remaining, remaining)
+            reset_at = max(self.reset_at, reset_at)
+
+        self.limit = int(limit)
+        self.remaining = int(remaining)
+        self.reset_at = reset_at
+        self._known = True
+
+        self._wake()
+
+    def release(self) -> None:
+        """Called once a response has been received"""
+        if not self._known and self.limit is not None:
+            # Limits are still unknown, let the next request discover them
+            self.remaining = min(self.remaining + 1, self.limit)
+
+        self._wake()
+
+    async def acquire(self) -> None:
+        """Waits until a request can be sent,
+        requests are let through in the order they arrived.
+        """
+        if not self._waiters and self.available():
+            return
+
+        future = get_running_loop().create_future()
+        self._waiters.append(future)
+        self._schedule()
+
+        try:
+            await future
+        except CancelledError:
+            if future.done() and not future.cancelled():
+                # Woken just before being cancelled, pass it on
+                self._reserved -= 1
+                self._wake()
+            else:
+                self._waiters.remove(future)
+            raise
+
+        self._reserved -= 1
+
+    def _wake(self) -> None:
+        while self._waiters and self.available():
+            future = self._waiters.popleft()
+
+            if not future.done():
+                self._reserved += 1
+                future.set_result(None)
+
+        self._schedule()
+
+    def _schedule(self) -> None:
+        # Wakes waiters once the bucket resets
+        if not self._waiters or self._timer is not None or not self.reset_at:
+            return
+
+        delay = max(0.0, self.reset_at - time.monotonic())
+        self._timer = get_running_loop().call_later(delay, self._on_reset)
+
+    def _on_reset(self) -> None:
+        self._timer = None
+        self._wake()
+
+    def __repr__(self) -> str:
+        return (
+            f"Bucket(limit={self.limit}, remaining={self.remaining}, "
+            f"waiting={self.waiting})"
+        )
+
+
+class TokenBucket:
+    """Allows ``rate`` requests every ``per`` seconds,
+    requests beyond that wait their turn in the order they arrived.
+
+    Parameters
+    ----------
+    rate: :class:`int`
+        Requests allowed per ``per`` seconds, also the largest burst allowed
+    per: :class:`float`
+        Seconds ``rate`` requests are spread over
+
+    Attributes
+    ----------
+    waits: :class:`int`
+        Number of requests which had to wait for a token
+    """
+
+    __slots__ = ("rate", "per", "tokens", "updated", "waits", "_lock")
+
+    def __init__(self, rate: int, per: float) -> None:
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.waits = 0
+
+        self._lock: Optional[Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.rate), self.tokens + (now - self.updated) * self.rate / self.per
+        )
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it"""
+        self._refill()
+
+        if self.tokens >= 1 and (self._lock is None or not self._lock.locked()):
+            self.tokens -= 1
+            return
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        self.waits += 1
+
+        async with self._lock:
+            while True:
+                self._refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await sleep((1 - self.tokens) * self.per / self.rate)
+
+
+class InvalidRequestTracker:
+    """Rolling count of invalid requests,
+    discord temporarily bans clients which make too many.
+
+    Responses with a 401, 403 or 429 status are invalid,
+    except 429s for shared ratelimits.
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        Invalid requests allowed per ``window``
+    window: :class:`float`
+        Seconds invalid requests are counted over
+    slow_after: :class:`float`
+        Fraction of ``limit`` after which requests are slowed down
+
+    Attributes
+    ----------
+    total: :class:`int`
+        Invalid requests made since the tracker was created
+    """
+
+    __slots__ = ("limit", "window", "slow_after", "total", "_times")
+
+    def __init__(self, limit: int, window: float, slow_after: float = 0.8) -> None:
+        self.limit = limit
+        self.window = window
+        self.slow_after = slow_after
+        self.total = 0
+
+        self._times: Deque[float] = deque()
+
+    @staticmethod
+    def is_invalid(status: int, headers: Any = None) -> bool:
+        """Whether a response counts as an invalid request
+
+        Parameters
+        ----------
+        status: :class:`int`
+            Status code of the response
+        headers: Mapping[:class:`str`, :class:`str`]
+            Headers of the response
+        """
+        if status == 429:
+            return (headers or {}).get("X-RateLimit-Scope") != "shared"
+        return status in (401, 403)
+
+    def record(self) -> None:
+        """Records an invalid request"""
+        self._times.append(time.monotonic())
+        self.total += 1
+
+        if len(self._times) == int(self.limit * self.slow_after):
+            logger.warning(
+                f"{len(self._times)} invalid requests made in the last "
+                f"{self.window:.0f} seconds, slowing down requests"
+            )
+
+    @property
+    def count(self) -> int:
+        """Invalid requests made within the current window"""
+        cutoff = time.monotonic() - self.window
+
+        while self._times and self._times[0] <= cutoff:
+            self._times.popleft()
+
+        return len(self._times)
+
+    @property
+    def usage(self) -> float:
+        """Fraction of the budget used within the current window"""
+        return self.count / self.limit
+
+    def delay(self) -> float:
+        """Seconds to wait before the next request,
+        ``0`` until :attr:`InvalidRequestTracker.slow_after` of the budget is used.
+
+        Past that point requests are spaced so that,
+        even if all of them were invalid,
+        the remaining budget would last until the window ends.
+        """
+        used = self.count
+
+        if used < self.limit * self.slow_after:
+            return 0.0
+
+        if used >= self.limit:
+            # Wait for the oldest to leave the window
+            return max(0.0, self._times[0] + self.window - time.monotonic())
+
+        return self.window / (self.limit - used)
+
+
 class HTTPRatelimiter(ABC, BaseModel):
     """An ABC for building ratelimiters.
 
@@ -66,10 +377,126 @@ class MyRatelimter(Ratelimiter):
     """ Whether the client is being ratelimited globally """
     locked_until: int = None
     """ Time in seconds till the ratelimit is over, global only """
+    route_buckets: Dict[str, str] = {}
+    """ Mapping of route keys to the bucket hashes discord has sent for them """
+
+    _locks: Any = PrivateAttr(default_factory=WeakValueDictionary)
 
     def __init__(self, **kwds) -> None:
         super().__init__(**kwds)
 
+    def resolve_bucket(self, route: Any, /) -> str:
+        """Returns the bucket a route belongs to,
+        using the bucket hash discord sent for the route if there is one.
+
+        Routes which share a hash and major parameters share a bucket,
+        routes which have not been requested yet use :attr:`Route.bucket`.
+
+        Parameters
+        ----------
+        route: :class:`Route`
+            Route being requested
+        """
+        bucket_hash = self.route_buckets.get(route.key)
+
+        if bucket_hash is None:
+            return route.bucket
+        return f"{bucket_hash}:{route.major}"
+
+    def learn_bucket(self, route: Any, bucket_hash: str, /) -> str:
+        """Records the bucket hash discord sent for a route,
+        returns the bucket the route now belongs to.
+
+        Parameters
+        ----------
+        route: :class:`Route`
+            Route which was requested
+        bucket_hash: :class:`str`
+            Value of the ``X-RateLimit-Bucket`` header
+        """
+        if self.route_buckets.get(route.key) != bucket_hash:
+            logger.debug(f"Route {route.key} belongs to bucket {bucket_hash}")
+            self.route_buckets[route.key] = bucket_hash
+
+        return f"{bucket_hash}:{route.major}"
+
+    def bucket_lock(self, bucket: str, /) -> Lock:
+        """Returns a lock which requests to a bucket should hold,
+        so requests to the same bucket are sent one at a time, in order.
+        Locks are dropped once no request is using them.
+
+        Parameters
+        ----------
+        bucket: :class:`str`
+            Bucket being requested
+        """
+        lock = self._locks.get(bucket)
+
+        if lock is None:
+            lock = self._locks[bucket] = Lock()
+        return lock
+
+    @asynccontextmanager
+    async def acquire(self, bucket: str, /) -> AsyncIterator[None]:
+        """Waits until a request can be sent to a bucket,
+        the request should be sent and its headers added before exiting.
+
+        By default requests to a bucket are sent one at a time,
+        waiting with :meth:`HTTPRatelimiter.hold_bucket` when it is limited.
+
+        .. rubric:: Example
+
+        .. code-block:: py
+
+            async with ratelimiter.acquire(bucket):
+                response = await send_request()
+                ratelimiter.add_bucket(bucket, parse_ratelimit_headers(response.headers))
+
+        Parameters
+        ----------
+        bucket: :class:`str`
+            Bucket being requested
+        """
+        async with self.bucket_lock(bucket):
+            if self.bucket_is_limited(bucket):
+                await self.hold_bucket(bucket)
+
+            self.increment(bucket)
+            yield
+
+    async def throttle(self, route: Any, /) -> None:
+        """Called before every request is sent,
+        after the request has been let through by its bucket.
+
+        By default this only waits for the global lock.
+
+        Parameters
+        ----------
+        route: :class:`Route`
+            Route being requested
+        """
+        if self.global_lock:
+            await self.hold_global_lock()
+
+    def record_response(self, route: Any, status: int, headers: Any, /) -> None:
+        """Called with the status of every response
+
+        Parameters
+        ----------
+        route: :class:`Route`
+            Route which was requested
+        status: :class:`int`
+            Status code of the response
+        headers: Mapping[:class:`str`, :class:`str`]
+            Headers of the response
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns counters describing the ratelimiter,
+        such as how much of the invalid request budget has been used.
+        """
+        return {}
+
     @abstractmethod
     def increment(self, bucket: str, /) -> None:
         """Increments the current number of requests,
@@ -137,18 +564,136 @@ def should_lock(self) -> bool:
 # Default implementations
 
 
+_PROMETHEUS_TYPES: Tuple[Tuple[str, str, str], ...] = (
+    ("requests", "counter", "Requests sent"),
+    ("invalid_requests", "gauge", "Invalid requests within the current window"),
+    ("invalid_requests_total", "counter", "Invalid requests sent"),
+    ("invalid_request_limit", "gauge", "Invalid requests allowed per window"),
+    ("invalid_request_usage", "gauge", "Fraction of the invalid request budget used"),
+    ("global_waits", "counter", "Requests which waited for the global limit"),
+    ("buckets", "gauge", "Buckets being tracked"),
+    ("queued", "gauge", "Requests waiting for their bucket"),
+)
+
+
 class DefaultHTTPRatelimiter(HTTPRatelimiter):
+    """Default :class:`HTTPRatelimiter`
+
+    Requests wait for their bucket, then for the global limit.
+    :attr:`HTTPRatelimiter.max_requests` is the invalid request budget,
+    once most of it has been used requests are slowed down
+    to avoid being banned by discord.
+    Use :meth:`DefaultHTTPRatelimiter.stats` to monitor it.
+    """
+
     current_requests: int = 0
+    """ Number of requests sent """
     global_lock: Any = None
+    max_buckets: int = 4096
+    """ Number of buckets to keep before idle buckets are dropped """
+    global_rate: Tuple[int, float] = (50, 1)
+    """ Requests allowed globally, in the form (num_requests, time_in_seconds),
+    interaction responses are not counted
+    """
+    slow_after: float = 0.8
+    """ Fraction of the invalid request budget after which requests are slowed down """
+
+    _global_bucket: Any = PrivateAttr(default=None)
+    _invalid: Any = PrivateAttr(default=None)
+    _global_task: Any = PrivateAttr(default=None)
+
+    def __init__(self, **kwds) -> None:
+        super().__init__(**kwds)
+
+        self._global_bucket = TokenBucket(*self.global_rate)
+        self._invalid = InvalidRequestTracker(*self.max_requests, self.slow_after)
+
+    @property
+    def invalid_requests(self) -> InvalidRequestTracker:
+        """Tracker for invalid requests"""
+        return self._invalid
+
+    async def throttle(self, route: Any, /) -> None:
+        if self.global_lock:
+            await self.hold_global_lock()
+
+        if delay := self._invalid.delay():
+            await sleep(delay)
+
+        if not route.template.lstrip("/").startswith("interactions"):
+            await self._global_bucket.acquire()
+
+    def record_response(self, route: Any, status: int, headers: Any, /) -> None:
+        if self._invalid.is_invalid(status, headers):
+            self._invalid.record()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.current_requests,
+            "invalid_requests": self._invalid.count,
+            "invalid_requests_total": self._invalid.total,
+            "invalid_request_limit": self._invalid.limit,
+            "invalid_request_usage": self._invalid.usage,
+            "global_waits": self._global_bucket.waits,
+            "buckets": len(self.cache),
+            "queued": sum(bucket.waiting for bucket in self.cache.values()),
+        }
+
+    def prometheus(self, prefix: str = "acord_http") -> str:
+        """Returns :meth:`DefaultHTTPRatelimiter.stats` in the Prometheus text format
+
+        Parameters
+        ----------
+        prefix: :class:`str`
+            Prefix for metric names
+        """
+        stats = self.stats()
+        lines = []
+
+        for name, kind, description in _PROMETHEUS_TYPES:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {stats[name]}")
+
+        return "\n".join(lines) + "\n"
+
+    @asynccontextmanager
+    async def acquire(self, bucket: str, /) -> AsyncIterator[None]:
+        _bucket = self._get_bucket(bucket)
+
+        await _bucket.acquire()
+
+        try:
+            self.increment(bucket)
+            yield
+        finally:
+            _bucket.release()
+
+    def _get_bucket(self, bucket: str) -> Bucket:
+        _bucket = self.cache.get(bucket)
+
+        if _bucket is None:
+            if len(self.cache) >= self.max_buckets:
+                for key in [k for k, b in self.cache.items() if b.idle]:
+                    del self.cache[key]
+
+            _bucket = self.cache[bucket] = Bucket()
+
+        return _bucket
 
     def increment(self, bucket: str, /) -> None:
         self.current_requests += 1
 
-        if not (bucket := self.cache.get(bucket)):
-            bucket["remaining"] -= 1
+        if (_bucket := self.cache.get(bucket)) is not None:
+            _bucket.take()
 
     def add_bucket(self, bucket: str, data: dict, /) -> None:
-        self.cache[bucket] = data
+        if "remaining" not in data or "reset" not in data:
+            return
+
+        self._get_bucket(bucket).update(
+            data.get("limit", data["remaining"] + 1), data["remaining"], data["reset"]
+        )
 
     def bucket_is_limited(self, bucket: str, /) -> bool:
         _bucket = self.cache.get(bucket)
@@ -156,28 +701,18 @@ def bucket_is_limited(self, bucket: str, /) -> bool:
         if not _bucket:
             return False
 
-        if ((bck := _bucket.get("task")) is not None) or _bucket["remaining"] <= 0:
-            if not bck:
-                task = loop.create_task(self._release_bucket_ratelimit_task(bucket))
-                _bucket["task"] = task
-
-            return True
-        return False
+        return bool(_bucket.waiting) or not _bucket.available()
 
     async def hold_bucket(self, bucket: str, /) -> None:
         _bucket = self.cache.get(bucket)
 
-        if not bucket:
-            return
-
-        task = _bucket.get("task")
-
-        if not task:
+        if not _bucket or not self.bucket_is_limited(bucket):
             return
 
         logger.info(f"Bucket {bucket:<20} has been ratelimited, waiting")
 
-        await task
+        if _bucket.reset_at:
+            await sleep(max(0.0, _bucket.reset_at - time.monotonic()))
 
     def global_lock_set(self, released_at: int, /) -> None:
         if self.global_lock is True:
@@ -186,38 +721,22 @@ def global_lock_set(self, released_at: int, /) -> None:
         self.global_lock = True
         self.locked_until = released_at
 
-        self.global_task = loop.create_task(self._def_release_global_lock_task())
+        self._global_task = get_running_loop().create_task(
+            self._release_global_lock_task()
+        )
 
     async def hold_global_lock(self) -> None:
         if not self.global_lock:
             return
         logger.info("REST Api has been ratelimited globally, waiting")
 
-        await self.global_task
+        await self._global_task
 
     def should_lock(self) -> bool:
-        if self.current_requests >= self.max_requests[0]:
-            return True
-        return False
-
-    async def _reset_requests_task(self) -> None:
-        while True:
-            await sleep(self.max_requests[1])
-
-            self.current_requests = 0
+        return self._invalid.delay() > 0
 
     async def _release_global_lock_task(self) -> None:
         await sleep(self.locked_until)
 
         self.locked_until = None
         self.global_lock = False
-
-    async def _release_bucket_ratelimit_task(self, bucket: str) -> None:
-        _bucket = self.cache.get(bucket)
-
-        if not _bucket:
-            return
-
-        await sleep(_bucket["reset"])
-        # Just in case it was popped earlier
-        self.cache.pop(bucket, None)
@@ -81,5 +81,9 @@ class VoiceError(BaseExc):
     """
 
 
+class ClusterError(BaseExc):
+    """Raised when a request to another cluster fails"""
+
+
 class CannotOverideTokenWarning(Warning):
     """Warned when cannot use provided token due to binded token present"""
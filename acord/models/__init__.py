@@ -46,6 +46,8 @@ def increment(self) -> int:
 from .sticker import Sticker
 from .attachment import Attachment
 from .member import Member, MemberPresence, MemberVoiceState
+from .indexes import NameIndex, ChannelMap
+from .member_store import MemberStore
 from .guild_sched_event import (
     GuildScheduledEvent,
     ScheduledEventUser,
@@ -89,3 +91,6 @@ def increment(self) -> int:
     WelcomeChannel,
     WelcomeScreen,
 )
+from .lazy import LazyModel
+from .trusted import construct_trusted
+from .patch import patch_model, copy_with
@@ -57,7 +57,7 @@ async def fetch_message(
         )
 
         message = Message(**(await resp.json()))
-        self.conn.client.cache.add_message(message.channel_id, message.id)
+        self.conn.client.cache.add_message(message)
 
         return message
 
@@ -17,6 +17,8 @@
     Emoji,
     Role,
     Member,
+    MemberStore,
+    ChannelMap,
     User,
     Sticker,
     VoiceRegion,
@@ -117,7 +119,7 @@ class Guild(pydantic.BaseModel, Hashable):
     banner: Optional[str]
     """ URL for the guild banner """
 
-    channels: Dict[Snowflake, Channel] = {}
+    channels: ChannelMap = pydantic.Field(default_factory=ChannelMap)
     """ All channels in the guild """
     default_message_notifications: GuildMessageNotification
     """ Default message notification """
@@ -165,8 +167,8 @@ class Guild(pydantic.BaseModel, Hashable):
     member_count: int = 0
     """ Amount of members in this guild """
 
-    members: Dict[Snowflake, Member] = {}
-    """ Mapping of all members in guild """
+    members: MemberStore = None
+    """ Mapping of all members in guild, see :class:`MemberStore` """
 
     mfa_level: MFALevel
     """required MFA level for the guild"""
@@ -209,7 +211,7 @@ class Guild(pydantic.BaseModel, Hashable):
     system_channel_id: Optional[Snowflake]
     """ the id of the channel where guild notices such as welcome messages and boost events are posted """
 
-    threads: Optional[Dict[Snowflake, Thread]] = dict()
+    threads: Optional[ChannelMap] = pydantic.Field(default_factory=ChannelMap)
     """ Mapping of threads in the guild """
 
     unavailable: Optional[bool]
@@ -227,14 +229,23 @@ class Guild(pydantic.BaseModel, Hashable):
     created_at: Optional[datetime.datetime]
     """ when the guild was created """
 
-    @pydantic.validator("members", pre=True)
-    def _validate_members(cls, members, **kwargs) -> Dict[Snowflake, Member]:
+    @pydantic.validator("members", pre=True, always=True)
+    def _validate_members(cls, members, **kwargs) -> MemberStore:
+        if isinstance(members, MemberStore):
+            return members
+
         conn = kwargs["values"]["conn"]
         id = kwargs["values"]["id"]
 
-        return {
-            int(m["user"]["id"]): Member(conn=conn, guild_id=id, **m) for m in members
-        }
+        store = MemberStore(id, conn)
+
+        if isinstance(members, dict):
+            store.update(members)
+        else:
+            for member in members or ():
+                store.add_payload(member)
+
+        return store
 
     @pydantic.validator("threads", pre=True)
     def _validate_threads(cls, threads, **kwargs) -> Dict[Snowflake, Thread]:
@@ -356,6 +367,61 @@ def get_channel(self, channel_id: Snowflake, /) -> Optional[Channel]:
         """
         return self.channels.get(channel_id)
 
+    def enable_indexes(self) -> None:
+        """|func|
+
+        Indexes members by name, channels by type and parent and threads by parent,
+        speeding up :meth:`Guild.search_members`, :meth:`Guild.get_channels_by_type`
+        and :meth:`Guild.get_threads`.
+        Indexes are kept updated as the guild changes.
+
+        .. note::
+            Can be enabled for every guild with ``DefaultCache(indexes=True)``
+        """
+        self.members.enable_name_index()
+        self.channels.enable_index()
+        self.threads.enable_index()
+
+    def search_members(self, prefix: str, *, limit: int = None) -> List[Member]:
+        """|func|
+
+        Searches cached members whose username or nickname starts with ``prefix``,
+        ignoring case.
+        Use :meth:`Guild.fetch_members_by_name` to search members which are not cached.
+
+        Parameters
+        ----------
+        prefix: :class:`str`
+            Start of the name
+        limit: :class:`int`
+            Maximum number of members to return
+        """
+        return self.members.search(prefix, limit=limit)
+
+    def get_channels_by_type(self, *types: ChannelTypes) -> List[Channel]:
+        """|func|
+
+        Gets channels of the guild with any of the given types
+
+        Parameters
+        ----------
+        *types: :class:`ChannelTypes`
+            Types of channel to get
+        """
+        return self.channels.of_type(*types)
+
+    def get_threads(self, parent_id: Snowflake, /) -> List[Thread]:
+        """|func|
+
+        Gets cached threads which belong to a channel
+
+        Parameters
+        ----------
+        parent_id: :class:`Snowflake`
+            ID of the channel
+        """
+        return self.threads.with_parent(parent_id)
+
     async def fetch_channels(self) -> Iterator[Channel]:
         """|coro|
 
@@ -486,6 +552,71 @@ async def fetch_members_by_name(
             self.members.update({fmember.id: fmember})
             yield fmember
 
+    async def chunk(
+        self, *, presences: bool = False, timeout: Optional[float] = 60.0
+    ) -> List[Member]:
+        """|coro|
+
+        Requests every member of the guild through the gateway,
+        which is much faster than :meth:`Guild.fetch_members` for large guilds.
+        Members are added to :attr:`Guild.members` as they arrive.
+
+        .. note::
+            Requires the ``GUILD_MEMBERS`` intent
+
+        Parameters
+        ----------
+        presences: :class:`bool`
+            Whether to include presences, requires the ``GUILD_PRESENCES`` intent
+        timeout: Optional[:class:`float`]
+            Seconds to wait for every member
+        """
+        shard = self.conn.client.get_shard(self.id)
+
+        return await shard.request_guild_members(
+            self.id, query="", presences=presences, timeout=timeout
+        )
+
+    async def query_members(
+        self,
+        query: str = None,
+        *,
+        limit: int = 5,
+        user_ids: List[Snowflake] = None,
+        presences: bool = False,
+        timeout: Optional[float] = 60.0,
+    ) -> List[Member]:
+        """|coro|
+
+        Requests members whose username starts with ``query``,
+        or with the given IDs, through the gateway.
+
+        Parameters
+        ----------
+        query: :class:`str`
+            Username to search for
+        limit: :class:`int`
+            Maximum number of members to return, up to 100
+        user_ids: List[:class:`Snowflake`]
+            IDs of members to request, up to 100
+        presences: :class:`bool`
+            Whether to include presences, requires the ``GUILD_PRESENCES`` intent
+        timeout: Optional[:class:`float`]
+            Seconds to wait for the members
+        """
+        assert (query is None) != (user_ids is None), "Provide either query or user_ids"
+
+        shard = self.conn.client.get_shard(self.id)
+
+        return await shard.request_guild_members(
+            self.id,
+            query=query,
+            limit=limit if query is not None else 0,
+            user_ids=user_ids,
+            presences=presences,
+            timeout=timeout,
+        )
+
     async def fetch_bans(self) -> Iterator[Ban]:
         """|coro|
 
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class NameIndex:
+    """A sorted index of names, used for case insensitive prefix searches.
+
+    Names are casefolded and interned,
+    so names which are already lowercase share memory with the original.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int]] = ()) -> None:
+        pairs = sorted((sys.intern(name.casefold()), id) for name, id in entries)
+
+        self._names: List[str] = [name for name, _ in pairs]
+        self._ids = array("Q", (id for _, id in pairs))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, id: int) -> None:
+        key = sys.intern(name.casefold())
+        index = bisect_right(self._names, key)
+
+        self._names.insert(index, key)
+        self._ids.insert(index, id)
+
+    def remove(self, name: str, id: int) -> None:
+        key = name.casefold()
+        index = bisect_left(self._names, key)
+
+        while index < len(self._names) and self._names[index] == key:
+            if self._ids[index] == id:
+                del self._names[index]
+                del self._ids[index]
+                return
+            index += 1
+
+    def search(self, prefix: str) -> Iterator[int]:
+        """Yields the IDs of names starting with ``prefix``, in name order.
+        An ID is only yielded once, even if several of its names match.
+        """
+        prefix = prefix.casefold()
+        index = bisect_left(self._names, prefix)
+        seen = set()
+
+        while index < len(self._names) and self._names[index].startswith(prefix):
+            id = self._ids[index]
+
+            if id not in seen:
+                seen.add(id)
+                yield id
+
+            index += 1
+
+
+class ChannelMap(dict):
+    """A mapping of channel IDs to channels,
+    which can also index channels by type and parent.
+
+    Indexes are disabled until :meth:`ChannelMap.enable_index` is called,
+    lookups still work without them but scan every channel.
+    """
+
+    def __init__(self, *args, **kwds) -> None:
+        super().__init__(*args, **kwds)
+
+        self._by_type: Optional[Dict[Any, Dict[int, Any]]] = None
+        self._by_parent: Optional[Dict[Any, Dict[int, Any]]] = None
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, v) -> ChannelMap:
+        if isinstance(v, cls):
+            return v
+        if isinstance(v, dict):
+            return cls(v)
+
+        raise TypeError("Value must be a dict of channels")
+
+    def __reduce__(self):
+        # Indexes are rebuilt from the channels when needed
+        return self.__class__, (dict(self),), {"indexed": self.indexed}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if state.get("indexed"):
+            self.enable_index()
+
+    @property
+    def indexed(self) -> bool:
+        """Whether indexes are enabled"""
+        return self._by_type is not None
+
+    def enable_index(self) -> None:
+        """Builds indexes of the current channels and keeps them updated"""
+        if self._by_type is not None:
+            return
+
+        self._by_type = {}
+        self._by_parent = {}
+
+        for channel in self.values():
+            self._index(channel)
+
+    # NOTE: Lookups
+
+    def of_type(self, *types: Any) -> List[Any]:
+        """Returns channels of any of the given types
+
+        Parameters
+        ----------
+        *types: :class:`ChannelTypes`
+            Types to include
+        """
+        if self._by_type is None:
+            return [c for c in self.values() if getattr(c, "type", None) in types]
+
+        return [c for t in types for c in self._by_type.get(t, {}).values()]
+
+    def with_parent(self, parent_id: int) -> List[Any]:
+        """Returns channels whose parent is ``parent_id``,
+        such as the threads of a channel or the channels of a category.
+
+        Parameters
+        ----------
+        parent_id: :class:`Snowflake`
+            ID of the parent
+        """
+        if self._by_parent is None:
+            return [
+                c for c in self.values() if getattr(c, "parent_id", None) == parent_id
+            ]
+
+        return list(self._by_parent.get(parent_id, {}).values())
+
+    # NOTE: Index maintenance
+
+    @staticmethod
+    def _bucket_add(buckets: Dict[Any, Dict[int, Any]], key: Any, channel: Any) -> None:
+        if key is not None:
+            buckets.setdefault(key, {})[channel.id] = channel
+
+    @staticmethod
+    def _bucket_remove(
+        buckets: Dict[Any, Dict[int, Any]], key: Any, channel: Any
+    ) -> None:
+        bucket = buckets.get(key)
+
+        if bucket is not None:
+            bucket.pop(channel.id, None)
+            if not bucket:
+                del buckets[key]
+
+    def _index(self, channel: Any) -> None:
+        self._bucket_add(self._by_type, getattr(channel, "type", None), channel)
+        self._bucket_add(self._by_parent, getattr(channel, "parent_id", None), channel)
+
+    def _unindex(self, channel: Any) -> None:
+        self._bucket_remove(self._by_type, getattr(channel, "type", None), channel)
+        self._bucket_remove(
+            self._by_parent, getattr(channel, "parent_id", None), channel
+        )
+
+    def __setitem__(self, key: int, channel: Any) -> None:
+        if self._by_type is not None:
+            old = dict.get(self, key)
+            if old is not None:
+                self._unindex(old)
+            self._index(channel)
+
+        dict.__setitem__(self, key, channel)
+
+    def __delitem__(self, key: int) -> None:
+        channel = dict.pop(self, key)
+
+        if self._by_type is not None:
+            self._unindex(channel)
+
+    def pop(self, key: int, *args) -> Any:
+        channel = dict.pop(self, key, _MISSING)
+
+        if channel is _MISSING:
+            if args:
+                return args[0]
+            raise KeyError(key)
+
+        if self._by_type is not None:
+            self._unindex(channel)
+
+        return channel
+
+    def popitem(self) -> Tuple[int, Any]:
+        key, channel = dict.popitem(self)
+
+        if self._by_type is not None:
+            self._unindex(channel)
+
+        return key, channel
+
+    def setdefault(self, key: int, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwds) -> None:
+        for key, channel in dict(*args, **kwds).items():
+            self[key] = channel
+
+    def clear(self) -> None:
+        dict.clear(self)
+
+        if self._by_type is not None:
+            self._by_type.clear()
+            self._by_parent.clear()
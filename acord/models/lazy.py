@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Generic, Optional, Type, TypeVar
+import pydantic
+
+M = TypeVar("M", bound=pydantic.BaseModel)
+_SLOTS = ("__model__", "__conn__", "__data__", "__cache__", "__dirty__", "__full__")
+
+
+class LazyModel(Generic[M]):
+    """A proxy for a model which validates fields on first access.
+
+    Fields are validated individually from the raw payload,
+    so unread fields such as embeds or components are never validated.
+    Methods and properties defined on the model run against the proxy,
+    anything which requires the real model, e.g. ``.copy`` or ``.dict``,
+    builds the full model once and uses that from then on.
+
+    .. note::
+        ``isinstance`` checks are forwarded to the wrapped model,
+        so ``isinstance(proxy, Message)`` is ``True``.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        message = LazyModel(Message, client.http, data)
+
+        message.content  # Only validates content
+        message.author.id  # Validates the author
+        message.dict()  # Builds and validates the whole message
+
+    Parameters
+    ----------
+    model: Type[:class:`~pydantic.BaseModel`]
+        Model to wrap
+    conn: Any
+        Connection object passed through to the model
+    data: :class:`dict`
+        Raw payload for the model
+    """
+
+    __slots__ = _SLOTS
+
+    def __init__(self, model: Type[M], conn: Any, data: Dict[str, Any]) -> None:
+        object.__setattr__(self, "__model__", model)
+        object.__setattr__(self, "__conn__", conn)
+        object.__setattr__(self, "__data__", data)
+        object.__setattr__(self, "__cache__", {"conn": conn})
+        object.__setattr__(self, "__dirty__", {})
+        object.__setattr__(self, "__full__", None)
+
+    @property
+    def __class__(self) -> Type[M]:
+        return object.__getattribute__(self, "__model__")
+
+    def materialize(self) -> M:
+        """Builds and returns the full model,
+        only done once per proxy.
+        """
+        full: Optional[M] = object.__getattribute__(self, "__full__")
+
+        if full is None:
+            model = object.__getattribute__(self, "__model__")
+            conn = object.__getattribute__(self, "__conn__")
+            data = object.__getattribute__(self, "__data__")
+
+            full = model(conn=conn, **data)
+
+            # Keep any changes made through the proxy
+            for name, value in object.__getattribute__(self, "__dirty__").items():
+                setattr(full, name, value)
+
+            object.__setattr__(self, "__full__", full)
+
+        return full
+
+    def _validate_field(self, name: str) -> Any:
+        model = object.__getattribute__(self, "__model__")
+        data = object.__getattribute__(self, "__data__")
+        cache = object.__getattribute__(self, "__cache__")
+        field = model.__fields__[name]
+
+        if field.alias not in data:
+            if field.required:
+                return getattr(self.materialize(), name)
+            value = field.get_default()
+        else:
+            # Validators may depend on other fields, e.g. conn or id
+            values = {**data, **cache}
+            value, errors = field.validate(
+                data[field.alias], values, loc=field.alias, cls=model
+            )
+
+            if errors:
+                # Let the model raise the proper validation error
+                return getattr(self.materialize(), name)
+
+        cache[name] = value
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        full = object.__getattribute__(self, "__full__")
+        if full is not None:
+            return getattr(full, name)
+
+        cache = object.__getattribute__(self, "__cache__")
+        if name in cache:
+            return cache[name]
+
+        model = object.__getattribute__(self, "__model__")
+        if name in model.__fields__:
+            return self._validate_field(name)
+
+        for klass in model.__mro__:
+            if name in klass.__dict__:
+                attr = klass.__dict__[name]
+                break
+        else:
+            raise AttributeError(f"'{model.__name__}' object has no attribute '{name}'")
+
+        if issubclass(pydantic.BaseModel, klass) or not hasattr(attr, "__get__"):
+            # Pydantic internals need the real model
+            return getattr(self.materialize(), name)
+
+        # Methods and properties defined on the model run against the proxy
+        return attr.__get__(self, model)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        full = object.__getattribute__(self, "__full__")
+
+        if full is not None:
+            setattr(full, name, value)
+        else:
+            object.__getattribute__(self, "__cache__")[name] = value
+            object.__getattribute__(self, "__dirty__")[name] = value
+
+    def __eq__(self, other: Any) -> bool:
+        return self.id == getattr(other, "id", other)
+
+    def __ne__(self, other: Any) -> bool:
+        return self.id != getattr(other, "id", other)
+
+    def __hash__(self) -> int:
+        return self.id >> 22
+
+    def __repr__(self) -> str:
+        model = object.__getattribute__(self, "__model__")
+        return f"<Lazy {model.__name__} id={self.id}>"
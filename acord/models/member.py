@@ -108,6 +108,11 @@ def _validate_av(cls, value, **kwargs):
 
         return f"https://cdn.discordapp.com/guilds/{guild_id}/users/{user_id}/avatars/{value}.png"
 
+    @property
+    def id(self) -> Optional[int]:
+        """ID of the member's user, ``None`` if the user is not included"""
+        return self.user.id if self.user is not None else None
+
     async def ban(self, *, reason: str = None, delete_message_days: int = 0) -> None:
         """|coro|
 
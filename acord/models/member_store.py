@@ -0,0 +1,620 @@
+from __future__ import annotations
+
+import datetime
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from acord.bases import UserFlags
+
+from .indexes import NameIndex
+from .member import Member
+from .user import User
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+# Stored in place of a missing timestamp
+_NO_TIME = -(1 << 63)
+# Stored in place of a discriminator which is not 4 digits
+_NO_DISCRIMINATOR = 0xFFFF
+
+_USER_AVATAR = "https://cdn.discordapp.com/avatars/{}/{}.png"
+_MEMBER_AVATAR = "https://cdn.discordapp.com/guilds/{}/users/{}/avatars/{}.png"
+
+# Bits of the flags column
+_DEAF = 1 << 0
+_MUTE = 1 << 1
+_PENDING = 1 << 2
+_PENDING_NONE = 1 << 3
+_BOT = 1 << 4
+_BOT_NONE = 1 << 5
+_SYSTEM = 1 << 6
+_SYSTEM_NONE = 1 << 7
+_AVATAR = 1 << 8
+_AVATAR_ANIMATED = 1 << 9
+_PUBLIC_FLAGS = 1 << 10
+_MEMBER_COLUMNS = {
+    "conn", "guild_id", "user", "nick", "roles", "joined_at",
+    "premium_since", "deaf", "mute", "pending",
+}  # fmt: skip
+_USER_COLUMNS = {
+    "conn", "id", "username", "discriminator", "avatar",
+    "bot", "system", "public_flags",
+}  # fmt: skip
+_MEMBER_EXTRA = tuple(n for n in Member.__fields__ if n not in _MEMBER_COLUMNS)
+_USER_EXTRA = tuple(n for n in User.__fields__ if n not in _USER_COLUMNS)
+
+# Member avatars are only converted to urls, so are handled without the model
+_MEMBER_PAYLOAD_EXTRA = tuple(n for n in _MEMBER_EXTRA if n != "avatar")
+
+_MEMBER_DEFAULTS = {n: f.default for n, f in Member.__fields__.items()}
+_USER_DEFAULTS = {n: f.default for n, f in User.__fields__.items()}
+
+
+def _to_micros(value: Optional[datetime.datetime]) -> int:
+    if value is None:
+        return _NO_TIME
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> Optional[datetime.datetime]:
+    if value == _NO_TIME:
+        return None
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+
+def _parse_time(value: Optional[str]) -> int:
+    if value is None:
+        return _NO_TIME
+    return _to_micros(datetime.datetime.fromisoformat(value))
+
+
+def _optional_bool(value: Optional[bool], true: int, none: int) -> int:
+    if value is None:
+        return none
+    return true if value else 0
+
+
+def _new_model(model: Any, defaults: Dict[str, Any], values: Dict[str, Any]) -> Any:
+    # Values are already validated, same as BaseModel.construct without the overhead
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", {**defaults, **values})
+    object.__setattr__(instance, "__fields_set__", set(values))
+    instance._init_private_attributes()
+    return instance
+
+
+class MemberStore(MutableMapping[int, Member]):
+    """Compact storage for the members of a guild,
+    behaves like a mapping of user IDs to :class:`Member`.
+
+    Members are stored in parallel arrays rather than as models,
+    using a fraction of the memory for guilds with many members.
+    :class:`Member` objects are built when they are accessed,
+    and stay the same object for as long as they are referenced elsewhere.
+
+    .. note::
+        Changes made to a member object are not stored,
+        assign the member back to store them.
+
+        .. code-block:: py
+
+            member = guild.get_member(user_id)
+            member.nick = "New nick"
+            guild.members[member.id] = member
+
+    Parameters
+    ----------
+    guild_id: :class:`Snowflake`
+        ID of the guild members belong to
+    conn: :class:`HTTPClient`
+        Connection given to built members
+    """
+
+    def __init__(self, guild_id: int = 0, conn: Any = None) -> None:
+        self.guild_id = guild_id
+        self.conn = conn
+
+        self._index: Dict[int, int] = {}
+        self._free: List[int] = []
+
+        self._ids = array("Q")
+        self._usernames: List[Optional[str]] = []
+        self._discriminators = array("H")
+        self._avatars = bytearray()
+        self._nicks: List[Optional[str]] = []
+        self._role_start = array("I")
+        self._role_count = array("H")
+        self._roles = array("Q")
+        self._role_garbage = 0
+        self._joined = array("q")
+        self._premium = array("q")
+        self._flags = array("H")
+        self._public_flags = array("Q")
+
+        # Rarely set fields, by row
+        self._member_extra: Dict[int, Dict[str, Any]] = {}
+        self._user_extra: Dict[int, Dict[str, Any]] = {}
+
+        self._views: WeakValueDictionary[int, Member] = WeakValueDictionary()
+        self._names: Optional[NameIndex] = None
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, v) -> MemberStore:
+        if isinstance(v, cls):
+            return v
+        if isinstance(v, dict):
+            store = cls()
+            store.update(v)
+            return store
+
+        raise TypeError("Value must be a MemberStore or dict of members")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_views"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._views = WeakValueDictionary()
+
+    # NOTE: Mapping
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._index))
+
+    def __contains__(self, user_id: Any) -> bool:
+        return user_id in self._index
+
+    def __getitem__(self, user_id: int) -> Member:
+        member = self._views.get(user_id)
+
+        if member is None:
+            member = self._build(self._index[user_id])
+            self._views[user_id] = member
+
+        return member
+
+    def __setitem__(self, user_id: int, member: Member) -> None:
+        if not isinstance(member, Member):
+            raise TypeError("Member must be an instance of Member")
+        self.add(member)
+
+    def __delitem__(self, user_id: int) -> None:
+        row = self._index.pop(user_id)
+        self._views.pop(user_id, None)
+        self._release(row)
+
+    def clear(self) -> None:
+        indexed = self._names is not None
+        self.__init__(self.guild_id, self.conn)
+
+        if indexed:
+            self.enable_name_index()
+
+    # NOTE: Adding members
+
+    def add(self, member: Member) -> None:
+        """Stores a member, replacing any member with the same user ID
+
+        Parameters
+        ----------
+        member: :class:`Member`
+            Member to store, must have a user
+        """
+        user = member.user
+        user_id = user.id
+
+        flags = _optional_bool(member.pending, _PENDING, _PENDING_NONE)
+        flags |= _optional_bool(user.bot, _BOT, _BOT_NONE)
+        flags |= _optional_bool(user.system, _SYSTEM, _SYSTEM_NONE)
+        if member.deaf:
+            flags |= _DEAF
+        if member.mute:
+            flags |= _MUTE
+
+        member_extra = {
+            name: getattr(member, name)
+            for name in _MEMBER_EXTRA
+            if getattr(member, name) is not None
+        }
+        user_extra = {
+            name: getattr(user, name)
+            for name in _USER_EXTRA
+            if getattr(user, name) is not None
+        }
+
+        avatar = user.avatar
+        prefix = _USER_AVATAR.format(user_id, "")[:-4]
+        if avatar is not None and avatar.startswith(prefix) and avatar.endswith(".png"):
+            # Validated avatars are urls, only the hash needs storing
+            avatar = avatar[len(prefix) : -4]
+        elif avatar is not None:
+            user_extra["avatar"] = avatar
+            avatar = None
+
+        self._store(
+            user_id,
+            user.username,
+            user.discriminator,
+            avatar,
+            user.public_flags,
+            member.nick,
+            member.roles,
+            _to_micros(member.joined_at),
+            _to_micros(member.premium_since),
+            flags,
+            member_extra,
+            user_extra,
+        )
+
+    def add_payload(self, data: Dict[str, Any]) -> None:
+        """Stores a member from data received from discord,
+        without building a :class:`Member`.
+
+        Parameters
+        ----------
+        data: :class:`dict`
+            Member object received from discord
+        """
+        user = data["user"]
+
+        if any(data.get(n) is not None for n in _MEMBER_PAYLOAD_EXTRA) or any(
+            user.get(n) is not None for n in _USER_EXTRA
+        ):
+            # Needs validating, which only the model does
+            from .trusted import construct_trusted
+
+            return self.add(
+                construct_trusted(Member, data, conn=self.conn, guild_id=self.guild_id)
+            )
+
+        user_id = int(user["id"])
+
+        flags = _optional_bool(data.get("pending"), _PENDING, _PENDING_NONE)
+        flags |= _optional_bool(user.get("bot"), _BOT, _BOT_NONE)
+        flags |= _optional_bool(user.get("system"), _SYSTEM, _SYSTEM_NONE)
+        if data.get("deaf"):
+            flags |= _DEAF
+        if data.get("mute"):
+            flags |= _MUTE
+
+        member_extra = {}
+        if data.get("avatar") is not None:
+            member_extra["avatar"] = _MEMBER_AVATAR.format(
+                self.guild_id, user_id, data["avatar"]
+            )
+
+        public_flags = user.get("public_flags")
+
+        self._store(
+            user_id,
+            user["username"],
+            user["discriminator"],
+            user.get("avatar"),
+            UserFlags(public_flags) if public_flags is not None else 0,
+            data.get("nick"),
+            [int(r) for r in data.get("roles", ())],
+            _parse_time(data["joined_at"]),
+            _parse_time(data.get("premium_since")),
+            flags,
+            member_extra,
+            {},
+        )
+
+    def _store(
+        self,
+        user_id: int,
+        username: str,
+        discriminator: str,
+        avatar: Optional[str],
+        public_flags: Any,
+        nick: Optional[str],
+        roles: List[int],
+        joined: int,
+        premium: int,
+        flags: int,
+        member_extra: Dict[str, Any],
+        user_extra: Dict[str, Any],
+    ) -> None:
+        row = self._index.get(user_id)
+
+        if row is None:
+            row = self._allocate()
+            self._index[user_id] = row
+        else:
+            self._views.pop(user_id, None)
+            self._role_garbage += self._role_count[row]
+            self._unindex_names(row)
+
+        if discriminator.isdigit() and len(discriminator) == 4:
+            self._discriminators[row] = int(discriminator)
+        else:
+            self._discriminators[row] = _NO_DISCRIMINATOR
+            user_extra["discriminator"] = discriminator
+
+        offset = row * 16
+        if avatar is not None:
+            animated = avatar.startswith("a_")
+            digest = avatar[2:] if animated else avatar
+
+            try:
+                packed = bytes.fromhex(digest)
+            except ValueError:
+                packed = b""
+
+            if len(packed) == 16:
+                self._avatars[offset : offset + 16] = packed
+                flags |= _AVATAR | (_AVATAR_ANIMATED if animated else 0)
+            else:
+                user_extra["avatar"] = _USER_AVATAR.format(user_id, avatar)
+
+        if isinstance(public_flags, UserFlags):
+            flags |= _PUBLIC_FLAGS
+            public_flags = public_flags.value
+        self._public_flags[row] = public_flags or 0
+
+        self._ids[row] = user_id
+        self._usernames[row] = sys.intern(username)
+        self._nicks[row] = sys.intern(nick) if nick is not None else None
+        self._joined[row] = joined
+        self._premium[row] = premium
+        self._flags[row] = flags
+
+        self._role_start[row] = len(self._roles)
+        self._role_count[row] = len(roles)
+        self._roles.extend(roles)
+
+        self._set_extra(self._member_extra, row, member_extra)
+        self._set_extra(self._user_extra, row, user_extra)
+
+        if self._names is not None:
+            self._names.add(self._usernames[row], user_id)
+            if nick is not None:
+                self._names.add(self._nicks[row], user_id)
+
+        self._compact_roles()
+
+    @staticmethod
+    def _set_extra(extras: Dict[int, Dict[str, Any]], row: int, values: Dict[str, Any]):
+        if values:
+            extras[row] = values
+        else:
+            extras.pop(row, None)
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        row = len(self._ids)
+
+        self._ids.append(0)
+        self._usernames.append(None)
+        self._discriminators.append(0)
+        self._avatars.extend(bytes(16))
+        self._nicks.append(None)
+        self._role_start.append(0)
+        self._role_count.append(0)
+        self._joined.append(_NO_TIME)
+        self._premium.append(_NO_TIME)
+        self._flags.append(0)
+        self._public_flags.append(0)
+
+        return row
+
+    def _release(self, row: int) -> None:
+        self._unindex_names(row)
+
+        self._ids[row] = 0
+        self._usernames[row] = None
+        self._nicks[row] = None
+        self._role_garbage += self._role_count[row]
+        self._role_count[row] = 0
+
+        self._member_extra.pop(row, None)
+        self._user_extra.pop(row, None)
+
+        self._free.append(row)
+
+    def _unindex_names(self, row: int) -> None:
+        if self._names is None:
+            return
+
+        user_id = self._ids[row]
+        self._names.remove(self._usernames[row], user_id)
+        if self._nicks[row] is not None:
+            self._names.remove(self._nicks[row], user_id)
+
+    def _compact_roles(self) -> None:
+        # Replaced role lists are left in the pool until most of it is unused
+        if self._role_garbage < 1024 or self._role_garbage * 2 < len(self._roles):
+            return
+
+        roles = array("Q")
+
+        for row in self._index.values():
+            start = self._role_start[row]
+            count = self._role_count[row]
+
+            self._role_start[row] = len(roles)
+            roles.extend(self._roles[start : start + count])
+
+        self._roles = roles
+        self._role_garbage = 0
+
+    # NOTE: Building members
+
+    def _cache(self) -> Any:
+        # Members share cached users when the store belongs to a client
+        return getattr(getattr(self.conn, "client", None), "cache", None)
+
+    def _build_user(self, row: int) -> User:
+        user_id = self._ids[row]
+        flags = self._flags[row]
+        user_extra = self._user_extra.get(row, {})
+
+        if flags & _AVATAR:
+            digest = self._avatars[row * 16 : row * 16 + 16].hex()
+            if flags & _AVATAR_ANIMATED:
+                digest = "a_" + digest
+            avatar = _USER_AVATAR.format(user_id, digest)
+        else:
+            avatar = None
+
+        discriminator = self._discriminators[row]
+
+        user_values = {
+            "conn": self.conn,
+            "id": user_id,
+            "username": self._usernames[row],
+            "discriminator": f"{discriminator:04d}",
+            "avatar": avatar,
+            "bot": None if flags & _BOT_NONE else bool(flags & _BOT),
+            "system": None if flags & _SYSTEM_NONE else bool(flags & _SYSTEM),
+            "public_flags": (
+                UserFlags(self._public_flags[row])
+                if flags & _PUBLIC_FLAGS
+                else self._public_flags[row]
+            ),
+            **user_extra,
+        }
+        return _new_model(User, _USER_DEFAULTS, user_values)
+
+    def _build(self, row: int) -> Member:
+        user_id = self._ids[row]
+        flags = self._flags[row]
+
+        cache = self._cache()
+        user = cache.get_user(user_id) if cache is not None else None
+
+        if user is None:
+            user = self._build_user(row)
+            if cache is not None:
+                user = cache.intern_user(user)
+
+        start = self._role_start[row]
+
+        member_values = {
+            "conn": self.conn,
+            "guild_id": self.guild_id,
+            "user": user,
+            "nick": self._nicks[row],
+            "roles": self._roles[start : start + self._role_count[row]].tolist(),
+            "joined_at": _from_micros(self._joined[row]),
+            "premium_since": _from_micros(self._premium[row]),
+            "deaf": bool(flags & _DEAF),
+            "mute": bool(flags & _MUTE),
+            "pending": None if flags & _PENDING_NONE else bool(flags & _PENDING),
+            **self._member_extra.get(row, {}),
+        }
+
+        return _new_model(Member, _MEMBER_DEFAULTS, member_values)
+
+    # NOTE: Lookups without building members
+
+    def usernames(self) -> Iterator[Tuple[int, str, Optional[str]]]:
+        """Returns the user ID, username and nickname of every member,
+        without building any members.
+        """
+        for user_id, row in self._index.items():
+            yield user_id, self._usernames[row], self._nicks[row]
+
+    def enable_name_index(self) -> None:
+        """Builds an index of usernames and nicknames,
+        making :meth:`MemberStore.search` faster for large guilds.
+        The index is kept updated as members are stored and removed.
+        """
+        if self._names is not None:
+            return
+
+        entries = []
+
+        for user_id, username, nick in self.usernames():
+            entries.append((username, user_id))
+            if nick is not None:
+                entries.append((nick, user_id))
+
+        self._names = NameIndex(entries)
+
+    def search(self, prefix: str, *, limit: Optional[int] = None) -> List[Member]:
+        """Returns members whose username or nickname starts with ``prefix``,
+        ignoring case.
+        Members are in name order when the name index is enabled,
+        otherwise in the order they were stored.
+
+        Parameters
+        ----------
+        prefix: :class:`str`
+            Start of the name
+        limit: :class:`int`
+            Maximum number of members to return
+        """
+        if self._names is not None:
+            ids = self._names.search(prefix)
+        else:
+            prefix = prefix.casefold()
+            ids = (
+                user_id
+                for user_id, username, nick in self.usernames()
+                if username.casefold().startswith(prefix)
+                or (nick is not None and nick.casefold().startswith(prefix))
+            )
+
+        members = []
+
+        for user_id in ids:
+            if limit is not None and len(members) >= limit:
+                break
+            members.append(self[user_id])
+
+        return members
+
+    def role_ids(self, user_id: int) -> List[int]:
+        """Returns the role IDs of a member, without building the member
+
+        Parameters
+        ----------
+        user_id: :class:`int`
+            ID of the member
+        """
+        row = self._index[user_id]
+        start = self._role_start[row]
+        return self._roles[start : start + self._role_count[row]].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate number of bytes used by stored members"""
+        size = sys.getsizeof(self._index) + sys.getsizeof(self._avatars)
+
+        for column in (
+            self._ids,
+            self._discriminators,
+            self._role_start,
+            self._role_count,
+            self._roles,
+            self._joined,
+            self._premium,
+            self._flags,
+            self._public_flags,
+        ):
+            size += column.itemsize * len(column)
+
+        for column in (self._usernames, self._nicks):
+            size += sys.getsizeof(column)
+            size += sum(sys.getsizeof(s) for s in column if s is not None)
+
+        # Keys of the index are ints
+        size += 32 * len(self._index)
+
+        return size
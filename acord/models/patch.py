@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, TypeVar
+import pydantic
+from pydantic.error_wrappers import ValidationError
+
+from .lazy import LazyModel
+from .trusted import _MISSING, _plan, _validate_value
+
+M = TypeVar("M", bound=pydantic.BaseModel)
+
+
+def _unwrap(model: Any) -> pydantic.BaseModel:
+    if type(model) is LazyModel:
+        return model.materialize()
+    return model
+
+
+def patch_model(
+    model: pydantic.BaseModel,
+    data: Dict[str, Any],
+    *,
+    exclude: Iterable[str] = (),
+    **extra,
+) -> Dict[str, Any]:
+    """Updates a model in place from a partial payload sent by discord,
+    returns the previous values of every field which was set.
+
+    Only fields present in ``data`` are validated,
+    using the same converters as :func:`construct_trusted`.
+    Validators receive the current values of the model,
+    so fields such as ``conn`` or ``guild_id`` do not need to be sent again.
+    References to the model stay valid,
+    use :func:`copy_with` to get the model as it was before.
+
+    .. note::
+        Fields are validated before any are set,
+        so the model is left untouched if the payload is invalid.
+        Root validators are not run.
+
+    .. rubric:: Example
+
+    .. code-block:: py
+
+        previous = patch_model(message, {"content": "edited"})
+        before = copy_with(message, previous)
+
+    Parameters
+    ----------
+    model: :class:`~pydantic.BaseModel`
+        Model to update
+    data: :class:`dict`
+        Payload received from discord
+    exclude: Iterable[:class:`str`]
+        Names of fields to leave untouched,
+        for fields which are maintained separately
+    **extra:
+        Additional fields to set
+    """
+    model = _unwrap(model)
+    cls = type(model)
+    exclude = set(exclude)
+
+    # Models without a plan are validated field by field through pydantic
+    plan = _plan(cls) or tuple(
+        (name, field, (), None, (), _MISSING) for name, field in cls.__fields__.items()
+    )
+
+    by_name = cls.__config__.allow_population_by_field_name
+    values = dict(model.__dict__)
+    changed: Dict[str, Any] = {}
+    errors = []
+
+    for entry in plan:
+        name, field = entry[0], entry[1]
+        if name in exclude:
+            continue
+
+        v = extra.get(name, _MISSING)
+        if v is _MISSING:
+            v = data.get(field.alias, _MISSING)
+        if v is _MISSING and by_name:
+            v = data.get(name, _MISSING)
+        if v is _MISSING:
+            continue
+
+        v, error = _validate_value(cls, *entry[1:5], v, values)
+        if error:
+            errors.append(error)
+            continue
+
+        values[name] = changed[name] = v
+
+    if errors:
+        raise ValidationError(errors, cls)
+
+    previous = {name: model.__dict__.get(name) for name in changed}
+
+    model.__dict__.update(changed)
+    model.__fields_set__.update(changed)
+
+    return previous
+
+
+def copy_with(model: M, values: Dict[str, Any]) -> M:
+    """Returns a shallow copy of a model with some fields replaced,
+    without running any validators.
+
+    This is cheaper than :meth:`~pydantic.BaseModel.copy`,
+    and is used to rebuild the model from before :func:`patch_model`.
+
+    Parameters
+    ----------
+    model: :class:`~pydantic.BaseModel`
+        Model to copy
+    values: :class:`dict`
+        Values to replace, such as those returned by :func:`patch_model`
+    """
+    model = _unwrap(model)
+    cls = type(model)
+
+    copy = cls.__new__(cls)
+    object.__setattr__(copy, "__dict__", {**model.__dict__, **values})
+    object.__setattr__(copy, "__fields_set__", set(model.__fields_set__))
+
+    for name in cls.__private_attributes__:
+        value = getattr(model, name, _MISSING)
+        if value is not _MISSING:
+            object.__setattr__(copy, name, value)
+
+    return copy
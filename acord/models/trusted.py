@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Type, TypeVar
+from enum import Enum
+import datetime
+import pydantic
+from pydantic.fields import (
+    ModelField,
+    SHAPE_SINGLETON,
+    SHAPE_LIST,
+    SHAPE_SET,
+    SHAPE_SEQUENCE,
+    SHAPE_TUPLE_ELLIPSIS,
+    SHAPE_DICT,
+    SHAPE_MAPPING,
+)
+
+M = TypeVar("M", bound=pydantic.BaseModel)
+_Converter = Callable[[Any], Any]
+
+_MISSING = object()
+_IMMUTABLE = (type(None), int, float, str, bool, Enum, tuple, frozenset)
+_SEQUENCE_SHAPES = (SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_TUPLE_ELLIPSIS, SHAPE_SET)
+_MAPPING_SHAPES = (SHAPE_DICT, SHAPE_MAPPING)
+
+# Per model field plans, built once on first use
+_PLANS: Dict[Type[pydantic.BaseModel], Optional[Tuple[Any, ...]]] = {}
+# Models whose plans are being built, so recursive models do not loop
+_PLANNING: Set[Type[pydantic.BaseModel]] = set()
+
+
+class _Fallback(Exception):
+    # Raised when a value needs the validated path
+    pass
+
+
+def _to_int(v: Any) -> int:
+    if type(v) is int:
+        return v
+    if type(v) is str:
+        return int(v)
+    if isinstance(v, int) and not isinstance(v, bool):
+        return int(v)
+    raise _Fallback
+
+
+def _to_datetime(v: Any) -> datetime.datetime:
+    if isinstance(v, datetime.datetime):
+        return v
+    try:
+        return datetime.datetime.fromisoformat(v)
+    except (TypeError, ValueError):
+        raise _Fallback from None
+
+
+def _passthrough(v: Any) -> Any:
+    return v
+
+
+def _type_converter(type_: Any) -> Optional[_Converter]:
+    # Cheap converters for types discord always sends correctly,
+    # None means the type must go through pydantic
+    if type_ is Any or type_ in (str, bool, float):
+        return _passthrough
+
+    if not isinstance(type_, type):
+        return None
+
+    if issubclass(type_, Enum):
+
+        def convert_enum(v: Any) -> Any:
+            return v if isinstance(v, type_) else type_(v)
+
+        return convert_enum
+
+    if issubclass(type_, bool):
+        return _passthrough
+
+    if issubclass(type_, int):
+        return _to_int
+
+    if issubclass(type_, datetime.datetime):
+        return _to_datetime
+
+    if issubclass(type_, pydantic.BaseModel):
+        if _plan(type_) is None:
+            return None
+
+        def convert_model(v: Any) -> Any:
+            if isinstance(v, type_):
+                return v
+            if not isinstance(v, dict):
+                raise _Fallback
+            return construct_trusted(type_, v)
+
+        return convert_model
+
+    return None
+
+
+def _field_converter(field: ModelField) -> Optional[_Converter]:
+    if field.sub_fields and field.shape == SHAPE_SINGLETON:
+        # Unions and other generics
+        return None
+
+    item = _type_converter(field.type_)
+
+    if item is None:
+        return None
+
+    if field.shape == SHAPE_SINGLETON:
+        return item
+
+    if field.shape in _SEQUENCE_SHAPES:
+        container = list if field.shape != SHAPE_SET else set
+        if field.shape == SHAPE_TUPLE_ELLIPSIS:
+            container = tuple
+
+        def convert_sequence(v: Any) -> Any:
+            if not isinstance(v, (list, tuple, set)):
+                raise _Fallback
+            return container(i if i is None else item(i) for i in v)
+
+        return convert_sequence
+
+    if field.shape in _MAPPING_SHAPES:
+        key = _type_converter(field.key_field.type_)
+
+        if key is None:
+            return None
+
+        def convert_mapping(v: Any) -> Any:
+            if not isinstance(v, dict):
+                raise _Fallback
+            return {key(k): (i if i is None else item(i)) for k, i in v.items()}
+
+        return convert_mapping
+
+    return None
+
+
+def _plan(model: Type[pydantic.BaseModel]) -> Optional[Tuple[Any, ...]]:
+    try:
+        return _PLANS[model]
+    except KeyError:
+        pass
+
+    if model in _PLANNING:
+        # Recursive reference, validated by pydantic
+        return None
+
+    if model.__pre_root_validators__ or model.__post_root_validators__:
+        _PLANS[model] = None
+        return None
+
+    plan = []
+    _PLANNING.add(model)
+
+    try:
+        for name, field in model.__fields__.items():
+            default = field.default
+            if field.default_factory is not None or not isinstance(default, _IMMUTABLE):
+                # Needs copying or calling, leave it to pydantic
+                default = _MISSING
+
+            plan.append(
+                (
+                    name,
+                    field,
+                    field.pre_validators or (),
+                    _field_converter(field),
+                    field.post_validators or (),
+                    default,
+                )
+            )
+    finally:
+        _PLANNING.discard(model)
+
+    # Only cached once built, a failed build is retried on next use
+    _PLANS[model] = plan = tuple(plan)
+    return plan
+
+
+def _validate_value(
+    model: Type[pydantic.BaseModel],
+    field: ModelField,
+    pre: Tuple[Any, ...],
+    convert: Optional[_Converter],
+    post: Tuple[Any, ...],
+    v: Any,
+    values: Dict[str, Any],
+) -> Tuple[Any, Any]:
+    # Returns the value and any errors, like ModelField.validate
+    if convert is None:
+        return field.validate(v, values, loc=field.alias, cls=model)
+
+    config = model.__config__
+    raw = v
+
+    try:
+        for validator in pre:
+            v = validator(model, v, values, field, config)
+
+        if v is not None:
+            v = convert(v)
+
+        for validator in post:
+            v = validator(model, v, values, field, config)
+    except _Fallback:
+        return field.validate(raw, values, loc=field.alias, cls=model)
+
+    return v, None
+
+
+def construct_trusted(model: Type[M], data: Dict[str, Any], **extra) -> M:
+    """Builds a model from data which came from discord.
+
+    Class validators still run,
+    but type validation is replaced by a converter built once per model.
+    Values which the converter cannot handle are validated by pydantic as usual,
+    and models which use root validators are always fully validated.
+
+    .. warning::
+        This should only be used with data received from discord,
+        user input should always go through the model itself.
+
+    Parameters
+    ----------
+    model: Type[:class:`~pydantic.BaseModel`]
+        Model to build
+    data: :class:`dict`
+        Data received from discord
+    **extra:
+        Additional fields, such as ``conn``
+    """
+    plan = _plan(model)
+
+    if plan is None:
+        return model(**{**data, **extra})
+
+    config = model.__config__
+    by_name = config.allow_population_by_field_name
+    values: Dict[str, Any] = {}
+    fields_set = set()
+
+    for name, field, pre, convert, post, default in plan:
+        v = extra.get(name, _MISSING)
+        if v is _MISSING:
+            v = data.get(field.alias, _MISSING)
+        if v is _MISSING and by_name:
+            v = data.get(name, _MISSING)
+
+        if v is _MISSING:
+            if field.required:
+                # Let pydantic raise the error
+                return model(**{**data, **extra})
+
+            v = field.get_default() if default is _MISSING else default
+
+            if not field.validate_always:
+                values[name] = v
+                continue
+        else:
+            fields_set.add(name)
+
+        v, errors = _validate_value(model, field, pre, convert, post, v, values)
+        if errors:
+            return model(**{**data, **extra})
+
+        values[name] = v
+
+    # Same as BaseModel.construct, every field has already been filled
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    instance._init_private_attributes()
+
+    return instance
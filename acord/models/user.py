@@ -87,7 +87,8 @@ def __str__(self) -> str:
 
     def mutual_guilds(self) -> List[Any]:
         """Return any guilds the user shares with the client"""
-        return [i for i in self.conn.client.guilds if i.get_member(self.id) is not None]
+        # Membership checks avoid building member objects
+        return [i for i in self.conn.client.cache.guilds() if self.id in i.members]
 
     async def create_dm(self):
         """|coro|
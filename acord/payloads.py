@@ -26,6 +26,7 @@
     InteractionCallback,
 )
 from acord.bases.embeds import _rgb_to_hex
+from acord.core.decoders import JSON, encodeJSON
 from acord.ext.application_commands.option import SlashOption
 from .models import (
     Message,
@@ -59,17 +60,24 @@ def _file_to_image_data(file):
     return f"data:{fm};base64,{data}"
 
 
-class GenericWebsocketPayload(pydantic.BaseModel):
+class _Payload(pydantic.BaseModel):
+    # Serialises using the JSON backend selected in acord.core.decoders
+    class Config:
+        json_loads = JSON
+        json_dumps = encodeJSON
+
+
+class GenericWebsocketPayload(_Payload):
     op: int
     d: Any
 
 
-class FormPartHelper(pydantic.BaseModel):
+class FormPartHelper(_Payload):
     type: InteractionCallback
     data: Any
 
 
-class ChannelEditPayload(pydantic.BaseModel):
+class ChannelEditPayload(_Payload):
     name: Optional[str]
     type: Optional[Literal[0, 5]]
     position: Optional[int]
@@ -90,7 +98,7 @@ def _validate_perms(cls, val) -> list:
         return [val]
 
 
-class MessageCreatePayload(pydantic.BaseModel):
+class MessageCreatePayload(_Payload):
     allowed_mentions: Optional[AllowedMentions]
     content: Optional[str]
     embeds: Optional[Union[List[Embed], Embed]] = list()
@@ -151,7 +159,7 @@ class InteractionMessageCreate(MessageCreatePayload):
     flags: IMessageFlags = 0
 
 
-class MessageEditPayload(pydantic.BaseModel):
+class MessageEditPayload(_Payload):
     content: Optional[str]
     embeds: Optional[str]
     flags: Optional[MessageFlags]
@@ -184,7 +192,7 @@ def _validate_components(cls, rows):
         return rows
 
 
-class InviteCreatePayload(pydantic.BaseModel):
+class InviteCreatePayload(_Payload):
     target_type: Optional[Literal[1, 2]]
     target_user_id: Optional[int]
     target_application_id: Optional[int]
@@ -205,7 +213,7 @@ def _validate_max_uses(cls, uses) -> int:
         return uses
 
 
-class ThreadCreatePayload(pydantic.BaseModel):
+class ThreadCreatePayload(_Payload):
     name: str
     type: Literal[10, 11, 12] = 11
     auto_archive_duration: Optional[Literal[0, 60, 1440, 4320, 10080]] = 60
@@ -225,7 +233,7 @@ def _validate_slowmode(cls, sm) -> int:
         return sm
 
 
-class ThreadEditPayload(pydantic.BaseModel):
+class ThreadEditPayload(_Payload):
     name: Optional[str]
     archived: Optional[bool]
     auto_archive_duration: Optional[Literal[0, 60, 1440, 4320, 10080]]
@@ -244,7 +252,7 @@ def _validate_slowmode(cls, sm) -> int:
         return sm
 
 
-class ChannelCreatePayload(pydantic.BaseModel):
+class ChannelCreatePayload(_Payload):
     name: str
 
     type: Optional[int]
@@ -275,7 +283,7 @@ def _validate_slowmode(cls, sm) -> int:
         return sm
 
 
-class MemberEditPayload(pydantic.BaseModel):
+class MemberEditPayload(_Payload):
     nick: Optional[str]
     roles: Optional[List[Union[Role, Snowflake]]]
     mute: Optional[bool]
@@ -284,7 +292,7 @@ class MemberEditPayload(pydantic.BaseModel):
     communication_disabled_until: Optional[datetime.datetime]
 
 
-class RoleCreatePayload(pydantic.BaseModel):
+class RoleCreatePayload(_Payload):
     name: Optional[str]
     permissions: Optional[Permissions]
     color: Optional[EmbedColor]
@@ -309,7 +317,7 @@ def dict(self, *args, **kwargs) -> dict:
         return data
 
 
-class RoleMovePayload(pydantic.BaseModel):
+class RoleMovePayload(_Payload):
     id: Snowflake
     position: int
 
@@ -321,7 +329,7 @@ def _validate_role(cls, id) -> int:
         return id
 
 
-class RoleEditPayload(pydantic.BaseModel):
+class RoleEditPayload(_Payload):
     name: Optional[str]
     permissions: Optional[Permissions]
     color: Optional[EmbedColor]
@@ -347,7 +355,7 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class WebhookCreatePayload(pydantic.BaseModel):
+class WebhookCreatePayload(_Payload):
     name: str
     avatar: Optional[File]
 
@@ -377,7 +385,7 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class WebhookEditPayload(pydantic.BaseModel):
+class WebhookEditPayload(_Payload):
     name: Optional[str]
     avatar: Optional[File]
     channel_id: Optional[Snowflake]
@@ -408,7 +416,7 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class GuildCreatePayload(pydantic.BaseModel):
+class GuildCreatePayload(_Payload):
     name: str
     icon: Optional[File]
     verification_level: Optional[VerificationLevel]
@@ -432,7 +440,7 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class GuildTemplateCreatePayload(pydantic.BaseModel):
+class GuildTemplateCreatePayload(_Payload):
     name: str
     icon: Optional[File]
 
@@ -448,7 +456,7 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class GuildEditPayload(pydantic.BaseModel):
+class GuildEditPayload(_Payload):
     name: Optional[str]
     region: Optional[str]
     verification_level: Optional[str]
@@ -489,12 +497,12 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class TemplateCreatePayload(pydantic.BaseModel):
+class TemplateCreatePayload(_Payload):
     name: str
     description: Optional[str]
 
 
-class ScheduledEventCreatePayload(pydantic.BaseModel):
+class ScheduledEventCreatePayload(_Payload):
     entity_type: ScheduledEventEntityType
     name: str
     channel_id: Optional[Snowflake]
@@ -546,20 +554,20 @@ class ScheduledEventEditPayload(ScheduledEventCreatePayload):
     status: Optional[ScheduledEventStatus]
 
 
-class StickerCreatePayload(pydantic.BaseModel):
+class StickerCreatePayload(_Payload):
     name: str
     description: str
     tags: str
     file: File
 
 
-class StickerEditPayload(pydantic.BaseModel):
+class StickerEditPayload(_Payload):
     name: Optional[str]
     description: Optional[str]
     tags: Optional[str]
 
 
-class EmojiCreatePayload(pydantic.BaseModel):
+class EmojiCreatePayload(_Payload):
     name: str
     image: File
     roles: List[Role] = list()
@@ -575,7 +583,7 @@ def dict(self, **kwargs) -> dict:
         return data
 
 
-class StageInstanceCreatePayload(pydantic.BaseModel):
+class StageInstanceCreatePayload(_Payload):
     channel_id: Snowflake
     topic: str
     privacy_level: Optional[StagePrivacyLevel] = StagePrivacyLevel.GUILD_ONLY
@@ -589,7 +597,7 @@ def _validate_topic(cls, topic):
         return topic
 
 
-class StageInstanceEditPayload(pydantic.BaseModel):
+class StageInstanceEditPayload(_Payload):
     topic: Optional[str]
     privacy_level: Optional[StagePrivacyLevel]
 
@@ -602,14 +610,31 @@ def _validate_topic(cls, topic):
         return topic
 
 
-class VoiceStateUpdatePresence(pydantic.BaseModel):
+class VoiceStateUpdatePresence(_Payload):
     guild_id: Snowflake
     channel_id: Optional[Snowflake]
     self_mute: bool
     self_deaf: bool
 
 
-class ApplicationCommandEditPayload(pydantic.BaseModel):
+class RequestGuildMembersPayload(_Payload):
+    guild_id: Snowflake
+    query: Optional[str]
+    limit: int = 0
+    presences: bool = False
+    user_ids: Optional[List[Snowflake]]
+    nonce: Optional[str]
+
+    @pydantic.validator("user_ids")
+    def _validate_user_ids(cls, user_ids, **kwargs):
+        if user_ids is not None and kwargs["values"].get("query") is not None:
+            raise ValueError("Only one of query and user_ids can be provided")
+        if user_ids is not None and len(user_ids) > 100:
+            raise ValueError("Only 100 user IDs can be requested at once")
+        return user_ids
+
+
+class ApplicationCommandEditPayload(_Payload):
     name: Optional[str]
     description: Optional[str]
     options: Optional[SlashOption]
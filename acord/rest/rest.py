@@ -19,6 +19,7 @@
 )
 from acord.errors import ApplicationCommandError
 from acord.models.interaction import Interaction
+from acord.models.trusted import construct_trusted
 from acord.rest.abc import InteractionServer
 from acord.utils import _d_to_channel
 from acord.core.http import HTTPClient
@@ -399,10 +400,9 @@ async def fetch_user(self, user_id: int, /) -> Optional[User]:
         """Fetches user from API and caches it"""
 
         resp = await self.http.request(Route("GET", path=f"/users/{user_id}"))
-        user = User(conn=self.http, **(await resp.json()))
+        user = construct_trusted(User, await resp.json(), conn=self.http)
 
-        self.cache.add_user(user)
-        return user
+        return self.cache.intern_user(user)
 
     async def fetch_channel(self, channel_id: int, /) -> Optional[Channel]:
         """Fetches channel from API and caches it"""
@@ -421,7 +421,7 @@ async def fetch_message(
         resp = await self.http.request(
             Route("GET", path=f"/channels/{channel_id}/messages/{message_id}")
         )
-        message = Message(conn=self.http, **(await resp.json()))
+        message = construct_trusted(Message, await resp.json(), conn=self.http)
 
         self.cache.add_message(message)
         return message
@@ -439,7 +439,7 @@ async def fetch_guild(
         resp = await self.http.request(
             Route("GET", path=f"/guilds/{guild_id}", with_counts=bool(with_counts)),
         )
-        guild = Guild(conn=self.http, **(await resp.json()))
+        guild = construct_trusted(Guild, await resp.json(), conn=self.http)
 
         self.cache.add_guild(guild)
         return guild
@@ -5,11 +5,8 @@
 from aiohttp import web
 from .abc import InteractionServer as BaseServer
 from acord.models import Interaction
+from acord.core.decoders import JSON
 
-try:
-    from orjson import loads
-except ImportError:
-    from json import loads
 
 try:
     from nacl.signing import VerifyKey
@@ -28,9 +25,9 @@ async def _handler(request: web.Request) -> Any:
         try:
             signature = request.headers["X-Signature-Ed25519"]
             timestamp = request.headers["X-Signature-Timestamp"]
-            body = await request.text()
+            body = await request.read()
 
-            verify_key.verify(f"{timestamp}{body}".encode(), bytes.fromhex(signature))
+            verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
         except BadSignatureError:
             return web.Response(
                 body="BAD REQUEST", status=401, reason="Invalid header values"
@@ -39,7 +36,7 @@ async def _handler(request: web.Request) -> Any:
             return web.Response(
                 body="BAD REQUEST", status=400, reason="Invalid headers"
             )
-        data = loads(body)
+        data = JSON(body)
 
         if data["type"] == 1:
             return web.Response(body='{"type": 1}')
@@ -484,6 +484,7 @@ async def _handle_voice(
 
             elif data["op"] == OpCodes.HEARTBEAT_ACK.value:
                 self.ping = datetime.utcnow().timestamp() - self.acked_at
+                self._keep_alive.ack()
 
             # else:
             #     print(data["op"])
@@ -0,0 +1,84 @@
+# Compares decoding a large GUILD_CREATE sent as JSON and as ETF
+#
+#   PYTHONPATH=. python benchmarks/etf_decode.py --members 2000
+import argparse
+import copy
+import json
+import os
+import timeit
+
+from acord.core.decoders import ETF, JSON, encodeETF
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), "payloads")
+
+# Fields holding snowflakes, or lists of them
+SNOWFLAKES = {"id", "guild_id", "owner_id", "system_channel_id", "roles"}
+
+
+def load_guild(members: int) -> dict:
+    with open(os.path.join(PAYLOADS, "guild_create.json")) as f:
+        guild = json.load(f)
+
+    template = guild["members"][0]
+    guild["members"] = []
+
+    for i in range(members):
+        member = copy.deepcopy(template)
+        member["user"]["id"] = str(4000000000000000004 + i)
+        member["user"]["username"] = f"user{i}"
+        guild["members"].append(member)
+
+    guild["member_count"] = members
+    return {"op": 0, "s": 1, "t": "GUILD_CREATE", "d": guild}
+
+
+def with_int_ids(data):
+    # Discord sends snowflakes as strings over JSON and as integers over ETF
+    if isinstance(data, list):
+        return [with_int_ids(value) for value in data]
+    if not isinstance(data, dict):
+        return data
+
+    converted = {}
+    for key, value in data.items():
+        if key in SNOWFLAKES and isinstance(value, str):
+            converted[key] = int(value)
+        elif key in SNOWFLAKES and isinstance(value, list) and value:
+            if isinstance(value[0], str):
+                converted[key] = [int(i) for i in value]
+            else:
+                converted[key] = with_int_ids(value)
+        else:
+            converted[key] = with_int_ids(value)
+    return converted
+
+
+def bench(name: str, func, data, number: int) -> None:
+    best = min(timeit.repeat(lambda: func(data), number=number, repeat=5)) / number
+    print(f"{name:<20} {len(data) / 1024:>8.0f}KB {best * 1000:>8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compares decoding GUILD_CREATE as JSON and ETF"
+    )
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = load_guild(args.members)
+    as_json = json.dumps(payload, separators=(",", ":")).encode()
+    as_etf = encodeETF(with_int_ids(payload))
+
+    last = ETF(as_etf)["d"]["members"][-1]
+    assert last["user"]["username"] == f"user{args.members - 1}"
+    assert last["user"]["id"] == 4000000000000000004 + args.members - 1
+
+    print(f"GUILD_CREATE with {args.members} members")
+    bench("JSON", JSON, as_json, args.number)
+    bench("json (stdlib)", json.loads, as_json, args.number)
+    bench("ETF", ETF, as_etf, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Compares finding the handler for a dispatch event,
+# the elif chain _handle_websocket used before EventRegistry against a registry lookup
+#
+#   PYTHONPATH=. python benchmarks/event_dispatch.py
+import argparse
+import timeit
+
+from acord.client.handler import EventRegistry
+from acord.core.signals import gateway
+
+# Order of the elif chain before EventRegistry
+CHAIN = (
+    "READY",
+    "INTERACTION_CREATE",
+    "INTERACTION_UPDATE",
+    "INTERACTION_DELETE",
+    "MESSAGE_CREATE",
+    "MESSAGE_UPDATE",
+    "MESSAGE_DELETE",
+    "MESSAGE_DELETE_BULK",
+    "MESSAGE_REACTION_ADD",
+    "MESSAGE_REACTION_REMOVE",
+    "MESSAGE_REACTION_REMOVE_ALL",
+    "MESSAGE_REACTION_REMOVE_EMOJI",
+    "CHANNEL_PINS_UPDATE",
+    "INVITE_CREATE",
+    "INVITE_DELETE",
+    "GUILD_CREATE",
+    "GUILD_DELETE",
+    "GUILD_UPDATE",
+    "GUILD_BAN_ADD",
+    "GUILD_BAN_REMOVE",
+    "GUILD_EMOJIS_UPDATE",
+    "GUILD_STICKERS_UPDATE",
+    "GUILD_INTEGRATIONS_UPDATE",
+    "GUILD_MEMBER_ADD",
+    "GUILD_MEMBER_REMOVE",
+    "GUILD_MEMBER_UPDATE",
+    "GUILD_ROLE_CREATE",
+    "GUILD_ROLE_UPDATE",
+    "GUILD_ROLE_DELETE",
+    "GUILD_SCHEDULED_EVENT_CREATE",
+    "GUILD_SCHEDULED_EVENT_UPDATE",
+    "GUILD_SCHEDULED_EVENT_DELETE",
+    "ON_INTEGRATION_CREATE",
+    "ON_INTEGRATION_UPDATE",
+    "ON_INTEGRATION_DELETE",
+    "ON_INVITE_CREATE",
+    "ON_INVITE_DELETE",
+    "CHANNEL_CREATE",
+    "CHANNEL_UPDATE",
+    "CHANNEL_DELETE",
+    "THREAD_CREATE",
+    "THREAD_UPDATE",
+    "THREAD_DELETE",
+    "THREAD_SYNC_LIST",
+    "THREAD_MEMBER_UPDATE",
+    "THREAD_MEMBERS_UPDATE",
+    "VOICE_STATE_UPDATE",
+    "PRESENCE_UPDATE",
+    "VOICE_SERVER_UPDATE",
+)
+
+
+def build_chain():
+    # Opcodes were checked before any event names
+    lines = [
+        "def lookup(OPERATION, EVENT):",
+        "    if OPERATION == gateway.INVALIDSESSION:",
+        "        return None",
+        "    elif OPERATION == gateway.RESUME:",
+        "        return None",
+        "    elif OPERATION == gateway.HEARTBEAT:",
+        "        return None",
+        "    elif OPERATION == gateway.HEARTBEATACK:",
+        "        return None",
+    ]
+    for event in CHAIN:
+        lines.append(f"    elif EVENT == {event!r}:")
+        lines.append(f"        return {event!r}")
+
+    namespace = {"gateway": gateway}
+    exec("\n".join(lines), namespace)
+    return namespace["lookup"]
+
+
+def build_registry():
+    registry = EventRegistry()
+
+    def lookup(OPERATION, EVENT):
+        if OPERATION == gateway.DISPATCH:
+            return registry.get(EVENT)
+        return None
+
+    return lookup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compares an elif chain against EventRegistry lookups"
+    )
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("events", nargs="*")
+    args = parser.parse_args()
+
+    events = args.events or (
+        "READY",
+        "MESSAGE_CREATE",
+        "GUILD_MEMBER_UPDATE",
+        "PRESENCE_UPDATE",
+        "VOICE_SERVER_UPDATE",
+    )
+    chain, registry = build_chain(), build_registry()
+    op = gateway.DISPATCH
+
+    print(f"{len(CHAIN)} events in the chain")
+    print(f"{'event':<24} {'elif chain':>12} {'registry':>12}")
+
+    for event in events:
+        results = []
+
+        for lookup in (chain, registry):
+            timer = timeit.Timer(lambda: lookup(op, event))
+            best = min(timer.repeat(number=args.number, repeat=5))
+            results.append(best / args.number * 1e9)
+
+        print(f"{event:<24} {results[0]:>10.0f}ns {results[1]:>10.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
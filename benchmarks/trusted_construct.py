@@ -0,0 +1,54 @@
+# Compares building a Message from recorded MESSAGE_CREATE payloads,
+# through the validated constructor and construct_trusted
+#
+#   PYTHONPATH=. python benchmarks/trusted_construct.py
+import argparse
+import json
+import os
+import timeit
+
+from acord.models import Message, construct_trusted
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), "payloads")
+
+CASES = {
+    "plain message": "message_create.json",
+    "3 embeds, 3 mentions": "message_create_embeds.json",
+}
+
+
+def load(name: str) -> dict:
+    with open(os.path.join(PAYLOADS, name)) as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compares the validated constructor against construct_trusted"
+    )
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<24} {'Message(...)':>14} {'construct_trusted':>18}")
+
+    for case, name in CASES.items():
+        data = load(name)
+
+        # Both paths must build the same model
+        expected = Message(conn=None, **data)
+        assert construct_trusted(Message, data, conn=None) == expected
+
+        results = []
+
+        for build in (
+            lambda: Message(conn=None, **data),
+            lambda: construct_trusted(Message, data, conn=None),
+        ):
+            best = min(timeit.repeat(build, number=args.number, repeat=5))
+            results.append(best / args.number * 1e6)
+
+        print(f"{case:<24} {results[0]:>12.0f}us {results[1]:>16.0f}us")
+
+
+if __name__ == "__main__":
+    main()
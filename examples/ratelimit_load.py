@@ -0,0 +1,148 @@
+# Load test for the HTTP ratelimiter against a local mock of the discord API.
+#
+# The mock allows 5 requests per second to each channel and answers anything
+# over that with a 429, the same headers discord sends are returned.
+# Many edits to one channel are sent at once, first straight through aiohttp,
+# then through HTTPClient, which queues them on the bucket instead.
+#
+#   PYTHONPATH=. python examples/ratelimit_load.py --requests 30
+import argparse
+import asyncio
+import collections
+import time
+import types
+
+import aiohttp
+from aiohttp import web
+
+import acord.core.abc as abc
+from acord.core.http import HTTPClient
+from acord.core.ratelimiter import DefaultHTTPRatelimiter
+
+HOST, PORT = "127.0.0.1", 8766
+LIMIT, PER = 5, 1.0
+USER = {"id": "4000000000000000004", "username": "bob", "discriminator": "0001"}
+
+
+class MockAPI:
+    def __init__(self) -> None:
+        self.windows = {}
+        self.responses = collections.Counter()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        parts = request.path.split("/")
+
+        if parts[-2:] == ["users", "@me"]:
+            return web.json_response(USER)
+
+        channel = parts[parts.index("channels") + 1]
+        now = time.monotonic()
+
+        start, count = self.windows.get(channel, (now, 0))
+        if now - start >= PER:
+            start, count = now, 0
+
+        count += 1
+        self.windows[channel] = (start, count)
+        reset_after = max(0.0, PER - (now - start))
+
+        headers = {
+            "X-RateLimit-Bucket": "messages",
+            "X-RateLimit-Limit": str(LIMIT),
+            "X-RateLimit-Remaining": str(max(0, LIMIT - count)),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+
+        # Some latency, so requests overlap
+        await asyncio.sleep(0.02)
+
+        if count > LIMIT:
+            self.responses[429] += 1
+            return web.json_response(
+                {"retry_after": reset_after, "global": False},
+                status=429,
+                headers={**headers, "X-RateLimit-Scope": "user"},
+            )
+
+        self.responses[200] += 1
+        return web.json_response({}, headers=headers)
+
+    def reset(self) -> None:
+        self.windows.clear()
+        self.responses.clear()
+
+
+async def without_ratelimiter(api: MockAPI, requests: int) -> None:
+    async with aiohttp.ClientSession() as session:
+
+        async def edit(i):
+            url = abc.buildURL("channels", "1", "messages", str(i))
+            async with session.patch(url) as resp:
+                await resp.read()
+
+        started = time.monotonic()
+        await asyncio.gather(*(edit(i) for i in range(requests)))
+
+    print(
+        f"aiohttp:    {requests} edits in {time.monotonic() - started:.2f}s, "
+        f"responses {dict(api.responses)}"
+    )
+
+
+async def with_ratelimiter(api: MockAPI, requests: int) -> None:
+    http = HTTPClient(
+        types.SimpleNamespace(),
+        token="token",
+        loop=asyncio.get_running_loop(),
+        ratelimiter=DefaultHTTPRatelimiter(max_requests=(10000, 60 * 10)),
+    )
+    await http.login()
+    api.reset()
+
+    started = time.monotonic()
+    await asyncio.gather(
+        *(
+            http.request(abc.Route("PATCH", path=f"/channels/1/messages/{i}"))
+            for i in range(requests)
+        )
+    )
+
+    print(
+        f"HTTPClient: {requests} edits in {time.monotonic() - started:.2f}s, "
+        f"responses {dict(api.responses)}"
+    )
+    stats = http.ratelimiter.stats()
+    print(f"Invalid requests counted: {stats['invalid_requests_total']}")
+
+    await http._session.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Sends concurrent requests to one bucket of a mock discord API"
+    )
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+
+    api = MockAPI()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", api.handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    abc.BASE_API_URL = f"http://{HOST}:{PORT}/api"
+    print(f"Mock API allows {LIMIT} requests per {PER:.0f}s to each channel")
+
+    try:
+        await without_ratelimiter(api, args.requests)
+        # Let the window the first run used up reset
+        await asyncio.sleep(PER)
+        await with_ratelimiter(api, args.requests)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())